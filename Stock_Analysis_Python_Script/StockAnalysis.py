@@ -1,93 +1,256 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import datetime as dt
 from pprint import pprint
 import textwrap
 import time
 from requests.exceptions import HTTPError
-import requests
 import math
 
+from data_access import charge_provider_request, request_key, shared_fetch, shared_request
+from data_quality import REQUIRED_FIELDS, check_inputs, data_quality_report, print_data_quality
+from dcf_model import HIGH_GROWTH_YEARS, starting_free_cash_flow, reverse_dcf
+from fundamentals import statement_panel
+from metrics import DCF_DEFAULTS, classify_growth, dcf_margin_of_safety, derive_metrics
+from price_fetch import download_close_matrix
+from provider_guard import NoDataError, provider_guard
+from reinvestment_dcf import project_cash_flows, reinvestment_dcf
+from report_writer import FULL, TABLE, ReportWriter
+from valuation_ladder import ladder_inputs, valuation_ladder
+
 # Disable pandas warning
 pd.options.mode.chained_assignment = None
 
+
+def _adjacent_growth(values, change):
+    # Growth of each year over the previous fiscal year; None when that year is
+    # missing (a gap is never bridged) or change() cannot compute it
+    return {year: change(values[year - 1], value) if year - 1 in values else None
+            for year, value in sorted(values.items())[1:]}
+
+
+def _year_span(years):
+    # Every fiscal year from the first to the last of sorted years, gaps included
+    return range(years[0], years[-1] + 1) if years else range(0)
+
+
+def _relative_change(previous, current):
+    # Percentage change against |previous|; None when the previous value is zero
+    return (current - previous) / abs(previous) * 100 if previous != 0 else None
+
+
 class StockAnalysis:
     _dcf_has_run = False
 
-    def __init__(self, ticker_symbol, max_retries=3):
+    # Report detail for the buffered sections: 'summary', 'table' or 'full'
+    verbosity = 'full'
+
+    # Scheduler priority for this instance's fetches (None: the caller's fetch_priority)
+    fetch_priority = None
+
+    # Dataset name -> loader. Every method reads its data through fetch(), so
+    # each dataset is downloaded at most once per instance however many
+    # sections use it.
+    DATASETS = {
+        'info': lambda self: self._load_info(),
+        'cashflow': lambda self: self.stock.cashflow,
+        'financials': lambda self: self.stock.get_financials(),
+        'balance_sheet': lambda self: self.stock.get_balance_sheet(),
+        'balance_sheet_pretty': lambda self: self.stock.balance_sheet,
+        'income_stmt': lambda self: self.stock.get_income_stmt(),
+        'income_stmt_pretty': lambda self: self.stock.income_stmt,
+        'bond_yield': lambda self: self._load_bond_yield(),
+    }
+    # Datasets that belong to a market-wide symbol rather than this ticker
+    SHARED_DATASETS = {'bond_yield': '^TNX'}
+
+    def __init__(self, ticker_symbol, max_retries=3, price_store=None, snapshot=None):
+        # Construction fetches nothing: every dataset (including info) is loaded
+        # by fetch() the first time a method needs it
         self.ticker_symbol = ticker_symbol
-        
-        for attempt in range(max_retries):
-            try:
-                # Add longer delay between attempts
-                time.sleep(5)  # Wait 5 seconds
-                
-                # Create a session with custom headers
-                session = requests.Session()
-                session.headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Cache-Control': 'max-age=0'
-                }
-                
-                # Initialize ticker with session and proxy
-                proxies = None  # You can add proxy support here if needed
-                self.stock = yf.Ticker(ticker_symbol)
-
+        # Attempts per dataset before giving up (one failure for the circuit breaker)
+        self.max_retries = max_retries
+        # Optional UniverseSnapshot that serves every dataset with no network access
+        self.snapshot = snapshot
+        # Optional PriceStore used for price history instead of downloading
+        self.price_store = price_store if price_store is not None else snapshot
+
+        # Initialize other variables
+        self.avg_roic_growth = None
+        self.avg_equity_growth = None
+        self.avg_earnings_growth = None
+        self.avg_sales_growth = None
+        self.avg_fcf_growth = None
+        self.trailing_earnings_yield = 0
+        self.forward_earnings_yield = 0
+        self.breakeven_price = 0
+
+    @property
+    def stock(self):
+        # yf.Ticker (or snapshot stand-in), created on first use
+        if '_stock' not in self.__dict__:
+            if getattr(self, 'snapshot', None) is not None:
+                self._stock = self.snapshot.ticker(self.ticker_symbol)
+            else:
                 # Enable yfinance caching
                 yf.set_tz_cache_location("tz_cache.json")
-                
-                # Try to get info with delay and multiple attempts
-                info = None
-                for info_attempt in range(3):
-                    try:
-                        time.sleep(3)  # Increased delay
-                        info = self.stock.info
-                        if info:  # Verify we got valid data
-                            break
-                    except Exception as e:
-                        print(f"Info attempt {info_attempt + 1} failed: {str(e)}")
-                        if info_attempt < 2:  # Not the last attempt
-                            time.sleep(7)  # Longer delay between info attempts
-                        else:
-                            raise
-                
-                if not info:
-                    raise Exception("Failed to retrieve stock information")
-                
-                # Initialize variables with safe defaults
-                current_price = info.get('currentPrice', 0)
-                dividend_rate = info.get('dividendRate', 0)
-                
-                # Store basic info
-                self.dividend_yield = (dividend_rate / current_price * 100) if dividend_rate and current_price else 0
-                
-                # Initialize other variables
-                self.avg_roic_growth = None
-                self.avg_equity_growth = None
-                self.avg_earnings_growth = None
-                self.avg_sales_growth = None
-                self.avg_fcf_growth = None
-                self.trailing_earnings_yield = 0
-                self.forward_earnings_yield = 0
-                self.breakeven_price = 0
-                
-                print(f"Successfully initialized {ticker_symbol} data")
-                break
-                
-            except Exception as e:
-                print(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-                if attempt == max_retries - 1:
-                    raise Exception(f"Failed to initialize {ticker_symbol} after {max_retries} attempts: {str(e)}")
-                time.sleep(15)  # Even longer wait between retries
-                
-            finally:
-                if 'session' in locals():
-                    session.close()
+                self._stock = yf.Ticker(self.ticker_symbol)
+        return self._stock
+
+    @stock.setter
+    def stock(self, value):
+        self._stock = value
+
+    @property
+    def dividend_yield(self):
+        # Dividend yield (%) from info, computed on first access unless set explicitly
+        if '_dividend_yield' not in self.__dict__:
+            info = self.fetch('info')
+            current_price = info.get('currentPrice', 0)
+            dividend_rate = info.get('dividendRate', 0)
+            return (dividend_rate / current_price * 100) if dividend_rate and current_price else 0
+        return self._dividend_yield
+
+    @dividend_yield.setter
+    def dividend_yield(self, value):
+        self._dividend_yield = value
+
+    def fetch(self, dataset):
+        """
+        Returns a dataset, loading it on first use and memoizing it on the instance.
+
+        Loads go through the process-wide single-flight layer, so concurrent
+        callers (threads, other instances, the analysis service) asking for the
+        same symbol and dataset share one provider request.
+
+        Args:
+            dataset (str): Name from DATASETS
+
+        Returns:
+            The loaded dataset (dict, DataFrame or float)
+        """
+        datasets = self.__dict__.setdefault('_datasets', {})
+        if dataset not in datasets:
+            symbol = self.SHARED_DATASETS.get(dataset, self.ticker_symbol)
+            loader = lambda: self.DATASETS[dataset](self)
+            if getattr(self, 'snapshot', None) is not None:
+                # The source is part of the request identity, so a snapshot load never
+                # shares a result with a live load (or another snapshot's) for the same ticker
+                value = shared_fetch(symbol, dataset, loader, priority=self.fetch_priority,
+                                     source=self.snapshot.path)
+            else:
+                # Live requests go through the circuit breaker, which may answer with cached data
+                value, stale_since = self._fetch_live(symbol, dataset, loader)
+                stale = self.__dict__.setdefault('stale_datasets', {})
+                if stale_since is not None:
+                    if dataset not in stale:
+                        print(f"Note: using cached {dataset} data for {self.ticker_symbol} from "
+                              f"{stale_since:%Y-%m-%d %H:%M} (data provider unavailable)")
+                    stale[dataset] = stale_since
+                    # Not memoized, so the next access picks up the revalidated value
+                    return value
+                stale.pop(dataset, None)
+            datasets.setdefault(dataset, value)
+        return datasets[dataset]
+
+    def _fetch_live(self, symbol, dataset, loader):
+        # (value, stale_since) from the provider, with a short backoff between attempts.
+        # The retries run inside one guarded call, so a dataset that fails all of
+        # its attempts counts as a single failure for the circuit breaker.
+        key = request_key(symbol, dataset, source='live')
+        max_retries = getattr(self, 'max_retries', 3)
+
+        def attempts():
+            for attempt in range(max_retries):
+                if attempt:
+                    # The scheduled job paid for the first request; each retry is another one
+                    charge_provider_request()
+                try:
+                    return loader()
+                except Exception as e:
+                    # Unknown or delisted symbol: the provider is fine, the ticker is not
+                    if isinstance(e, HTTPError) and e.response is not None and e.response.status_code == 404:
+                        raise NoDataError(f"No {dataset} data for {symbol}: {e}") from e
+                    if attempt == max_retries - 1:
+                        raise
+                    print(f"Attempt {attempt + 1}/{max_retries} to load {dataset} for {symbol} failed: {str(e)}")
+                    time.sleep(2 ** attempt)
+
+        # Same key for single-flight and the guard, so background revalidations join live loads
+        return shared_request(key, lambda: provider_guard.call(key, attempts), priority=self.fetch_priority)
+
+    def _load_info(self):
+        # An empty info dict means no data for this symbol, not data worth caching
+        info = self.stock.info
+        if not info:
+            raise NoDataError(f"No information returned for {self.ticker_symbol}")
+        return info
+
+    def report(self):
+        # Buffered writer for one section's output at this instance's verbosity
+        return ReportWriter(self.verbosity)
+
+    def get_statements(self):
+        # Statement data the derived metrics are computed from
+        return {
+            'financials': self.fetch('financials'),
+            'balance_sheet': self.fetch('balance_sheet'),
+            'balance_sheet_pretty': self.fetch('balance_sheet_pretty'),
+            'income_stmt': self.fetch('income_stmt'),
+            'cashflow': self.fetch('cashflow'),
+        }
+
+    def check_inputs(self, analysis):
+        # Values and availability mask of one analysis's required statement fields
+        return check_inputs({dataset: self.fetch(dataset) for dataset in REQUIRED_FIELDS[analysis]}, analysis)
+
+    def print_data_quality(self):
+        # Compact per-analysis summary of usable years and missing fields
+        report = data_quality_report(self.get_statements())
+        print_data_quality(self.ticker_symbol, report)
+        return report
+
+    def compute_derived_metrics(self, cache=None, **dcf_params):
+        """
+        Computes ROIC, growth averages, EBIT growth and DCF fair value without printing.
+
+        When a ResultsCache is given and the statements and parameters hash to
+        the same key as last time, the stored results are returned and nothing
+        is recomputed. The price-dependent DCF margin of safety is always
+        recomputed from the current price.
+
+        Args:
+            cache (ResultsCache): Optional derived-results cache
+            **dcf_params: Overrides for the DCF defaults (years, growth_rate, ...)
+
+        Returns:
+            dict: Derived metrics, with 'cache_hit' telling whether they were reused
+        """
+        statements = self.get_statements()
+        shares_outstanding = self.fetch('info').get('sharesOutstanding')
+        params = {**DCF_DEFAULTS, **dcf_params, 'shares_outstanding': shares_outstanding}
+
+        def compute():
+            return derive_metrics(statements, shares_outstanding, **dcf_params)
+
+        if cache is not None:
+            results, hit = cache.get_or_compute(self.ticker_symbol, statements, params, compute)
+        else:
+            results, hit = compute(), False
+
+        results = dict(results)
+        results['dcf_margin_of_safety'] = dcf_margin_of_safety(
+            results['dcf_fair_value'], self.fetch('info').get('currentPrice')
+        )
+        results['cache_hit'] = hit
+
+        # Make the averages available to print_growth_metrics_summary
+        for name in ['avg_roic_growth', 'avg_equity_growth', 'avg_earnings_growth', 'avg_sales_growth', 'avg_fcf_growth']:
+            setattr(self, name, results[name])
+
+        return results
 
     def display_stock_info(self) -> None:
         """
@@ -106,46 +269,46 @@ class StockAnalysis:
             print("\n=== Basic Details ===")
             print(f"{'Metric':<25} | {'Value'}")
             print("-" * 50)
-            print(f"{'Company Name':<25} | {self.stock.info.get('longName', 'N/A'):}")
-            print(f"{'Industry':<25} | {self.stock.info.get('industry', 'N/A'):}")
-            print(f"{'Sector':<25} | {self.stock.info.get('sector', 'N/A'):}")
-            print(f"{'Employees':<25} | {self.stock.info.get('fullTimeEmployees', 'N/A'):,}")
+            print(f"{'Company Name':<25} | {self.fetch('info').get('longName', 'N/A'):}")
+            print(f"{'Industry':<25} | {self.fetch('info').get('industry', 'N/A'):}")
+            print(f"{'Sector':<25} | {self.fetch('info').get('sector', 'N/A'):}")
+            print(f"{'Employees':<25} | {self.fetch('info').get('fullTimeEmployees', 'N/A'):,}")
             
             # Location Info
             print("\n=== Location ===")
             print(f"{'Metric':<25} | {'Value'}")
             print("-" * 50)
-            print(f"{'Address':<25} | {self.stock.info.get('address1', 'N/A'):}")
-            if self.stock.info.get('address2'):
-                print(f"{'Address (cont.)':<25} | {self.stock.info.get('address2', 'N/A'):}")
-            print(f"{'City':<25} | {self.stock.info.get('city', 'N/A'):}")
-            print(f"{'State':<25} | {self.stock.info.get('state', 'N/A'):}")
-            print(f"{'Country':<25} | {self.stock.info.get('country', 'N/A'):}")
+            print(f"{'Address':<25} | {self.fetch('info').get('address1', 'N/A'):}")
+            if self.fetch('info').get('address2'):
+                print(f"{'Address (cont.)':<25} | {self.fetch('info').get('address2', 'N/A'):}")
+            print(f"{'City':<25} | {self.fetch('info').get('city', 'N/A'):}")
+            print(f"{'State':<25} | {self.fetch('info').get('state', 'N/A'):}")
+            print(f"{'Country':<25} | {self.fetch('info').get('country', 'N/A'):}")
             
             # Market Info
             print("\n=== Market Information ===")
             print(f"{'Metric':<25} | {'Value'}")
             print("-" * 50)
-            print(f"{'Market Cap':<25} | ${self.stock.info.get('marketCap', 0):,.2f}")
-            print(f"{'Beta':<25} | {self.stock.info.get('beta', 'N/A'):}")
-            print(f"{'Forward P/E':<25} | {self.stock.info.get('forwardPE', 'N/A'):}")
-            print(f"{'Trailing P/E':<25} | {self.stock.info.get('trailingPE', 'N/A'):}")
-            print(f"{'Dividend Yield':<25} | {(self.stock.info.get('dividendYield', 0) * 100):.2f}%")
+            print(f"{'Market Cap':<25} | ${self.fetch('info').get('marketCap', 0):,.2f}")
+            print(f"{'Beta':<25} | {self.fetch('info').get('beta', 'N/A'):}")
+            print(f"{'Forward P/E':<25} | {self.fetch('info').get('forwardPE', 'N/A'):}")
+            print(f"{'Trailing P/E':<25} | {self.fetch('info').get('trailingPE', 'N/A'):}")
+            print(f"{'Dividend Yield':<25} | {(self.fetch('info').get('dividendYield', 0) * 100):.2f}%")
             
             # Risk Metrics
-            if any(key in self.stock.info for key in ['overallRisk', 'auditRisk', 'boardRisk', 'compensationRisk']):
+            if any(key in self.fetch('info') for key in ['overallRisk', 'auditRisk', 'boardRisk', 'compensationRisk']):
                 print("\n=== Risk Metrics (1-10 scale) ===")
                 print(f"{'Metric':<25} | {'Value'}")
                 print("-" * 50)
-                print(f"{'Overall Risk':<25} | {self.stock.info.get('overallRisk', 'N/A'):}")
-                print(f"{'Audit Risk':<25} | {self.stock.info.get('auditRisk', 'N/A'):}")
-                print(f"{'Board Risk':<25} | {self.stock.info.get('boardRisk', 'N/A'):}")
-                print(f"{'Compensation Risk':<25} | {self.stock.info.get('compensationRisk', 'N/A'):}")
+                print(f"{'Overall Risk':<25} | {self.fetch('info').get('overallRisk', 'N/A'):}")
+                print(f"{'Audit Risk':<25} | {self.fetch('info').get('auditRisk', 'N/A'):}")
+                print(f"{'Board Risk':<25} | {self.fetch('info').get('boardRisk', 'N/A'):}")
+                print(f"{'Compensation Risk':<25} | {self.fetch('info').get('compensationRisk', 'N/A'):}")
             
             # Business Summary
-            if self.stock.info.get('longBusinessSummary'):
+            if self.fetch('info').get('longBusinessSummary'):
                 print("\n=== Business Summary ===")
-                print(textwrap.fill(self.stock.info['longBusinessSummary'], width=80))
+                print(textwrap.fill(self.fetch('info')['longBusinessSummary'], width=80))
         
         except Exception as e:
             print(f"Error displaying stock information: {e}")
@@ -221,31 +384,25 @@ class StockAnalysis:
             print("\n=== Year-by-Year Performance ===")
             
             # Get historical data with explicit end date and frequency
-            end_date = datetime.now()
+            # Day-level end date (exclusive) so concurrent requests share one download
+            end_date = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
             start_date = '2000-01-01'
             
-            # Download data with business day frequency
-            def get_close_series(ticker, start, end):
-                df = yf.download(ticker, start=start, end=end, auto_adjust=True, interval='1d')
-                # If 'Close' is a DataFrame (multi-ticker), get the column for this ticker
-                if isinstance(df, pd.DataFrame):
-                    if 'Close' in df.columns:
-                        return df['Close']
-                    elif (('Close', ticker) in df.columns):
-                        return df[('Close', ticker)]
-                    elif ticker in df.columns:
-                        return df[ticker]
-                    else:
-                        # Try to flatten multi-index columns
-                        if isinstance(df.columns, pd.MultiIndex):
-                            for col in df.columns:
-                                if col[0] == 'Close':
-                                    return df[col]
-                return df.squeeze()  # fallback
-            
-            spy = get_close_series('SPY', start_date, end_date)
-            vti = get_close_series('VTI', start_date, end_date)
-            stock = get_close_series(self.ticker_symbol, start_date, end_date)
+            # Read from the local price store when it has every series, otherwise
+            # download all series in one batched request
+            symbols = [self.ticker_symbol, 'SPY', 'VTI']
+            if self.price_store is not None and self.price_store.covers(symbols):
+                prices = self.price_store.frame(list(dict.fromkeys(symbols)), start_date, end_date)
+            elif getattr(self, 'snapshot', None) is not None:
+                # A snapshot run stays offline: report the missing series instead of downloading
+                missing = [symbol for symbol in dict.fromkeys(symbols) if not self.price_store.covers([symbol])]
+                print(f"No price history in the snapshot for {', '.join(missing)}; annual performance skipped")
+                return
+            else:
+                prices = download_close_matrix([self.ticker_symbol], start_date, end_date)
+            spy = prices['SPY'].dropna()
+            vti = prices['VTI'].dropna()
+            stock = prices[self.ticker_symbol].dropna()
             
             print("SPY head:", spy.head())
             print("VTI head:", vti.head())
@@ -255,11 +412,7 @@ class StockAnalysis:
                 return
             
             # Create DataFrame with aligned dates
-            df = pd.DataFrame({
-                'SPY': spy,
-                'VTI': vti,
-                self.ticker_symbol: stock
-            }).fillna(method='ffill')
+            df = prices[list(dict.fromkeys(['SPY', 'VTI', self.ticker_symbol]))].ffill()
             
             # Convert index to datetime if it's not already
             df.index = pd.to_datetime(df.index)
@@ -360,197 +513,177 @@ class StockAnalysis:
             print(f"Error in growth rate interpretation: {e}")
 
     def analyze_roic(self):
-        try:
-            # Retrieve financial data
-            financials = self.stock.get_financials()
-            balance_sheet = self.stock.get_balance_sheet()
-
-            if financials.empty or balance_sheet.empty:
-                print("\nNo financial data available.")
-                self.avg_roic_growth = None
-                return None
-
-            roic_values = {}
-            growth_rates = []
-            calculation_details = {}
+        with self.report() as out:
+            try:
+                # Retrieve financial data
+                financials = self.fetch('financials')
+                balance_sheet = self.fetch('balance_sheet')
 
-            # Calculate ROIC for each year
-            for date in financials.columns:
-                try:
-                    year = date.year
-                    operating_income = float(financials.loc['OperatingIncome', date])
-                    tax_rate = float(financials.loc['TaxRateForCalcs', date])
-                    nopat = operating_income * (1 - tax_rate)
+                if financials.empty or balance_sheet.empty:
+                    out.line("\nNo financial data available.")
+                    self.avg_roic_growth = None
+                    return None
 
-                    total_assets = float(balance_sheet.loc['TotalAssets', date])
-                    current_liabilities = float(balance_sheet.loc['CurrentLiabilities', date])
-                    cash = float(balance_sheet.loc['CashAndCashEquivalents', date])
+                roic_values = {}
+                calculation_details = {}
 
-                    # Calculate invested capital
-                    invested_capital = total_assets - current_liabilities - cash
+                # Calculate ROIC for each year where every input is present
+                check = self.check_inputs('roic')
+                values = check.values.loc[:, check.usable_dates]
+                nopat = values.loc['OperatingIncome'] * (1 - values.loc['TaxRateForCalcs'])
+                invested_capital = (values.loc['TotalAssets'] - values.loc['CurrentLiabilities']
+                                    - values.loc['CashAndCashEquivalents'])
 
-                    if invested_capital != 0:
-                        roic = (nopat / invested_capital) * 100
+                for date in values.columns:
+                    year = date.year
+                    if invested_capital[date] != 0:
+                        roic = float(nopat[date] / invested_capital[date]) * 100
                         roic_values[year] = roic
                         calculation_details[year] = {
-                            'operating_income': operating_income,
-                            'tax_rate': tax_rate,
-                            'nopat': nopat,
-                            'total_assets': total_assets,
-                            'current_liabilities': current_liabilities,
-                            'cash': cash,
-                            'invested_capital': invested_capital,
+                            'operating_income': values.at['OperatingIncome', date],
+                            'tax_rate': values.at['TaxRateForCalcs', date],
+                            'nopat': nopat[date],
+                            'total_assets': values.at['TotalAssets', date],
+                            'current_liabilities': values.at['CurrentLiabilities', date],
+                            'cash': values.at['CashAndCashEquivalents', date],
+                            'invested_capital': invested_capital[date],
                             'roic': roic,
                         }
                     else:
-                        print(f"Debug: Skipped year {year} due to zero invested capital.")
-                except Exception as e:
-                    print(f"Debug: Error calculating ROIC for {date}: {str(e)}")
-                    continue
+                        out.line(f"Debug: Skipped year {year} due to zero invested capital.", TABLE)
+                if not check.usable.all():
+                    out.line(check.summary(), TABLE)
 
-            if not roic_values:
-                print("\nNo valid ROIC data found for any year.")
-                self.avg_roic_growth = None
-                return None
-
-            # Print ROIC values with growth rates
-            print("\n{:<6} | {:>10} | {:>12} | {:>20}".format("Year", "ROIC (%)", "Growth Rate", "Calculation"))
-            print("-" * 55)
+                if not roic_values:
+                    out.line("\nNo valid ROIC data found for any year.")
+                    self.avg_roic_growth = None
+                    return None
 
-            sorted_years = sorted(roic_values.keys())
-            for i, year in enumerate(sorted_years):
-                if i == 0:
-                    growth_str = "Base Year"
-                    calc_str = "See below"
+                # Growth rates are ROIC changes in percentage points, between adjacent years only
+                sorted_years = sorted(roic_values.keys())
+                year_growth = _adjacent_growth(roic_values, lambda previous, current: current - previous)
+                growth_rates = [growth for growth in year_growth.values() if growth is not None]
+
+                # Print ROIC values with growth rates (years missing an input shown as N/A)
+                if out.table:
+                    out.line("\n{:<6} | {:>10} | {:>12} | {:>20}".format("Year", "ROIC (%)", "Growth Rate", "Calculation"))
+                    out.line("-" * 55)
+                    for year in _year_span(sorted_years):
+                        if year not in roic_values:
+                            out.line("{:<6} | {:>10} | {:>12} | {:>20}".format(year, "N/A", "N/A", ""))
+                            continue
+                        if year == sorted_years[0]:
+                            growth_str = "Base Year"
+                        elif year_growth[year] is None:
+                            growth_str = "N/A"
+                        else:
+                            growth_str = f"{year_growth[year]:+.2f}%"
+                        out.line("{:<6} | {:>10.2f} | {:>12} | {:>20}".format(
+                            year,
+                            roic_values[year],
+                            growth_str,
+                            "See below" if out.full else ""
+                        ))
+
+                # Print detailed calculations
+                if out.full:
+                    out.line("\n=== Detailed ROIC Calculations ===")
+                    out.line("Growth Rate = (Current Year ROIC - Previous Year ROIC)")
+                    out.line("ROIC = (NOPAT / Invested Capital) × 100")
+                    out.line("NOPAT = Operating Income × (1 - Tax Rate)")
+                    out.line("Invested Capital = Total Assets - Current Liabilities - Cash")
+
+                    for year in sorted_years:
+                        details = calculation_details[year]
+                        out.line(f"\nYear {year}:")
+                        out.line(f"  Operating Income: ${details['operating_income']:,.0f}")
+                        out.line(f"  Tax Rate: {details['tax_rate']:.2%}")
+                        out.line(f"  NOPAT: ${details['nopat']:,.0f}")
+                        out.line(f"  Total Assets: ${details['total_assets']:,.0f}")
+                        out.line(f"  Current Liabilities: ${details['current_liabilities']:,.0f}")
+                        out.line(f"  Cash: ${details['cash']:,.0f}")
+                        out.line(f"  Invested Capital: ${details['invested_capital']:,.0f}")
+                        out.line(f"  ROIC: {details['roic']:.2f}%")
+
+                        if year_growth.get(year) is not None:
+                            prev_year = year - 1
+                            prev_details = calculation_details[prev_year]
+                            out.line(f"\nGrowth Rate Calculation:")
+                            out.line(f"Previous Year ({prev_year}) ROIC: {prev_details['roic']:.2f}%")
+                            out.line(f"Current Year ({year}) ROIC: {details['roic']:.2f}%")
+                            out.line(f"Change in ROIC: {(details['roic'] - prev_details['roic']):+.2f}%")
+
+                # Calculate and store average growth rate
+                if growth_rates:
+                    self.avg_roic_growth = sum(growth_rates) / len(growth_rates)
+                    out.line(f"\nAverage ROIC Growth Rate: {self.avg_roic_growth:.2f}%")
                 else:
-                    prev_year = sorted_years[i - 1]
-                    prev_roic = roic_values[prev_year]
-                    curr_roic = roic_values[year]
+                    self.avg_roic_growth = None
+                    out.line("\nInsufficient data to calculate average ROIC growth rate.")
 
-                    growth_rate = curr_roic - prev_roic  # ROIC growth in percentage points
-                    growth_rates.append(growth_rate)
-                    growth_str = f"{growth_rate:+.2f}%"
-                    calc_str = "See below"
+                out.lines([
+                    "\nGrowth Rate Explanation:",
+                    "- ROIC growth rates show the change in Return on Invested Capital over years.",
+                    "- Positive rates indicate improved capital efficiency.",
+                    "- Negative rates indicate reduced capital efficiency.",
+                    "- Invested capital excludes current liabilities and cash.",
+                ], FULL)
 
-                print("{:<6} | {:>10.2f} | {:>12} | {:>20}".format(
-                    year,
-                    roic_values[year],
-                    growth_str,
-                    calc_str
-                ))
+                return roic_values
 
-            # Print detailed calculations
-            print("\n=== Detailed ROIC Calculations ===")
-            print("Growth Rate = (Current Year ROIC - Previous Year ROIC)")
-            print("ROIC = (NOPAT / Invested Capital) × 100")
-            print("NOPAT = Operating Income × (1 - Tax Rate)")
-            print("Invested Capital = Total Assets - Current Liabilities - Cash")
-            
-            for i, year in enumerate(sorted_years):
-                details = calculation_details[year]
-                print(f"\nYear {year}:")
-                print(f"  Operating Income: ${details['operating_income']:,.0f}")
-                print(f"  Tax Rate: {details['tax_rate']:.2%}")
-                print(f"  NOPAT: ${details['nopat']:,.0f}")
-                print(f"  Total Assets: ${details['total_assets']:,.0f}")
-                print(f"  Current Liabilities: ${details['current_liabilities']:,.0f}")
-                print(f"  Cash: ${details['cash']:,.0f}")
-                print(f"  Invested Capital: ${details['invested_capital']:,.0f}")
-                print(f"  ROIC: {details['roic']:.2f}%")
-                
-                if i > 0:
-                    prev_year = sorted_years[i-1]
-                    prev_details = calculation_details[prev_year]
-                    print(f"\nGrowth Rate Calculation:")
-                    print(f"Previous Year ({prev_year}) ROIC: {prev_details['roic']:.2f}%")
-                    print(f"Current Year ({year}) ROIC: {details['roic']:.2f}%")
-                    print(f"Change in ROIC: {(details['roic'] - prev_details['roic']):+.2f}%")
-
-            # Calculate and store average growth rate
-            if growth_rates:
-                self.avg_roic_growth = sum(growth_rates) / len(growth_rates)
-                print(f"\nAverage ROIC Growth Rate: {self.avg_roic_growth:.2f}%")
-            else:
+            except Exception as e:
+                out.line(f"\nError in ROIC calculation: {str(e)}")
                 self.avg_roic_growth = None
-                print("\nInsufficient data to calculate average ROIC growth rate.")
-
-            print("\nGrowth Rate Explanation:")
-            print("- ROIC growth rates show the change in Return on Invested Capital over years.")
-            print("- Positive rates indicate improved capital efficiency.")
-            print("- Negative rates indicate reduced capital efficiency.")
-            print("- Invested capital excludes current liabilities and cash.")
-
-            return roic_values
-
-        except Exception as e:
-            print(f"\nError in ROIC calculation: {str(e)}")
-            self.avg_roic_growth = None
-            return None
+                return None
 
     def analyze_equity_growth(self):
         try:
             # Get balance sheet data
-            balance_sheet = self.stock.balance_sheet
+            balance_sheet = self.fetch('balance_sheet_pretty')
             if balance_sheet.empty:
                 print("\nNo balance sheet data available.")
                 self.avg_equity_growth = None
                 return None
             
             equity_values = {}
-            growth_rates = []
             calculation_details = {}
             
-            # Calculate equity for each year
-            for date in balance_sheet.columns:
-                try:
-                    year = date.year
-                    # Try different possible column names for stockholders' equity
-                    possible_names = ['Stockholders Equity', 'StockholdersEquity', 'Total Equity Gross Minority Interest', 'Common Stock Equity']
-                    equity_value = None
-                    
-                    for name in possible_names:
-                        if name in balance_sheet.index:
-                            equity_value = float(balance_sheet.loc[name, date])
-                            break
-                    
-                    if equity_value is None or pd.isna(equity_value):
-                        continue
-                    
-                    equity_values[year] = equity_value
-                    calculation_details[year] = {
-                        'stockholders_equity': equity_value
-                    }
-                except Exception as e:
-                    continue
+            # Equity for each year that reports it (first equity row the statement has)
+            check = self.check_inputs('equity')
+            equity_row = check.values.iloc[0]
+            for date in check.usable_dates:
+                equity_values[date.year] = float(equity_row[date])
+                calculation_details[date.year] = {
+                    'stockholders_equity': float(equity_row[date])
+                }
+            if not check.usable.all():
+                print(check.summary())
             
             if not equity_values:
                 print("\nNo valid equity data found for any year.")
                 self.avg_equity_growth = None
                 return None
             
-            # Print equity values with growth rates
+            # Growth per year over the previous fiscal year; None after a gap or a zero equity
+            sorted_years = sorted(equity_values.keys())
+            year_growth = _adjacent_growth(equity_values, _relative_change)
+            growth_rates = [growth for growth in year_growth.values() if growth is not None]
+
+            # Print equity values with growth rates (years without equity shown as N/A)
             print("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "Equity", "Growth Rate", "Calculation"))
             print("-" * 65)
-            
-            sorted_years = sorted(equity_values.keys())
-            for i, year in enumerate(sorted_years):
-                if i == 0:
+
+            for year in _year_span(sorted_years):
+                if year not in equity_values:
+                    print("{:<6} | {:>15} | {:>12} | {:>20}".format(year, "N/A", "N/A", ""))
+                    continue
+                if year == sorted_years[0]:
                     growth_str = "Base Year"
-                    calc_str = "N/A"
+                elif year_growth[year] is None:
+                    growth_str = "N/A"
                 else:
-                    prev_year = sorted_years[i-1]
-                    prev_equity = equity_values[prev_year]
-                    curr_equity = equity_values[year]
-                    
-                    if prev_equity != 0:
-                        growth_rate = ((curr_equity - prev_equity) / abs(prev_equity)) * 100
-                        growth_rates.append(growth_rate)
-                        growth_str = f"{growth_rate:+.2f}%"
-                        calc_str = f"({curr_equity:,.0f} - {prev_equity:,.0f}) / {abs(prev_equity):,.0f}"
-                    else:
-                        growth_str = "N/A"
-                        calc_str = "prev equity = 0"
-                
+                    growth_str = f"{year_growth[year]:+.2f}%"
+
                 print("{:<6} | ${:>14,.0f} | {:>12} | {:>20}".format(
                     year,
                     equity_values[year],
@@ -562,23 +695,20 @@ class StockAnalysis:
             print("\n=== Detailed Equity Growth Calculations ===")
             print("Growth Rate = ((Current Year Equity - Previous Year Equity) / |Previous Year Equity|) × 100")
             
-            for i, year in enumerate(sorted_years):
+            for year in sorted_years:
                 details = calculation_details[year]
                 print(f"\nYear {year}:")
                 print(f"Stockholders' Equity: ${details['stockholders_equity']:,.0f}")
-                
-                if i > 0:
-                    prev_year = sorted_years[i-1]
+
+                if year_growth.get(year) is not None:
+                    prev_year = year - 1
                     prev_equity = equity_values[prev_year]
                     curr_equity = equity_values[year]
-                    
-                    if prev_equity != 0:
-                        growth_rate = ((curr_equity - prev_equity) / abs(prev_equity)) * 100
-                        print(f"\nGrowth Rate Calculation:")
-                        print(f"Previous Year ({prev_year}) Equity: ${prev_equity:,.0f}")
-                        print(f"Current Year ({year}) Equity: ${curr_equity:,.0f}")
-                        print(f"Change in Equity: ${(curr_equity - prev_equity):+,.0f}")
-                        print(f"Growth Rate: (${curr_equity:,.0f} - ${prev_equity:,.0f}) / ${abs(prev_equity):,.0f} × 100 = {growth_rate:+.2f}%")
+                    print(f"\nGrowth Rate Calculation:")
+                    print(f"Previous Year ({prev_year}) Equity: ${prev_equity:,.0f}")
+                    print(f"Current Year ({year}) Equity: ${curr_equity:,.0f}")
+                    print(f"Change in Equity: ${(curr_equity - prev_equity):+,.0f}")
+                    print(f"Growth Rate: (${curr_equity:,.0f} - ${prev_equity:,.0f}) / ${abs(prev_equity):,.0f} × 100 = {year_growth[year]:+.2f}%")
             
             # Calculate and store average growth rate
             if growth_rates:
@@ -613,56 +743,48 @@ class StockAnalysis:
             print("\n=== Earnings Growth Analysis ===")
             
             # Get financial data
-            financials = self.stock.get_financials()
+            financials = self.fetch('financials')
             
             eps_values = {}
-            growth_rates = []
             calculation_details = {}
             
-            # Calculate EPS for each year
-            for date in financials.columns:
-                try:
-                    year = date.year
-                    net_income = float(financials.loc['NetIncome', date])
-                    shares = float(financials.loc['DilutedAverageShares', date])
-                    
-                    if shares != 0:
-                        eps = net_income / shares
-                        eps_values[year] = eps
-                        
-                        # Store calculation details
-                        calculation_details[year] = {
-                            'net_income': net_income,
-                            'shares': shares,
-                            'eps': eps
-                        }
-                except Exception as e:
-                    print(f"Skipping {year} due to missing or invalid data")
-                    continue
+            # Calculate EPS for each year where net income and shares are present
+            check = self.check_inputs('earnings')
+            values = check.values.loc[:, check.usable_dates]
+            for date in values.columns[values.loc['DilutedAverageShares'].to_numpy() != 0]:
+                net_income = float(values.at['NetIncome', date])
+                shares = float(values.at['DilutedAverageShares', date])
+                eps_values[date.year] = net_income / shares
+
+                # Store calculation details
+                calculation_details[date.year] = {
+                    'net_income': net_income,
+                    'shares': shares,
+                    'eps': net_income / shares
+                }
+            if not check.usable.all():
+                print(check.summary())
             
-            # Print EPS values with growth rates
+            # Growth per year over the previous fiscal year; None after a gap or a zero EPS
+            sorted_years = sorted(eps_values.keys())
+            year_growth = _adjacent_growth(eps_values, _relative_change)
+            growth_rates = [growth for growth in year_growth.values() if growth is not None]
+
+            # Print EPS values with growth rates (years without EPS shown as N/A)
             print("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "EPS", "Growth Rate", "Calculation"))
             print("-" * 65)
-            
-            sorted_years = sorted(eps_values.keys())
-            for i, year in enumerate(sorted_years):
-                if i == 0:
+
+            for year in _year_span(sorted_years):
+                if year not in eps_values:
+                    print("{:<6} | {:>15} | {:>12} | {:>20}".format(year, "N/A", "N/A", ""))
+                    continue
+                if year == sorted_years[0]:
                     growth_str = "Base Year"
-                    calc_str = "N/A"
+                elif year_growth[year] is None:
+                    growth_str = "N/A"
                 else:
-                    prev_year = sorted_years[i-1]
-                    prev_eps = eps_values[prev_year]
-                    curr_eps = eps_values[year]
-                    
-                    if prev_eps != 0:
-                        growth_rate = ((curr_eps - prev_eps) / abs(prev_eps)) * 100
-                        growth_rates.append(growth_rate)
-                        growth_str = f"{growth_rate:+.2f}%"
-                        calc_str = f"({curr_eps:.2f} - {prev_eps:.2f}) / {abs(prev_eps):.2f}"
-                    else:
-                        growth_str = "N/A"
-                        calc_str = "prev EPS = 0"
-                
+                    growth_str = f"{year_growth[year]:+.2f}%"
+
                 print("{:<6} | ${:>14,.2f} | {:>12} | {:>20}".format(
                     year,
                     eps_values[year],
@@ -675,25 +797,22 @@ class StockAnalysis:
             print("EPS = Net Income / Diluted Average Shares")
             print("Growth Rate = ((Current Year EPS - Previous Year EPS) / |Previous Year EPS|) × 100")
             
-            for i, year in enumerate(sorted_years):
+            for year in sorted_years:
                 details = calculation_details[year]
                 print(f"\nYear {year}:")
                 print(f"Net Income: ${details['net_income']:,.0f}")
                 print(f"Diluted Average Shares: {details['shares']:,.0f}")
                 print(f"EPS Calculation: ${details['net_income']:,.0f} / {details['shares']:,.0f} = ${details['eps']:.2f}")
-                
-                if i > 0:
-                    prev_year = sorted_years[i-1]
+
+                if year_growth.get(year) is not None:
+                    prev_year = year - 1
                     prev_eps = eps_values[prev_year]
                     curr_eps = eps_values[year]
-                    
-                    if prev_eps != 0:
-                        growth_rate = ((curr_eps - prev_eps) / abs(prev_eps)) * 100
-                        print(f"\nGrowth Rate Calculation:")
-                        print(f"Previous Year ({prev_year}) EPS: ${prev_eps:.2f}")
-                        print(f"Current Year ({year}) EPS: ${curr_eps:.2f}")
-                        print(f"Change in EPS: ${(curr_eps - prev_eps):+.2f}")
-                        print(f"Growth Rate: (${curr_eps:.2f} - ${prev_eps:.2f}) / ${abs(prev_eps):.2f} × 100 = {growth_rate:+.2f}%")
+                    print(f"\nGrowth Rate Calculation:")
+                    print(f"Previous Year ({prev_year}) EPS: ${prev_eps:.2f}")
+                    print(f"Current Year ({year}) EPS: ${curr_eps:.2f}")
+                    print(f"Change in EPS: ${(curr_eps - prev_eps):+.2f}")
+                    print(f"Growth Rate: (${curr_eps:.2f} - ${prev_eps:.2f}) / ${abs(prev_eps):.2f} × 100 = {year_growth[year]:+.2f}%")
             
             # Calculate and store average growth rate
             if growth_rates:
@@ -717,212 +836,192 @@ class StockAnalysis:
             return None
 
     def sales_growth_rate(self):
-        try:
-            print("\n=== Sales Growth Analysis ===")
-            
-            # Get income statement data
-            income_stmt = self.stock.get_income_stmt()
-            
-            sales_values = {}
-            growth_rates = []
-            calculation_details = {}
-            
-            # Calculate sales for each year
-            for date in income_stmt.columns:
-                try:
-                    year = date.year
-                    revenue = float(income_stmt.loc['TotalRevenue', date])
-                    sales_values[year] = revenue
-                    
-                    # Store calculation details
-                    calculation_details[year] = {
-                        'total_revenue': revenue
-                    }
-                except Exception as e:
-                    print(f"Skipping {year} due to missing or invalid data")
-                    continue
-            
-            # Print sales values with growth rates
-            print("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "Revenue", "Growth Rate", "Calculation"))
-            print("-" * 65)
-            
-            sorted_years = sorted(sales_values.keys())
-            for i, year in enumerate(sorted_years):
-                if i == 0:
-                    growth_str = "Base Year"
-                    calc_str = "N/A"
+        with self.report() as out:
+            try:
+                out.line("\n=== Sales Growth Analysis ===")
+
+                # Get income statement data
+                income_stmt = self.fetch('income_stmt')
+
+                sales_values = {}
+
+                # Sales for each year that reports revenue
+                check = self.check_inputs('sales')
+                revenue = check.values.loc['TotalRevenue']
+                for date in check.usable_dates:
+                    sales_values[date.year] = float(revenue[date])
+                if not check.usable.all():
+                    out.line(check.summary(), TABLE)
+
+                # Growth per year over the previous fiscal year; None after a gap or a zero sales year
+                sorted_years = sorted(sales_values.keys())
+                year_growth = _adjacent_growth(sales_values, _relative_change)
+                growth_rates = [growth for growth in year_growth.values() if growth is not None]
+
+                # Print sales values with growth rates
+                if out.table:
+                    out.line("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "Revenue", "Growth Rate", "Calculation"))
+                    out.line("-" * 65)
+                    for year in _year_span(sorted_years):
+                        if year not in sales_values:
+                            out.line("{:<6} | {:>15} | {:>12} | {:>20}".format(year, "N/A", "N/A", ""))
+                            continue
+                        if year == sorted_years[0]:
+                            growth_str = "Base Year"
+                        elif year_growth[year] is None:
+                            growth_str = "N/A"
+                        else:
+                            growth_str = f"{year_growth[year]:+.2f}%"
+                        out.line("{:<6} | ${:>14,.0f} | {:>12} | {:>20}".format(
+                            year,
+                            sales_values[year],
+                            growth_str,
+                            "See below" if out.full else ""
+                        ))
+
+                # Print detailed calculations
+                if out.full:
+                    out.line("\n=== Detailed Sales Growth Calculations ===")
+                    out.line("Growth Rate = ((Current Year Revenue - Previous Year Revenue) / |Previous Year Revenue|) × 100")
+
+                    for year in sorted_years:
+                        out.line(f"\nYear {year}:")
+                        out.line(f"Total Revenue: ${sales_values[year]:,.0f}")
+
+                        if year_growth.get(year) is not None:
+                            prev_year = year - 1
+                            prev_sales = sales_values[prev_year]
+                            curr_sales = sales_values[year]
+                            out.line(f"\nGrowth Rate Calculation:")
+                            out.line(f"Previous Year ({prev_year}) Revenue: ${prev_sales:,.0f}")
+                            out.line(f"Current Year ({year}) Revenue: ${curr_sales:,.0f}")
+                            out.line(f"Change in Revenue: ${(curr_sales - prev_sales):+,.0f}")
+                            out.line(f"Growth Rate: (${curr_sales:,.0f} - ${prev_sales:,.0f}) / ${abs(prev_sales):,.0f} × 100 = {year_growth[year]:+.2f}%")
+
+                # Calculate and store average growth rate
+                if growth_rates:
+                    self.avg_sales_growth = self.calculate_average_growth(growth_rates)
+                    out.line(f"\nAverage Sales Growth Rate: {self.avg_sales_growth:.2f}%")
                 else:
-                    prev_year = sorted_years[i-1]
-                    prev_sales = sales_values[prev_year]
-                    curr_sales = sales_values[year]
-                    
-                    if prev_sales != 0:
-                        growth_rate = ((curr_sales - prev_sales) / abs(prev_sales)) * 100
-                        growth_rates.append(growth_rate)
-                        growth_str = f"{growth_rate:+.2f}%"
-                        calc_str = f"({curr_sales:,.0f} - {prev_sales:,.0f}) / {abs(prev_sales):,.0f}"
-                    else:
-                        growth_str = "N/A"
-                        calc_str = "prev sales = 0"
-            
-                print("{:<6} | ${:>14,.0f} | {:>12} | {:>20}".format(
-                    year,
-                    sales_values[year],
-                    growth_str,
-                    "See below"
-                ))
-            
-            # Print detailed calculations
-            print("\n=== Detailed Sales Growth Calculations ===")
-            print("Growth Rate = ((Current Year Revenue - Previous Year Revenue) / |Previous Year Revenue|) × 100")
-            
-            for i, year in enumerate(sorted_years):
-                details = calculation_details[year]
-                print(f"\nYear {year}:")
-                print(f"Total Revenue: ${details['total_revenue']:,.0f}")
-                
-                if i > 0:
-                    prev_year = sorted_years[i-1]
-                    prev_sales = sales_values[prev_year]
-                    curr_sales = sales_values[year]
-                    
-                    if prev_sales != 0:
-                        growth_rate = ((curr_sales - prev_sales) / abs(prev_sales)) * 100
-                        print(f"\nGrowth Rate Calculation:")
-                        print(f"Previous Year ({prev_year}) Revenue: ${prev_sales:,.0f}")
-                        print(f"Current Year ({year}) Revenue: ${curr_sales:,.0f}")
-                        print(f"Change in Revenue: ${(curr_sales - prev_sales):+,.0f}")
-                        print(f"Growth Rate: (${curr_sales:,.0f} - ${prev_sales:,.0f}) / ${abs(prev_sales):,.0f} × 100 = {growth_rate:+.2f}%")
-            
-            # Calculate and store average growth rate
-            if growth_rates:
-                self.avg_sales_growth = self.calculate_average_growth(growth_rates)
-                print(f"\nAverage Sales Growth Rate: {self.avg_sales_growth:.2f}%")
-            else:
+                    self.avg_sales_growth = None
+                    out.line("\nUnable to calculate average sales growth rate")
+
+                out.lines([
+                    "\nGrowth Rate Explanation:",
+                    "- Growth rates show percentage change in Total Revenue",
+                    "- Positive rates indicate increase in sales",
+                    "- Negative rates indicate decrease in sales",
+                    "- Using absolute value in denominator to handle negative revenue values properly",
+                ], FULL)
+
+                return sales_values
+
+            except Exception as e:
+                out.line(f"\nError in sales growth calculation: {str(e)}")
                 self.avg_sales_growth = None
-                print("\nUnable to calculate average sales growth rate")
-            
-            print("\nGrowth Rate Explanation:")
-            print("- Growth rates show percentage change in Total Revenue")
-            print("- Positive rates indicate increase in sales")
-            print("- Negative rates indicate decrease in sales")
-            print("- Using absolute value in denominator to handle negative revenue values properly")
-            
-            return sales_values
-            
-        except Exception as e:
-            print(f"\nError in sales growth calculation: {str(e)}")
-            self.avg_sales_growth = None
-            return None
+                return None
 
     def free_cash_flow_growth_rate(self):
-        try:
-            print("\n=== Free Cash Flow Growth Analysis ===")
-            
-            # Get cash flow data
-            cash_flow = self.stock.cashflow
-            
-            fcf_values = {}
-            growth_rates = []
-            calculation_details = {}
-            
-            # Calculate FCF for each year
-            for date in cash_flow.columns:
-                try:
-                    year = date.year
-                    operating_cf = float(cash_flow.loc['Operating Cash Flow', date])
-                    capital_exp = float(cash_flow.loc['Capital Expenditure', date])
-                    # Corrected FCF formula: OCF - |CapEx|
-                    fcf = operating_cf - abs(capital_exp)  # Take absolute value of CapEx since it's negative
-                    fcf_values[year] = fcf
-                    
+        with self.report() as out:
+            try:
+                out.line("\n=== Free Cash Flow Growth Analysis ===")
+
+                # Get cash flow data
+                cash_flow = self.fetch('cashflow')
+
+                fcf_values = {}
+                calculation_details = {}
+
+                # Calculate FCF for each year where both inputs are present
+                check = self.check_inputs('fcf')
+                values = check.values.loc[:, check.usable_dates]
+                # Corrected FCF formula: OCF - |CapEx| (CapEx is reported as a negative number)
+                fcf = values.loc['Operating Cash Flow'] - values.loc['Capital Expenditure'].abs()
+                for date in values.columns:
+                    fcf_values[date.year] = float(fcf[date])
+
                     # Store calculation details
-                    calculation_details[year] = {
-                        'operating_cash_flow': operating_cf,
-                        'capital_expenditure': capital_exp,
-                        'free_cash_flow': fcf
+                    calculation_details[date.year] = {
+                        'operating_cash_flow': float(values.at['Operating Cash Flow', date]),
+                        'capital_expenditure': float(values.at['Capital Expenditure', date]),
+                        'free_cash_flow': float(fcf[date])
                     }
-                except Exception as e:
-                    print(f"Skipping {year} due to missing or invalid data")
-                    continue
-            
-            # Print FCF values with growth rates
-            print("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "FCF", "Growth Rate", "Calculation"))
-            print("-" * 65)
-            
-            sorted_years = sorted(fcf_values.keys())
-            for i, year in enumerate(sorted_years):
-                if i == 0:
-                    growth_str = "Base Year"
-                    calc_str = "N/A"
+                if not check.usable.all():
+                    out.line(check.summary(), TABLE)
+
+                # Growth per year over the previous fiscal year; None after a gap or a zero FCF year
+                sorted_years = sorted(fcf_values.keys())
+                year_growth = _adjacent_growth(fcf_values, _relative_change)
+                growth_rates = [growth for growth in year_growth.values() if growth is not None]
+
+                # Print FCF values with growth rates
+                if out.table:
+                    out.line("\n{:<6} | {:>15} | {:>12} | {:>20}".format("Year", "FCF", "Growth Rate", "Calculation"))
+                    out.line("-" * 65)
+                    for year in _year_span(sorted_years):
+                        if year not in fcf_values:
+                            out.line("{:<6} | {:>15} | {:>12} | {:>20}".format(year, "N/A", "N/A", ""))
+                            continue
+                        if year == sorted_years[0]:
+                            growth_str = "Base Year"
+                        elif year_growth[year] is None:
+                            growth_str = "N/A"
+                        else:
+                            growth_str = f"{year_growth[year]:+.2f}%"
+                        out.line("{:<6} | ${:>14,.0f} | {:>12} | {:>20}".format(
+                            year,
+                            fcf_values[year],
+                            growth_str,
+                            "See below" if out.full else ""
+                        ))
+
+                # Print detailed calculations
+                if out.full:
+                    out.line("\n=== Detailed Free Cash Flow Calculations ===")
+                    out.line("FCF = Operating Cash Flow - |Capital Expenditure|")
+                    out.line("Note: We take the absolute value of Capital Expenditure since it's typically reported as a negative number")
+                    out.line("Growth Rate = ((Current Year FCF - Previous Year FCF) / |Previous Year FCF|) × 100")
+
+                    for year in sorted_years:
+                        details = calculation_details[year]
+                        out.line(f"\nYear {year}:")
+                        out.line(f"Operating Cash Flow: ${details['operating_cash_flow']:,.0f}")
+                        out.line(f"Capital Expenditure: ${details['capital_expenditure']:,.0f}")
+                        out.line(f"Free Cash Flow Calculation: ${details['operating_cash_flow']:,.0f} - |${details['capital_expenditure']:,.0f}| = ${details['free_cash_flow']:,.0f}")
+
+                        if year_growth.get(year) is not None:
+                            prev_year = year - 1
+                            prev_fcf = fcf_values[prev_year]
+                            curr_fcf = fcf_values[year]
+                            out.line(f"\nGrowth Rate Calculation:")
+                            out.line(f"Previous Year ({prev_year}) FCF: ${prev_fcf:,.0f}")
+                            out.line(f"Current Year ({year}) FCF: ${curr_fcf:,.0f}")
+                            out.line(f"Change in FCF: ${(curr_fcf - prev_fcf):+,.0f}")
+                            out.line(f"Growth Rate: (${curr_fcf:,.0f} - ${prev_fcf:,.0f}) / ${abs(prev_fcf):,.0f} × 100 = {year_growth[year]:+.2f}%")
+
+                # Calculate and store average growth rate
+                if growth_rates:
+                    self.avg_fcf_growth = self.calculate_average_growth(growth_rates)
+                    out.line(f"\nAverage Free Cash Flow Growth Rate: {self.avg_fcf_growth:.2f}%")
                 else:
-                    prev_year = sorted_years[i-1]
-                    prev_fcf = fcf_values[prev_year]
-                    curr_fcf = fcf_values[year]
-                    
-                    if prev_fcf != 0:
-                        growth_rate = ((curr_fcf - prev_fcf) / abs(prev_fcf)) * 100
-                        growth_rates.append(growth_rate)
-                        growth_str = f"{growth_rate:+.2f}%"
-                        calc_str = f"({curr_fcf:,.0f} - {prev_fcf:,.0f}) / {abs(prev_fcf):,.0f}"
-                    else:
-                        growth_str = "N/A"
-                        calc_str = "prev FCF = 0"
-            
-                print("{:<6} | ${:>14,.0f} | {:>12} | {:>20}".format(
-                    year,
-                    fcf_values[year],
-                    growth_str,
-                    "See below"
-                ))
-            
-            # Print detailed calculations
-            print("\n=== Detailed Free Cash Flow Calculations ===")
-            print("FCF = Operating Cash Flow - |Capital Expenditure|")
-            print("Note: We take the absolute value of Capital Expenditure since it's typically reported as a negative number")
-            print("Growth Rate = ((Current Year FCF - Previous Year FCF) / |Previous Year FCF|) × 100")
-            
-            for i, year in enumerate(sorted_years):
-                details = calculation_details[year]
-                print(f"\nYear {year}:")
-                print(f"Operating Cash Flow: ${details['operating_cash_flow']:,.0f}")
-                print(f"Capital Expenditure: ${details['capital_expenditure']:,.0f}")
-                print(f"Free Cash Flow Calculation: ${details['operating_cash_flow']:,.0f} - |${details['capital_expenditure']:,.0f}| = ${details['free_cash_flow']:,.0f}")
-                
-                if i > 0:
-                    prev_year = sorted_years[i-1]
-                    prev_fcf = fcf_values[prev_year]
-                    curr_fcf = fcf_values[year]
-                    
-                    if prev_fcf != 0:
-                        growth_rate = ((curr_fcf - prev_fcf) / abs(prev_fcf)) * 100
-                        print(f"\nGrowth Rate Calculation:")
-                        print(f"Previous Year ({prev_year}) FCF: ${prev_fcf:,.0f}")
-                        print(f"Current Year ({year}) FCF: ${curr_fcf:,.0f}")
-                        print(f"Change in FCF: ${(curr_fcf - prev_fcf):+,.0f}")
-                        print(f"Growth Rate: (${curr_fcf:,.0f} - ${prev_fcf:,.0f}) / ${abs(prev_fcf):,.0f} × 100 = {growth_rate:+.2f}%")
-            
-            # Calculate and store average growth rate
-            if growth_rates:
-                self.avg_fcf_growth = self.calculate_average_growth(growth_rates)
-                print(f"\nAverage Free Cash Flow Growth Rate: {self.avg_fcf_growth:.2f}%")
-            else:
+                    self.avg_fcf_growth = None
+                    out.line("\nUnable to calculate average FCF growth rate")
+
+                out.lines([
+                    "\nGrowth Rate Explanation:",
+                    "- Growth rates show percentage change in Free Cash Flow",
+                    "- Positive rates indicate increase in FCF",
+                    "- Negative rates indicate decrease in FCF",
+                    "- Using absolute value in denominator to handle negative FCF values properly",
+                    "- Capital Expenditure is typically negative, so it's subtracted from Operating Cash Flow",
+                ], FULL)
+
+                return fcf_values
+
+            except Exception as e:
+                out.line(f"\nError in FCF growth calculation: {str(e)}")
                 self.avg_fcf_growth = None
-                print("\nUnable to calculate average FCF growth rate")
-            
-            print("\nGrowth Rate Explanation:")
-            print("- Growth rates show percentage change in Free Cash Flow")
-            print("- Positive rates indicate increase in FCF")
-            print("- Negative rates indicate decrease in FCF")
-            print("- Using absolute value in denominator to handle negative FCF values properly")
-            print("- Capital Expenditure is typically negative, so it's subtracted from Operating Cash Flow")
-            
-            return fcf_values
-            
-        except Exception as e:
-            print(f"\nError in FCF growth calculation: {str(e)}")
-            self.avg_fcf_growth = None
-            return None
+                return None
 
     def calculate_dcf(self, years=10, growth_rate=0.05, discount_rate=0.12, terminal_growth=0.02):
         # Modified default values to match Buffett's conservative approach:
@@ -930,358 +1029,437 @@ class StockAnalysis:
         # - 5% initial growth (conservative)
         # - 12% discount rate (includes risk premium)
         # - 2% terminal growth (around inflation)
-        try:
-            print("\n=== Key Formulas Used ===")
-            print("1. Present Value = Future Cash Flow / (1 + Discount Rate)^Year")
-            print("2. Future Cash Flow = Current FCF × (1 + Growth Rate)^Year")
-            print("3. Terminal Value = Final Year FCF × (1 + Terminal Growth) / (Discount Rate - Terminal Growth)")
-            print("4. Enterprise Value = Sum of Present Values + PV of Terminal Value")
-            print("5. Fair Value per Share = Enterprise Value / Shares Outstanding")
-            print("6. Margin of Safety = (Fair Value - Current Price) / Fair Value × 100")
-            
-            if not StockAnalysis._dcf_has_run:
-                StockAnalysis._dcf_has_run = True
-                use_default = input("\nDo you want to use default values for DCF analysis? (Y/N): ").strip()
-                if use_default.upper() == "N" or use_default == "y":
-                    try:
-                        self.dcf_years = int(input("\nEnter number of years for projection (default 10): ") or "10")
-                        # Convert percentage inputs to decimals
-                        growth_input = float(input("Enter expected growth rate % (default 5): ") or "5")
-                        self.dcf_growth = growth_input / 100
-                        
-                        discount_input = float(input("Enter discount rate % (default 12): ") or "12")
-                        self.dcf_discount = discount_input / 100
-                        
-                        terminal_input = float(input("Enter terminal growth rate % (default 2): ") or "2")
-                        self.dcf_terminal = terminal_input / 100
-                    except ValueError as e:
-                        print("\nInvalid input. Using default values.")
+        with self.report() as out:
+            try:
+                out.lines([
+                    "\n=== Key Formulas Used ===",
+                    "1. Present Value = Future Cash Flow / (1 + Discount Rate)^Year",
+                    "2. Future Cash Flow = Current FCF × (1 + Growth Rate)^Year",
+                    "3. Terminal Value = Final Year FCF × (1 + Terminal Growth) / (Discount Rate - Terminal Growth)",
+                    "4. Enterprise Value = Sum of Present Values + PV of Terminal Value",
+                    "5. Fair Value per Share = Enterprise Value / Shares Outstanding",
+                    "6. Margin of Safety = (Fair Value - Current Price) / Fair Value × 100",
+                ], FULL)
+
+                if not StockAnalysis._dcf_has_run:
+                    StockAnalysis._dcf_has_run = True
+                    # Show everything collected so far before prompting
+                    out.flush()
+                    use_default = input("\nDo you want to use default values for DCF analysis? (Y/N): ").strip()
+                    if use_default.upper() == "N" or use_default == "y":
+                        try:
+                            self.dcf_years = int(input("\nEnter number of years for projection (default 10): ") or "10")
+                            # Convert percentage inputs to decimals
+                            growth_input = float(input("Enter expected growth rate % (default 5): ") or "5")
+                            self.dcf_growth = growth_input / 100
+
+                            discount_input = float(input("Enter discount rate % (default 12): ") or "12")
+                            self.dcf_discount = discount_input / 100
+
+                            terminal_input = float(input("Enter terminal growth rate % (default 2): ") or "2")
+                            self.dcf_terminal = terminal_input / 100
+                        except ValueError as e:
+                            out.line("\nInvalid input. Using default values.")
+                            self.dcf_years = years
+                            self.dcf_growth = growth_rate
+                            self.dcf_discount = discount_rate
+                            self.dcf_terminal = terminal_growth
+                    else:
                         self.dcf_years = years
                         self.dcf_growth = growth_rate
                         self.dcf_discount = discount_rate
                         self.dcf_terminal = terminal_growth
-                else:
-                    self.dcf_years = years
-                    self.dcf_growth = growth_rate
-                    self.dcf_discount = discount_rate
-                    self.dcf_terminal = terminal_growth
-
-            print("\nUsing values:")
-            print(f"Years: {self.dcf_years}")
-            print(f"Growth Rate: {self.dcf_growth*100:.1f}%")
-            print(f"Discount Rate: {self.dcf_discount*100:.1f}%")
-            print(f"Terminal Growth: {self.dcf_terminal*100:.1f}%")
-
-            # Use the stored parameters
-            params = getattr(self, '_dcf_params', {
-                'years': self.dcf_years,
-                'growth_rate': self.dcf_growth,
-                'discount_rate': self.dcf_discount,
-                'terminal_growth': self.dcf_terminal
-            })
-            
-            years = params['years']
-            growth_rate = params['growth_rate']
-            discount_rate = params['discount_rate']
-            terminal_growth = params['terminal_growth']
 
-            try:
+                if out.table:
+                    out.line("\nUsing values:")
+                    out.line(f"Years: {self.dcf_years}")
+                    out.line(f"Growth Rate: {self.dcf_growth*100:.1f}%")
+                    out.line(f"Discount Rate: {self.dcf_discount*100:.1f}%")
+                    out.line(f"Terminal Growth: {self.dcf_terminal*100:.1f}%")
+
+                # Use the stored parameters
+                params = getattr(self, '_dcf_params', {
+                    'years': self.dcf_years,
+                    'growth_rate': self.dcf_growth,
+                    'discount_rate': self.dcf_discount,
+                    'terminal_growth': self.dcf_terminal
+                })
+
+                years = params['years']
+                growth_rate = params['growth_rate']
+                discount_rate = params['discount_rate']
+                terminal_growth = params['terminal_growth']
+
                 # Get the current free cash flow
-                try:
-                    cash_flow = self.stock.cashflow
-                    if cash_flow.empty:
-                        print("\nNo cash flow data available.")
-                        return None
-                    
-                    # Use the average of the last 3-5 years of FCF
-                    fcf_series = cash_flow.loc['Free Cash Flow']
-                    recent_fcfs = fcf_series.head(5).dropna()
-                    if recent_fcfs.empty:
-                        print("\nNo valid Free Cash Flow data available.")
-                        return None
-                    fcf = recent_fcfs.mean()
-                    print(f"\n=== DCF Calculation Details ===")
-                    print(f"Starting Free Cash Flow (5-year average): ${fcf:,.2f}")
-                    
-                    # Get current year
-                    current_year = datetime.now().year
-                    
-                    # Calculate future cash flows and present values
-                    future_cash_flows = []
-                    present_values = []
-                    
-                    print("\nDetailed DCF Calculations:")
-                    print(f"Initial Growth Rate (Years 1-5): {growth_rate*100:.1f}%")
-                    print(f"Terminal Growth Rate (Years 6+): {terminal_growth*100:.1f}%")
-                    print(f"Discount Rate: {discount_rate*100:.1f}%")
-                    print("\nYear | Growth Rate | Future Cash Flow | Discount Factor | Present Value")
-                    print("-" * 75)
-                    
-                    for year_offset in range(1, years + 1):
-                        projection_year = current_year + year_offset
-                        
-                        # Calculate projected FCF
-                        if year_offset <= 5:
-                            fcf *= (1 + growth_rate)
-                            growth_rate_used = growth_rate
-                        else:
-                            fcf *= (1 + terminal_growth)
-                            growth_rate_used = terminal_growth
-                        
-                        future_cash_flows.append(fcf)
-                        
-                        # Calculate present value
-                        discount_factor = 1 / ((1 + discount_rate) ** year_offset)
-                        pv = fcf * discount_factor
-                        present_values.append(pv)
-                        
-                        print(f"{projection_year:4d} | {growth_rate_used:>9.1%} | ${fcf:>14,.0f} | {discount_factor:>14.4f} | ${pv:>14,.0f}")
-                    
-                    # Calculate total present value
-                    total_pv = sum(present_values)
-                    print("-" * 75)
-                    print(f"Total Present Value: ${total_pv:,.0f}")
-                    
-                    # Get shares outstanding
-                    shares_outstanding = self.stock.info.get('sharesOutstanding', None)
-                    if shares_outstanding is None:
-                        print("\nNo shares outstanding data available.")
-                        return None
-                    
-                    print(f"Shares Outstanding: {shares_outstanding:,.0f}")
-                    
-                    # Calculate fair value per share
-                    fair_value = total_pv / shares_outstanding
-                    current_price = self.stock.info.get('currentPrice', None)
-                    
-                    if current_price is None:
-                        print("\nNo current price data available.")
-                        return None
-                    
-                    # Calculate margin of safety
-                    margin_of_safety = ((fair_value - current_price) / fair_value) * 100
-                    
-                    # Print DCF Valuation Summary with better formatting
-                    print("\n")
-                    print("╔" + "═" * 70 + "╗")
-                    print("║" + " DCF VALUATION SUMMARY ".center(70) + "║")
-                    print("╠" + "═" * 70 + "╣")
-                    print("║" + f" Enterprise Value:        ${total_pv:,.0f}".ljust(70) + "║")
-                    print("║" + f" Shares Outstanding:      {shares_outstanding:,.0f}".ljust(70) + "║")
-                    print("╟" + "─" * 70 + "╢")
-                    print("║" + f" Fair Value per Share:    ${fair_value:,.2f}".ljust(70) + "║")
-                    print("║" + f" Current Price:           ${current_price:,.2f}".ljust(70) + "║")
-                    print("║" + f" Margin of Safety:        {margin_of_safety:,.1f}%".ljust(70) + "║")
-                    print("╟" + "─" * 70 + "╢")
-                    
-                    # Add interpretation
-                    if margin_of_safety > 0:
-                        print("║" + f" VERDICT: Stock appears UNDERVALUED by {margin_of_safety:.1f}%".ljust(70) + "║")
-                        print("║" + " SUGGESTION: Consider buying if assumptions are valid".ljust(70) + "║")
+                cash_flow = self.fetch('cashflow')
+                if cash_flow.empty:
+                    out.line("\nNo cash flow data available.")
+                    return None
+
+                # Use the average of the last 3-5 years of FCF
+                fcf = starting_free_cash_flow(cash_flow)
+                if fcf is None:
+                    out.line("\nNo valid Free Cash Flow data available.")
+                    return None
+
+                # Get current year
+                current_year = datetime.now().year
+
+                if out.table:
+                    out.line(f"\n=== DCF Calculation Details ===")
+                    out.line(f"Starting Free Cash Flow (5-year average): ${fcf:,.2f}")
+                    out.line("\nDetailed DCF Calculations:")
+                    out.line(f"Initial Growth Rate (Years 1-5): {growth_rate*100:.1f}%")
+                    out.line(f"Terminal Growth Rate (Years 6+): {terminal_growth*100:.1f}%")
+                    out.line(f"Discount Rate: {discount_rate*100:.1f}%")
+                    out.line("\nYear | Growth Rate | Future Cash Flow | Discount Factor | Present Value")
+                    out.line("-" * 75)
+
+                # Calculate future cash flows and present values
+                future_cash_flows = []
+                present_values = []
+
+                for year_offset in range(1, years + 1):
+                    projection_year = current_year + year_offset
+
+                    # Calculate projected FCF
+                    if year_offset <= 5:
+                        fcf *= (1 + growth_rate)
+                        growth_rate_used = growth_rate
                     else:
-                        print("║" + f" VERDICT: Stock appears OVERVALUED by {abs(margin_of_safety):.1f}%".ljust(70) + "║")
-                        print("║" + " SUGGESTION: Caution warranted at current price".ljust(70) + "║")
-                    print("╚" + "═" * 70 + "╝")
-
-                    # Print assumptions in a separate box
-                    print("\n")
-                    print("┌" + "─" * 70 + "┐")
-                    print("│" + " KEY ASSUMPTIONS ".center(70) + "│")
-                    print("├" + "─" * 70 + "┤")
-                    print("│" + f" Growth Rate (Years 1-5):    {growth_rate:.1%}".ljust(70) + "│")
-                    print("│" + f" Terminal Growth (Years 6+): {terminal_growth:.1%}".ljust(70) + "│")
-                    print("│" + f" Discount Rate:             {discount_rate:.1%}".ljust(70) + "│")
-                    print("└" + "─" * 70 + "┘")
-                    
-                    print("\nNote: DCF results are highly sensitive to input assumptions.")
-                    print("Consider running multiple scenarios with different growth rates.")
-                    
-                    return fair_value
-                    
-                except Exception as e:
-                    print(f"\nError in cash flow calculations: {str(e)}")
+                        fcf *= (1 + terminal_growth)
+                        growth_rate_used = terminal_growth
+
+                    future_cash_flows.append(fcf)
+
+                    # Calculate present value
+                    discount_factor = 1 / ((1 + discount_rate) ** year_offset)
+                    pv = fcf * discount_factor
+                    present_values.append(pv)
+
+                    if out.table:
+                        out.line(f"{projection_year:4d} | {growth_rate_used:>9.1%} | ${fcf:>14,.0f} | {discount_factor:>14.4f} | ${pv:>14,.0f}")
+
+                # Calculate total present value
+                total_pv = sum(present_values)
+                if out.table:
+                    out.line("-" * 75)
+                    out.line(f"Total Present Value: ${total_pv:,.0f}")
+
+                # Get shares outstanding
+                shares_outstanding = self.fetch('info').get('sharesOutstanding', None)
+                if shares_outstanding is None:
+                    out.line("\nNo shares outstanding data available.")
                     return None
-                
+
+                if out.table:
+                    out.line(f"Shares Outstanding: {shares_outstanding:,.0f}")
+
+                # Calculate fair value per share
+                fair_value = total_pv / shares_outstanding
+                current_price = self.fetch('info').get('currentPrice', None)
+
+                if current_price is None:
+                    out.line("\nNo current price data available.")
+                    return None
+
+                # Calculate margin of safety
+                margin_of_safety = ((fair_value - current_price) / fair_value) * 100
+
+                # Print DCF Valuation Summary with better formatting
+                out.line("\n")
+                out.line("╔" + "═" * 70 + "╗")
+                out.line("║" + " DCF VALUATION SUMMARY ".center(70) + "║")
+                out.line("╠" + "═" * 70 + "╣")
+                out.line("║" + f" Enterprise Value:        ${total_pv:,.0f}".ljust(70) + "║")
+                out.line("║" + f" Shares Outstanding:      {shares_outstanding:,.0f}".ljust(70) + "║")
+                out.line("╟" + "─" * 70 + "╢")
+                out.line("║" + f" Fair Value per Share:    ${fair_value:,.2f}".ljust(70) + "║")
+                out.line("║" + f" Current Price:           ${current_price:,.2f}".ljust(70) + "║")
+                out.line("║" + f" Margin of Safety:        {margin_of_safety:,.1f}%".ljust(70) + "║")
+                out.line("╟" + "─" * 70 + "╢")
+
+                # Add interpretation
+                if margin_of_safety > 0:
+                    out.line("║" + f" VERDICT: Stock appears UNDERVALUED by {margin_of_safety:.1f}%".ljust(70) + "║")
+                    out.line("║" + " SUGGESTION: Consider buying if assumptions are valid".ljust(70) + "║")
+                else:
+                    out.line("║" + f" VERDICT: Stock appears OVERVALUED by {abs(margin_of_safety):.1f}%".ljust(70) + "║")
+                    out.line("║" + " SUGGESTION: Caution warranted at current price".ljust(70) + "║")
+                out.line("╚" + "═" * 70 + "╝")
+
+                # Print assumptions in a separate box
+                if out.table:
+                    out.line("\n")
+                    out.line("┌" + "─" * 70 + "┐")
+                    out.line("│" + " KEY ASSUMPTIONS ".center(70) + "│")
+                    out.line("├" + "─" * 70 + "┤")
+                    out.line("│" + f" Growth Rate (Years 1-5):    {growth_rate:.1%}".ljust(70) + "│")
+                    out.line("│" + f" Terminal Growth (Years 6+): {terminal_growth:.1%}".ljust(70) + "│")
+                    out.line("│" + f" Discount Rate:             {discount_rate:.1%}".ljust(70) + "│")
+                    out.line("└" + "─" * 70 + "┘")
+
+                out.lines([
+                    "\nNote: DCF results are highly sensitive to input assumptions.",
+                    "Consider running multiple scenarios with different growth rates.",
+                ], FULL)
+
+                return fair_value
+
             except Exception as e:
-                print(f"\nError in DCF calculation: {str(e)}")
+                out.line(f"\nError in DCF calculation: {str(e)}")
                 return None
-            
+
+    def get_dcf_inputs(self):
+        """
+        Returns the inputs calculate_dcf values the stock from.
+
+        Returns:
+            dict: 'Free Cash Flow' (5-year average), 'Shares Outstanding' and
+            'Current Price', or None if any of them is unavailable
+        """
+        try:
+            fcf = starting_free_cash_flow(self.fetch('cashflow'))
+            shares_outstanding = self.fetch('info').get('sharesOutstanding')
+            current_price = self.fetch('info').get('currentPrice')
+            if fcf is None or not shares_outstanding or not current_price:
+                return None
+            return {
+                'Free Cash Flow': fcf,
+                'Shares Outstanding': float(shares_outstanding),
+                'Current Price': float(current_price),
+            }
         except Exception as e:
-            print(f"\nError in DCF calculation: {str(e)}")
+            print(f"Error collecting DCF inputs for {self.ticker_symbol}: {e}")
             return None
-        
-    def calculate_amzn_dcf(self, years=15, growth_rate=0.12, terminal_growth=0.02, discount_rate=0.08):
-        try:
-            print("\n")
-            print("╔" + "═" * 78 + "╗")
-            print("║" + " " * 78 + "║")
-            print("║" + "AMAZON-STYLE DCF VALUATION".center(78) + "║")
-            print("║" + "(Adjusted for High Growth & Investment)".center(78) + "║")
-            print("║" + " " * 78 + "║")
-            print("╚" + "═" * 78 + "╝")
 
-            # Use the values from regular DCF if they exist
-            if hasattr(self, 'dcf_years'):
-                years = self.dcf_years
-                growth_rate = self.dcf_growth
-                discount_rate = self.dcf_discount
-                terminal_growth = self.dcf_terminal
-
-            print("\nUsing values:")
-            print(f"Years: {years}")
-            print(f"Growth Rate: {growth_rate*100:.1f}%")
-            print(f"Discount Rate: {discount_rate*100:.1f}%")
-            print(f"Terminal Growth: {terminal_growth*100:.1f}%")
-
-            print("\n=== Key Formulas Used ===")
-            print("1. Adjusted Free Cash Flow = Operating Cash Flow - Maintenance CapEx")
-            print("2. Maintenance CapEx = 33% of Operating Cash Flow")
-            print("3. Growth CapEx = 67% of Operating Cash Flow (excluded from FCF)")
-            print("4. Present Value = Future Cash Flow / (1 + Discount Rate)^Year")
-            print("5. Terminal Value = Final Year FCF × (1 + Terminal Growth) / (Discount Rate - Terminal Growth)")
-            
-            # Get cash flow data
-            cash_flow = self.stock.cashflow
-            if cash_flow.empty:
-                print("\nNo cash flow data available.")
+    def calculate_reverse_dcf(self, years=10, growth_rate=0.05, discount_rate=0.12, terminal_growth=0.02):
+        try:
+            inputs = self.get_dcf_inputs()
+            if inputs is None:
+                print("\nInsufficient data for reverse DCF analysis.")
                 return None
 
-            # Get Operating Cash Flow
-            operating_cash_flow = float(cash_flow.loc["Operating Cash Flow"].iloc[0])
-            
-            # Calculate CapEx split
-            maintenance_capex = 0.33 * operating_cash_flow
-            growth_capex = 0.67 * operating_cash_flow
-            adjusted_fcf = operating_cash_flow - maintenance_capex
-
-            print("\n=== Initial Cash Flow Analysis ===")
-            print(f"Operating Cash Flow:      ${operating_cash_flow:,.0f}")
-            print(f"Maintenance CapEx (33%):  ${maintenance_capex:,.0f}")
-            print(f"Growth CapEx (67%):       ${growth_capex:,.0f}")
-            print(f"Adjusted Free Cash Flow:  ${adjusted_fcf:,.0f}")
-
-            # Project future cash flows
-            print("\n=== Projected Cash Flows ===")
-            print("╔" + "═" * 90 + "╗")
-            print("║" + "Year".center(10) + "│" + 
-                  "Growth".center(12) + "│" + 
-                  "Projected FCF".center(20) + "│" + 
-                  "Discount Factor".center(20) + "│" + 
-                  "Present Value".center(25) + "║")
-            print("╠" + "═" * 90 + "╣")
-
-            future_cash_flows = []
-            present_values = []
-            
-            for year in range(1, years + 1):
-                # Use different growth rates for different periods
-                if year <= 5:
-                    growth_rate_used = growth_rate
-                else:
-                    growth_rate_used = terminal_growth
-                
-                adjusted_fcf *= (1 + growth_rate_used)
-                discount_factor = 1 / ((1 + discount_rate) ** year)
-                pv = adjusted_fcf * discount_factor
-                
-                future_cash_flows.append(adjusted_fcf)
-                present_values.append(pv)
-                
-                print("║" + f"{year + 2023:^10}" + "│" + 
-                      f"{growth_rate_used:>10.1%}" + "│" + 
-                      f"${adjusted_fcf:>18,.0f}" + "│" + 
-                      f"{discount_factor:>19.4f}" + "│" + 
-                      f"${pv:>23,.0f}" + "║")
-
-            print("╚" + "═" * 90 + "╝")
-
-            # Calculate terminal value
-            terminal_fcf = future_cash_flows[-1]
-            # Check if terminal growth rate is less than discount rate
-            if terminal_growth >= discount_rate:
-                print("\nWarning: Terminal growth rate must be less than discount rate")
-                print("Adjusting terminal growth rate to discount rate - 2%")
-                terminal_growth = discount_rate - 0.02  # Set terminal growth 2% below discount rate
-            
-            # Terminal Value calculation using Gordon Growth Model
-            terminal_value = terminal_fcf * (1 + terminal_growth) / (discount_rate - terminal_growth)
-            terminal_value_pv = terminal_value / ((1 + discount_rate) ** years)
-
-            # Add validation check
-            if terminal_value < 0:
-                print("\nWarning: Invalid terminal value calculation detected")
-                print("Please check growth and discount rate assumptions")
-                return None
+            result = reverse_dcf(
+                pd.DataFrame([inputs], index=[self.ticker_symbol]),
+                discount_rate=discount_rate,
+                growth_rate=growth_rate,
+                terminal_growth=terminal_growth,
+                years=years,
+            ).iloc[0]
 
-            # Calculate total value
-            total_pv = sum(present_values) + terminal_value_pv
-            shares_outstanding = self.stock.info.get('sharesOutstanding', 0)
-            fair_value = total_pv / shares_outstanding if shares_outstanding else 0
-            current_price = self.stock.info.get('currentPrice', 0)
-            
-            print("\n=== Valuation Summary ===")
+            implied_growth = result['Implied Growth']
+            implied_discount = result['Implied Discount Rate']
+            growth_str = f"{implied_growth:.2%}" if not pd.isna(implied_growth) else "N/A"
+            discount_str = f"{implied_discount:.2%}" if not pd.isna(implied_discount) else "N/A"
+
+            print("\n")
             print("╔" + "═" * 70 + "╗")
-            print("║" + "FINAL VALUATION".center(70) + "║")
+            print("║" + " REVERSE DCF (MARKET-IMPLIED RATES) ".center(70) + "║")
             print("╠" + "═" * 70 + "╣")
-            print(f"║ Enterprise Value:        ${total_pv:,.0f}".ljust(71) + "║")
-            print(f"║ Shares Outstanding:      {shares_outstanding:,.0f}".ljust(71) + "║")
-            print(f"║ Fair Value per Share:    ${fair_value:.2f}".ljust(71) + "║")
-            print(f"║ Current Price:           ${current_price:.2f}".ljust(71) + "║")
-            margin_of_safety = ((fair_value - current_price) / fair_value) * 100
-            print(f"║ Margin of Safety:        {margin_of_safety:,.1f}%".ljust(71) + "║")
+            print("║" + f" Market Value:            ${result['Market Value']:,.0f}".ljust(70) + "║")
+            print("║" + f" Starting FCF (5-yr avg): ${result['Free Cash Flow']:,.0f}".ljust(70) + "║")
+            print("╟" + "─" * 70 + "╢")
+            print("║" + f" Implied Growth (Years 1-5) at {discount_rate:.1%} discount: {growth_str}".ljust(70) + "║")
+            print("║" + f" Implied Discount Rate at {growth_rate:.1%} growth:       {discount_str}".ljust(70) + "║")
             print("╚" + "═" * 70 + "╝")
 
-            print("\n=== Key Assumptions Used ===")
-            print("• Initial Growth Rate (Years 1-5): {:.1f}%".format(growth_rate * 100))
-            print("• Terminal Growth Rate: {:.1f}%".format(terminal_growth * 100))
-            print("• Discount Rate: {:.1f}%".format(discount_rate * 100))
-            print("• Maintenance CapEx: 33% of Operating Cash Flow")
-            print("• Growth CapEx: 67% of Operating Cash Flow (excluded)")
-            
-            print("\n=== Important Notes ===")
-            print("1. This model adjusts for Amazon's high reinvestment strategy")
-            print("2. Growth CapEx is excluded as it represents investment in future growth")
-            print("3. Actual returns depend on successful conversion of investments")
-            print("4. High growth assumptions reflect Amazon's reinvestment efficiency")
+            if pd.isna(implied_growth):
+                print("\nNote: No growth rate between -50% and 100% reproduces the market value")
+                print("(or free cash flow is not positive).")
 
-            return fair_value
+            return result
 
         except Exception as e:
-            print(f"\nError in DCF calculation: {e}")
+            print(f"\nError in reverse DCF calculation: {str(e)}")
             return None
 
+    def calculate_amzn_dcf(self, years=15, growth_rate=0.12, terminal_growth=0.02, discount_rate=0.08,
+                           maintenance_capex_ratio=None, ocf_periods=3):
+        # Valued by reinvestment_dcf for this one ticker, so it agrees with the batch model;
+        # maintenance_capex_ratio=None estimates the ratio from this stock's history
+        with self.report() as out:
+            try:
+                out.line("\n")
+                out.line("╔" + "═" * 78 + "╗")
+                out.line("║" + " " * 78 + "║")
+                out.line("║" + "AMAZON-STYLE DCF VALUATION".center(78) + "║")
+                out.line("║" + "(Adjusted for High Growth & Investment)".center(78) + "║")
+                out.line("║" + " " * 78 + "║")
+                out.line("╚" + "═" * 78 + "╝")
+
+                # Use the values from regular DCF if they exist
+                if hasattr(self, 'dcf_years'):
+                    years = self.dcf_years
+                    growth_rate = self.dcf_growth
+                    discount_rate = self.dcf_discount
+                    terminal_growth = self.dcf_terminal
+
+                # Clamp before valuing, so the printed inputs are the ones the valuation used
+                if terminal_growth >= discount_rate:
+                    out.line("\nWarning: Terminal growth rate must be less than discount rate")
+                    out.line("Adjusting terminal growth rate to discount rate - 2%")
+                    terminal_growth = discount_rate - 0.02
+
+                if out.table:
+                    out.line("\nUsing values:")
+                    out.line(f"Years: {years}")
+                    out.line(f"Growth Rate: {growth_rate*100:.1f}%")
+                    out.line(f"Discount Rate: {discount_rate*100:.1f}%")
+                    out.line(f"Terminal Growth: {terminal_growth*100:.1f}%")
+
+                # Get cash flow data
+                cash_flow = self.fetch('cashflow')
+                if cash_flow.empty:
+                    out.line("\nNo cash flow data available.")
+                    return None
+
+                info = self.fetch('info')
+                market = pd.DataFrame({'Shares Outstanding': [info.get('sharesOutstanding')],
+                                       'Current Price': [info.get('currentPrice')]}, index=[self.ticker_symbol])
+                overrides = {self.ticker_symbol: maintenance_capex_ratio} if maintenance_capex_ratio is not None else None
+                valuation = reinvestment_dcf(statement_panel({self.ticker_symbol: cash_flow}), market, growth_rate,
+                                             discount_rate, terminal_growth, years, ocf_periods, overrides=overrides)
+                if self.ticker_symbol not in valuation.index:
+                    out.line("\nNo operating cash flow data available.")
+                    return None
+                row = valuation.loc[self.ticker_symbol]
+
+                maintenance_capex_ratio = row['Maintenance Ratio']
+                maintenance_pct = f"{maintenance_capex_ratio:.0%}"
+                growth_pct = f"{1 - maintenance_capex_ratio:.0%}"
+
+                if out.full:
+                    out.line("\n=== Key Formulas Used ===")
+                    out.line(f"1. Operating Cash Flow = average of the last {ocf_periods} years")
+                    out.line("2. Adjusted Free Cash Flow = Operating Cash Flow - Maintenance CapEx")
+                    out.line(f"3. Maintenance CapEx = {maintenance_pct} of Operating Cash Flow ({row['Ratio Source']})")
+                    out.line(f"4. Growth CapEx = {growth_pct} of Operating Cash Flow (excluded from FCF)")
+                    out.line("5. Present Value = Future Cash Flow / (1 + Discount Rate)^Year")
+                    out.line("6. Terminal Value = Final Year FCF × (1 + Terminal Growth) / (Discount Rate - Terminal Growth)")
+
+                # Calculate CapEx split
+                operating_cash_flow = row['Operating Cash Flow']
+                maintenance_capex = maintenance_capex_ratio * operating_cash_flow
+                growth_capex = (1 - maintenance_capex_ratio) * operating_cash_flow
+                adjusted_fcf = row['Adjusted FCF']
+
+                if out.table:
+                    out.line("\n=== Initial Cash Flow Analysis ===")
+                    out.line(f"Operating Cash Flow:      ${operating_cash_flow:,.0f}")
+                    out.line(f"{'Maintenance CapEx (' + maintenance_pct + '):':<26}${maintenance_capex:,.0f}")
+                    out.line(f"{'Growth CapEx (' + growth_pct + '):':<26}${growth_capex:,.0f}")
+                    out.line(f"Adjusted Free Cash Flow:  ${adjusted_fcf:,.0f}")
+
+                    # Project future cash flows
+                    out.line("\n=== Projected Cash Flows ===")
+                    out.line("╔" + "═" * 90 + "╗")
+                    out.line("║" + "Year".center(10) + "│" +
+                             "Growth".center(12) + "│" +
+                             "Projected FCF".center(20) + "│" +
+                             "Discount Factor".center(20) + "│" +
+                             "Present Value".center(25) + "║")
+                    out.line("╠" + "═" * 90 + "╣")
+
+                    projected, present_values = project_cash_flows([adjusted_fcf], growth_rate, discount_rate,
+                                                                   terminal_growth, years)
+                    for year in range(1, years + 1):
+                        growth_rate_used = growth_rate if year <= HIGH_GROWTH_YEARS else terminal_growth
+                        out.line("║" + f"{year + 2023:^10}" + "│" +
+                                 f"{growth_rate_used:>10.1%}" + "│" +
+                                 f"${projected[0, year - 1]:>18,.0f}" + "│" +
+                                 f"{1 / ((1 + discount_rate) ** year):>19.4f}" + "│" +
+                                 f"${present_values[0, year - 1]:>23,.0f}" + "║")
+
+                out.line("╚" + "═" * 90 + "╝", TABLE)
+
+                # A NaN enterprise value means a negative terminal value
+                if pd.isna(row['Enterprise Value']):
+                    out.line("\nWarning: Invalid terminal value calculation detected")
+                    out.line("Please check growth and discount rate assumptions")
+                    return None
+
+                total_pv = row['Enterprise Value']
+                shares_outstanding = info.get('sharesOutstanding', 0)
+                fair_value = row['Fair Value'] if not pd.isna(row['Fair Value']) else 0
+                current_price = info.get('currentPrice', 0)
+
+                out.line("\n=== Valuation Summary ===")
+                out.line("╔" + "═" * 70 + "╗")
+                out.line("║" + "FINAL VALUATION".center(70) + "║")
+                out.line("╠" + "═" * 70 + "╣")
+                out.line(f"║ Enterprise Value:        ${total_pv:,.0f}".ljust(71) + "║")
+                out.line(f"║ Shares Outstanding:      {shares_outstanding:,.0f}".ljust(71) + "║")
+                out.line(f"║ Fair Value per Share:    ${fair_value:.2f}".ljust(71) + "║")
+                out.line(f"║ Current Price:           ${current_price:.2f}".ljust(71) + "║")
+                margin_of_safety = ((fair_value - current_price) / fair_value) * 100
+                out.line(f"║ Margin of Safety:        {margin_of_safety:,.1f}%".ljust(71) + "║")
+                out.line("╚" + "═" * 70 + "╝")
+
+                if out.table:
+                    out.line("\n=== Key Assumptions Used ===")
+                    out.line("• Initial Growth Rate (Years 1-5): {:.1f}%".format(growth_rate * 100))
+                    out.line("• Terminal Growth Rate: {:.1f}%".format(terminal_growth * 100))
+                    out.line("• Discount Rate: {:.1f}%".format(discount_rate * 100))
+                    out.line(f"• Maintenance CapEx: {maintenance_pct} of Operating Cash Flow")
+                    out.line(f"• Growth CapEx: {growth_pct} of Operating Cash Flow (excluded)")
+
+                out.lines([
+                    "\n=== Important Notes ===",
+                    "1. This model adjusts for Amazon's high reinvestment strategy",
+                    "2. Growth CapEx is excluded as it represents investment in future growth",
+                    "3. Actual returns depend on successful conversion of investments",
+                    "4. High growth assumptions reflect Amazon's reinvestment efficiency",
+                ], FULL)
+
+                return float(fair_value)
+
+            except Exception as e:
+                out.line(f"\nError in DCF calculation: {e}")
+                return None
+
     def get_bond_yield(self):
+        # The 4.0% default is applied here, after the stale fallback, so it is never cached as a fetched value
         try:
-            # Try to get the 10-year Treasury yield
-            treasury = yf.Ticker('^TNX')
-            history = treasury.history(period='1d')
-            if not history.empty:
-                # ^TNX gives yield in percentage points (e.g., 4.5 for 4.5%)
-                bond_yield = float(history['Close'].iloc[-1])
-                if bond_yield > 0:
-                    return bond_yield
-            
-            # Fallback to info method if history fails
-            raw_yield = treasury.info.get('regularMarketPrice')
-            if raw_yield and raw_yield > 0:
-                return float(raw_yield)
-            
-            # Default value if both methods fail
-            print("Warning: Using default 10-year Treasury yield of 4.0%")
-            return 4.0
-            
+            return self.fetch('bond_yield')
         except Exception as e:
             print(f"Error fetching Treasury yield: {e}")
             print("Using default 10-year Treasury yield of 4.0%")
             return 4.0
 
+    def _load_bond_yield(self):
+        if getattr(self, 'snapshot', None) is not None:
+            # Never fall back to the network; get_bond_yield applies its default instead
+            if not self.snapshot.bond_yield:
+                raise NoDataError(f"Snapshot {self.snapshot.path} has no 10-year Treasury yield")
+            return float(self.snapshot.bond_yield)
+
+        # Try to get the 10-year Treasury yield
+        treasury = yf.Ticker('^TNX')
+        history = treasury.history(period='1d')
+        if not history.empty:
+            # ^TNX gives yield in percentage points (e.g., 4.5 for 4.5%)
+            bond_yield = float(history['Close'].iloc[-1])
+            if bond_yield > 0:
+                return bond_yield
+
+        # Fallback to info method if history fails (a second provider request)
+        charge_provider_request()
+        raw_yield = treasury.info.get('regularMarketPrice')
+        if raw_yield and raw_yield > 0:
+            return float(raw_yield)
+
+        # ^TNX always has a quote, so an empty answer means the provider is failing
+        # (yfinance returns empty data on network errors); served stale like an outage
+        raise ConnectionError("No 10-year Treasury yield returned for ^TNX")
+
     def display_pe_and_earnings_yield(self):
         try:
             # Get stock metrics
-            trailing_eps = self.stock.info.get('trailingEps', 0)
-            forward_eps = self.stock.info.get('forwardEps', 0)
-            current_price = self.stock.info.get('currentPrice', 0)
-            dividend_rate = self.stock.info.get('dividendRate', 0)
+            trailing_eps = self.fetch('info').get('trailingEps', 0)
+            forward_eps = self.fetch('info').get('forwardEps', 0)
+            current_price = self.fetch('info').get('currentPrice', 0)
+            dividend_rate = self.fetch('info').get('dividendRate', 0)
             
             # Get bond yield using the new method
             bond_yield = self.get_bond_yield()
@@ -1342,12 +1520,12 @@ class StockAnalysis:
             self.bond_yield = self.get_bond_yield()
             
             # Calculate earnings yield using EPS/Price
-            current_price = self.stock.info.get('currentPrice', 0)
-            trailing_eps = self.stock.info.get('trailingEps', 0)
+            current_price = self.fetch('info').get('currentPrice', 0)
+            trailing_eps = self.fetch('info').get('trailingEps', 0)
             earnings_yield = (trailing_eps / current_price * 100) if current_price and trailing_eps else 0
             
             # Get dividend yield
-            dividend_rate = self.stock.info.get('dividendRate', 0)
+            dividend_rate = self.fetch('info').get('dividendRate', 0)
             dividend_yield = (dividend_rate / current_price * 100) if dividend_rate and current_price else 0
             
             # Calculate total stock yield
@@ -1383,19 +1561,19 @@ class StockAnalysis:
             print("Please ensure bond yield and stock yields are properly calculated first")
 
     def get_current_market_cap(self):
-        return self.stock.info['marketCap']
+        return self.fetch('info')['marketCap']
 
     def calculate_market_cap_at_price(self, interested_to_buy='Y'):
         try:
             # Get current price and shares outstanding
-            current_price = self.stock.info.get('currentPrice')
-            shares = self.stock.info.get('sharesOutstanding')
+            current_price = self.fetch('info').get('currentPrice')
+            shares = self.fetch('info').get('sharesOutstanding')
             
             # Calculate current market cap
             market_cap_current = current_price * shares
             
             # Get dividend rate and calculate yields
-            dividend_rate = self.stock.info.get('dividendRate', 0)
+            dividend_rate = self.fetch('info').get('dividendRate', 0)
             current_dividend_yield = (dividend_rate / current_price * 100) if dividend_rate and current_price else 0
             
             print("\n")
@@ -1405,6 +1583,10 @@ class StockAnalysis:
             print("║" + f" Current Price: ${current_price:,.2f}".center(70) + "║")
             print("╚" + "═" * 70 + "╝")
             
+            if interested_to_buy.upper() == 'L':
+                # Evaluate a whole ladder of prices instead of asking for one
+                return self.calculate_valuation_ladder()
+
             if interested_to_buy.upper() in ['Y', '']:
                 # Get the share price, use current price if no input
                 share_price_input = input(f"\nEnter the share price you are interested in for {self.ticker_symbol}: ").strip()
@@ -1421,7 +1603,7 @@ class StockAnalysis:
                 market_cap_change_pct = ((market_cap_interested - market_cap_current) / market_cap_current) * 100
                 
                 # Calculate PE ratios and yields at target price
-                trailing_eps = self.stock.info.get('trailingEps', 0)
+                trailing_eps = self.fetch('info').get('trailingEps', 0)
                 target_pe_ratio = share_price / trailing_eps if trailing_eps else None
                 current_pe_ratio = current_price / trailing_eps if trailing_eps else None
                 
@@ -1433,18 +1615,8 @@ class StockAnalysis:
                 current_total_yield = current_earnings_yield + current_dividend_yield
                 target_total_yield = target_earnings_yield + current_dividend_yield  # Use current_dividend_yield
                 
-                # Get bond yield
-                try:
-                    bond = yf.Ticker('^TNX')
-                    bond_info = bond.history(period='1d')
-                    if not bond_info.empty:
-                        bond_yield = float(bond_info['Close'].iloc[-1])
-                    else:
-                        print("Error: Could not retrieve bond yield data")
-                        return
-                except Exception as e:
-                    print(f"Error fetching bond yield: {e}")
-                    return
+                # Get bond yield (shared with the other valuation sections)
+                bond_yield = self.get_bond_yield()
                 
                 # Calculate breakeven price where total yield equals bond yield
                 # Total Yield = Earnings Yield + Dividend Yield = Bond Yield
@@ -1505,6 +1677,48 @@ class StockAnalysis:
         except Exception as e:
             print(f"\nError in market cap calculation: {str(e)}")
 
+    def calculate_valuation_ladder(self, points=200, low=-0.5, high=0.5, display_points=21):
+        """
+        Evaluates the market cap analysis metrics over a ladder of target prices in one pass.
+
+        Args:
+            points (int): Number of prices in the ladder
+            low (float): Lowest price change as a fraction of current price
+            high (float): Highest price change as a fraction of current price
+            display_points (int): Number of evenly spaced ladder rows to print
+
+        Returns:
+            pd.DataFrame: Full ladder indexed by (ticker, price change %)
+        """
+        try:
+            bond_yield = self.get_bond_yield()
+            ladder = valuation_ladder(
+                ladder_inputs({self.ticker_symbol: self.fetch('info')}), bond_yield, points, low, high
+            )
+
+            print("\n")
+            print("╔" + "═" * 78 + "╗")
+            print("║" + " VALUATION LADDER ".center(78) + "║")
+            print("╠" + "═" * 78 + "╣")
+            print("║" + f" {'Change':>8} │ {'Price':>10} │ {'P/E':>8} │ {'Earn Yld':>9} │ {'Tot Yld':>8} │ {'Spread':>8} │ {'MoS':>9}".ljust(78) + "║")
+            print("╟" + "─" * 78 + "╢")
+
+            rows = ladder.iloc[np.linspace(0, len(ladder) - 1, min(display_points, len(ladder))).astype(int)]
+            for (ticker, change), row in rows.iterrows():
+                print("║" + f" {change:>+7.1f}% │ ${row['Price']:>9.2f} │ {row['P/E Ratio']:>7.2f}x │ {row['Earnings Yield (%)']:>8.2f}% │ {row['Total Yield (%)']:>7.2f}% │ {row['Yield Spread (%)']:>7.2f}% │ {row['Margin of Safety (%)']:>8.2f}%".ljust(78) + "║")
+
+            print("╟" + "─" * 78 + "╢")
+            breakeven = ladder['Breakeven Price'].iloc[0]
+            breakeven_str = f"${breakeven:,.2f}" if not pd.isna(breakeven) else "N/A"
+            print("║" + f" Breakeven Price: {breakeven_str}   Bond Yield: {bond_yield:.2f}%".ljust(78) + "║")
+            print("╚" + "═" * 78 + "╝")
+
+            return ladder
+
+        except Exception as e:
+            print(f"\nError in valuation ladder calculation: {str(e)}")
+            return None
+
     def format_market_cap(self, cap):
         if cap >= 1e9:
             return f"${cap / 1e9:,.2f}B"
@@ -1512,7 +1726,7 @@ class StockAnalysis:
             return f"${cap:,.2f}"
 
     def get_finances_stock(self):
-        financials = self.stock.get_financials()
+        financials = self.fetch('financials')
         print(financials)
 
     def get_ebit_stock(self):
@@ -1528,7 +1742,7 @@ class StockAnalysis:
                     return f"${value:.2f}"
             
             # Fetch financial data
-            financials = self.stock.get_financials()
+            financials = self.fetch('financials')
             if 'EBIT' not in financials.index:
                 print("Error: EBIT data not available")
                 print("Available metrics:", ', '.join(financials.index))
@@ -1627,7 +1841,7 @@ class StockAnalysis:
     def get_free_cashflow(self):
         try:
             # Fetch cash flow statement
-            cashflow = self.stock.cashflow
+            cashflow = self.fetch('cashflow')
             if cashflow.empty:
                 print(f"No cash flow data available for {self.ticker_symbol}.")
                 return
@@ -1658,20 +1872,6 @@ class StockAnalysis:
             print("│" + " AVERAGE ANNUAL GROWTH RATES ".center(70) + "│")
             print("├" + "─" * 70 + "┤")
             
-            def classify_growth(rate):
-                if rate is None or pd.isna(rate):
-                    return "NO DATA"
-                elif rate > 15:
-                    return "STRONG"
-                elif rate > 10:
-                    return "GOOD"
-                elif rate > 5:
-                    return "MODERATE"
-                elif rate > 0:
-                    return "SLOW"
-                else:
-                    return "NEGATIVE"
-            
             # Get all the growth rates
             metrics = {
                 'ROIC': getattr(self, 'avg_roic_growth', None),
@@ -1726,8 +1926,8 @@ class StockAnalysis:
             print("║" + " BASIC STOCK INFORMATION ".center(70) + "║")
             print("╠" + "═" * 70 + "╣")
             
-            info = self.stock.info
-            cash_flow = self.stock.cashflow
+            info = self.fetch('info')
+            cash_flow = self.fetch('cashflow')
             
             # Shares Outstanding
             shares = info.get('sharesOutstanding', 0)
@@ -1812,7 +2012,7 @@ class StockAnalysis:
     def analyze_profit_factors(self):
         try:
             # Get income statement data
-            income_stmt = self.stock.income_stmt
+            income_stmt = self.fetch('income_stmt_pretty')
             
             print("\n")
             print("╔" + "═" * 70 + "╗")
@@ -1889,93 +2089,30 @@ def print_subsection_header(title):
 
 # Then modify the main execution flow:
 if __name__ == "__main__":
+    import argparse
+    from section_graph import SectionExecutor
+
+    # Optional section names on the command line limit the run to those sections
+    # (plus whatever they depend on), e.g. `python StockAnalysis.py growth_summary`
+    parser = argparse.ArgumentParser(description="Stock analysis dashboard")
+    parser.add_argument('sections', nargs='*', help="Sections to run (default: all)")
+    parser.add_argument('--verbosity', choices=['summary', 'table', 'full'], default='full',
+                        help="Detail shown by the growth and DCF sections")
+    args = parser.parse_args()
+    StockAnalysis.verbosity = args.verbosity
+
     print_section_header("STOCK ANALYSIS DASHBOARD")
     ticker_symbol = input("Enter the stock ticker symbol: ").upper()
     analysis = StockAnalysis(ticker_symbol)
-    
-    # Add Basic Info display at the start
-    print_section_header("BASIC INFORMATION")
-    analysis.display_basic_info()
-    
-    # 1. Basic Information
-    print_section_header("BASIC INFORMATION")
-    analysis.remind_fundamental_principle()
-    analysis.display_stock_info()
-    
-    # 2. Performance Metrics
-    print_section_header("PERFORMANCE METRICS")
-    print_subsection_header("Annual Performance")
-    analysis.compare_annual_performance()
-    
-    print_section_header("BUSINESS VALUATION METRICS")
-    print_subsection_header("ROIC Analysis")
-    roic_dict = analysis.analyze_roic()
-    
-    # 3. Growth Metrics
-    #print_section_header("GROWTH METRICS")
-    
-    print_subsection_header("Equity Growth")
-    equity_dict = analysis.analyze_equity_growth()
-    
-    print_subsection_header("Earnings Growth")
-    earnings_dict = analysis.eps_growth_rate()
-    
-    print_subsection_header("Sales Growth")
-    sales_dict = analysis.sales_growth_rate()
-    
-    print_subsection_header("Free Cash Flow Growth")
-    fcf_dict = analysis.free_cash_flow_growth_rate()
-    
-    # Print Growth Metrics Summary
-    analysis.print_growth_metrics_summary()
-    
-    # 4. Valuation Metrics
-    print_section_header("VALUATION METRICS")
-    print_subsection_header("PE and Earnings Yield")
-    analysis.display_pe_and_earnings_yield()
-    analysis.get_margin_of_safety()
-    
-    # 6. Financial Analysis
-    print_section_header("FINANCIAL ANALYSIS")
-    print_subsection_header("EBIT Analysis")
-    analysis.get_ebit_stock()
-    
-    # Add Profit Factors Analysis before DCF Valuation
-    print_section_header("PROFIT REDUCTION ANALYSIS")
-    analysis.analyze_profit_factors()
-    
-    # 7. DCF Valuation
-    print_section_header("DCF VALUATION")
-    # Define default values
-    DEFAULT_YEARS = 10
-    DEFAULT_GROWTH_RATE = 5.0
-    DEFAULT_DISCOUNT_RATE = 12.0
-    DEFAULT_TERMINAL_GROWTH = 2.0
-    
-    default_values = ""
 
-    if default_values == 'n':
-        print("\nPlease enter your custom values:")
-        print(f"(Default values: Years={DEFAULT_YEARS}, Growth={DEFAULT_GROWTH_RATE}%, Discount={DEFAULT_DISCOUNT_RATE}%, Terminal Growth={DEFAULT_TERMINAL_GROWTH}%)")
-        
-        years = int(input("Enter the number of years for projection [10]: ") or DEFAULT_YEARS)
-        growth_rate = float(input("Enter the earnings growth rate % [5.0]: ") or DEFAULT_GROWTH_RATE)
-        discount_rate = float(input("Enter the discount rate % [12.0]: ") or DEFAULT_DISCOUNT_RATE)
-        terminal_growth = float(input("Enter the terminal growth rate % [2.0]: ") or DEFAULT_TERMINAL_GROWTH)
-    else:
-        years = DEFAULT_YEARS
-        growth_rate = DEFAULT_GROWTH_RATE
-        discount_rate = DEFAULT_DISCOUNT_RATE
-        terminal_growth = DEFAULT_TERMINAL_GROWTH
-
-    # Calculate DCF with chosen values - only call it once
-    fair_price = analysis.calculate_dcf(years, growth_rate/100, discount_rate/100, terminal_growth/100)
-    
-    analysis.calculate_amzn_dcf(years, growth_rate/100, discount_rate/100, terminal_growth/100)
+    requested_sections = args.sections or None
 
-    # Add Market Cap Analysis here
-    print_section_header("MARKET CAP ANALYSIS")
-    analysis.calculate_market_cap_at_price()
+    executor = SectionExecutor(
+        analysis,
+        print_header=print_section_header,
+        print_subheader=print_subsection_header,
+    )
+    executor.run(requested_sections)
     
     # Final Summary
     #print_section_header("ANALYSIS SUMMARY")
@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import io
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from StockAnalysis import StockAnalysis, print_section_header, print_subsection_header
+from data_access import install_scheduler
+from fetch_scheduler import FetchScheduler, with_context
+from results_cache import ResultsCache
+from section_graph import SECTIONS, SectionExecutor, ThreadLocalStdout
+
+# Sections that prompt for input(), or require one that does, cannot be served over HTTP
+SERVABLE_SECTIONS = [
+    section.name for section in SECTIONS
+    if not any(needed.interactive for needed in SectionExecutor(None).plan([section.name]))
+]
+
+# Largest valuation ladder a request may ask for
+MAX_LADDER_POINTS = 5000
+
+
+def _json_safe(value):
+    # Convert NaN/inf to null and non-JSON types (numpy, pandas) to plain Python
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if hasattr(value, 'to_dict'):
+        return _json_safe(value.to_dict())
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class AnalysisService:
+    """
+    Long-running local HTTP service that keeps StockAnalysis instances warm.
+
+    Each ticker's StockAnalysis (and its fetched datasets) is reused for
+    result_ttl seconds and then rebuilt, so expired results are recomputed
+    from fresh data; at most max_tickers instances are kept, least recently
+    used evicted first. Results are cached until the data they were computed
+    from is result_ttl seconds old (at most max_results of them, oldest
+    evicted first), and concurrent requests for the same (ticker, endpoint,
+    parameters) share one in-flight computation instead of each starting
+    their own.
+
+    Endpoints (GET, JSON responses):
+        /health
+        /sections
+        /analysis/<ticker>/metrics
+        /analysis/<ticker>/dcf-inputs
+        /analysis/<ticker>/reverse-dcf
+        /analysis/<ticker>/ladder?points=200&low=-0.5&high=0.5
+        /analysis/<ticker>/section/<name>
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, result_ttl=900, max_workers=8, results_cache=None,
+                 max_results=1024, max_tickers=256):
+        self.host = host
+        self.port = port
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self.max_tickers = max_tickers
+        self.results_cache = results_cache
+        self._pool = ThreadPoolExecutor(max_workers)
+        self._analyses = {}
+        self._results = {}
+        self._inflight = {}
+        self._stdout = None
+
+    async def _coalesced(self, key, compute, loaded_at):
+        # Serve from cache, join an in-flight computation, or start a new one.
+        # loaded_at is when the analysis the computation reads was built.
+        cached = self._results.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self.result_ttl:
+                return cached[1]
+            self._results.pop(key, None)
+
+        task = self._inflight.get(key)
+        if task is None:
+            # The computation is its own task, so a client that disconnects (and
+            # is cancelled) cannot leave the other waiters on this key hanging
+            task = asyncio.ensure_future(self._compute(key, compute, loaded_at))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, compute, loaded_at):
+        try:
+            value = await asyncio.get_running_loop().run_in_executor(self._pool, with_context(compute))
+            self._remember(key, value, loaded_at)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _remember(self, key, value, loaded_at):
+        # Keep at most max_results results, dropping expired ones first and then the oldest.
+        # A result is stamped with its data's age, so it expires when that data does.
+        self._results.pop(key, None)
+        self._results[key] = (loaded_at, value)
+        if len(self._results) > self.max_results:
+            now = time.monotonic()
+            for old in [k for k, (stored, _) in self._results.items() if now - stored >= self.result_ttl]:
+                del self._results[old]
+            while len(self._results) > self.max_results:
+                del self._results[next(iter(self._results))]
+
+    async def _analysis(self, ticker):
+        # (StockAnalysis, time it was built). Construction is instant (datasets load
+        # lazily); an instance older than result_ttl is replaced so its data is refetched.
+        entry = self._analyses.pop(ticker, None)
+        if entry is None or time.monotonic() - entry[1] >= self.result_ttl:
+            entry = (StockAnalysis(ticker), time.monotonic())
+        # Most recently used last; evict the least recently used beyond max_tickers
+        self._analyses[ticker] = entry
+        while len(self._analyses) > self.max_tickers:
+            del self._analyses[next(iter(self._analyses))]
+        return entry
+
+    def _captured(self, call):
+        # Run call in this worker thread, returning its printed output alongside its value
+        self._stdout.local.buffer = io.StringIO()
+        try:
+            value = call()
+            return {'result': _json_safe(value), 'output': self._stdout.local.buffer.getvalue()}
+        finally:
+            self._stdout.local.buffer = None
+
+    async def handle(self, path, query):
+        parts = [p for p in path.split('/') if p]
+        if parts == ['health']:
+            return 200, {'status': 'ok', 'tickers': sorted(self._analyses)}
+        if parts == ['sections']:
+            return 200, {'sections': SERVABLE_SECTIONS}
+        if len(parts) < 3 or parts[0] != 'analysis':
+            return 404, {'error': f"Unknown endpoint: {path}"}
+
+        ticker, endpoint = parts[1].upper(), parts[2]
+        analysis, loaded_at = await self._analysis(ticker)
+
+        if endpoint == 'metrics':
+            compute = lambda: _json_safe(analysis.compute_derived_metrics(self.results_cache))
+        elif endpoint == 'dcf-inputs':
+            compute = lambda: _json_safe(analysis.get_dcf_inputs())
+        elif endpoint == 'reverse-dcf':
+            compute = lambda: self._captured(analysis.calculate_reverse_dcf)
+        elif endpoint == 'ladder':
+            try:
+                points = int(query.get('points', ['200'])[0])
+                low = float(query.get('low', ['-0.5'])[0])
+                high = float(query.get('high', ['0.5'])[0])
+            except ValueError:
+                return 400, {'error': "points must be an integer and low/high numbers"}
+            if not 1 <= points <= MAX_LADDER_POINTS or not -1 < low <= high:
+                return 400, {'error': f"Expected 1 <= points <= {MAX_LADDER_POINTS} and -1 < low <= high"}
+            compute = lambda: self._captured(
+                lambda: analysis.calculate_valuation_ladder(points, low, high).reset_index().to_dict('records')
+            )
+        elif endpoint == 'section' and len(parts) == 4 and parts[3] in SERVABLE_SECTIONS:
+            executor = SectionExecutor(analysis, print_header=print_section_header,
+                                       print_subheader=print_subsection_header)
+            compute = lambda: self._captured(lambda: executor.run([parts[3]])[parts[3]])
+        else:
+            return 404, {'error': f"Unknown endpoint: {path}"}
+
+        key = (ticker, '/'.join(parts[2:]), tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        return 200, await self._coalesced(key, compute, loaded_at)
+
+    async def _serve_client(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # Headers are not needed
+
+            if len(request_line) < 2 or request_line[0] != 'GET':
+                status, body = 405, {'error': 'Only GET is supported'}
+            else:
+                url = urlsplit(request_line[1])
+                try:
+                    status, body = await self.handle(url.path, parse_qs(url.query))
+                except Exception as e:
+                    status, body = 500, {'error': str(e)}
+
+            payload = json.dumps(body).encode()
+            reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                      500: 'Internal Server Error'}[status]
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        # Route prints from worker threads into per-request buffers; the DCF
+        # prompt is never shown because interactive sections are not served
+        self._stdout = sys.stdout if isinstance(sys.stdout, ThreadLocalStdout) else ThreadLocalStdout(sys.stdout)
+        sys.stdout = self._stdout
+        StockAnalysis._dcf_has_run = True
+
+        server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        print(f"Stock analysis service listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve StockAnalysis results over local HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ttl', type=int, default=900, help="Seconds to keep computed results")
+    parser.add_argument('--max-results', type=int, default=1024, help="Most computed results to keep")
+    parser.add_argument('--max-tickers', type=int, default=256, help="Most tickers to keep loaded")
+    parser.add_argument('--cache-dir', default=None, help="Directory for the derived-results cache")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Provider requests per second shared with background refreshes (default: unlimited)")
+    args = parser.parse_args()
+
+    if args.rate:
+        # Requests made by the service are interactive and go ahead of any queued refresh work
+        install_scheduler(FetchScheduler(rate=args.rate))
+
+    cache = ResultsCache(args.cache_dir) if args.cache_dir else None
+    asyncio.run(AnalysisService(args.host, args.port, args.ttl, results_cache=cache,
+                                max_results=args.max_results, max_tickers=args.max_tickers).serve_forever())
@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+
+from fundamentals import field, statement_panel
+from metrics import EQUITY_FIELDS, GROWTH_BANDS, classify_growth_array
+from risk_analytics import max_drawdown_array
+
+# Growth metrics of the growth summary and the growth_rates method each one uses
+GROWTH_METRICS = {
+    'ROIC': 'difference',
+    'Equity': 'relative',
+    'Earnings': 'relative',
+    'Sales': 'relative',
+    'Free Cash Flow': 'relative',
+}
+
+# Statement datasets the backtest reads (StockAnalysis.fetch names)
+BACKTEST_DATASETS = ['financials', 'balance_sheet', 'balance_sheet_pretty', 'income_stmt', 'cashflow']
+
+
+def statements_from_analyses(analyses):
+    # dataset -> {ticker: statement} for a list of StockAnalysis objects
+    return {dataset: {a.ticker_symbol: a.fetch(dataset) for a in analyses} for dataset in BACKTEST_DATASETS}
+
+
+def report_metrics(statements):
+    """
+    Computes the per-report inputs of the growth and yield screens for a whole universe.
+
+    Uses the same definitions as metrics.py (ROIC, equity, EPS, sales and
+    free cash flow), but as column arithmetic on fundamentals panels so every
+    ticker and fiscal year is computed at once.
+
+    Args:
+        statements (dict): Dataset name -> {ticker: statement DataFrame}, for
+            the datasets in BACKTEST_DATASETS
+
+    Returns:
+        pd.DataFrame: Indexed by (Ticker, Date), oldest report first, with one
+        column per growth metric (the 'Earnings' column is EPS)
+    """
+    panels = {dataset: statement_panel(statements.get(dataset, {})) for dataset in BACKTEST_DATASETS}
+    index = panels['financials'].index
+    for panel in panels.values():
+        index = index.union(panel.index)
+    panels = {dataset: panel.reindex(index) for dataset, panel in panels.items()}
+    fin, bs, bsp = panels['financials'], panels['balance_sheet'], panels['balance_sheet_pretty']
+
+    nopat = field(fin, 'OperatingIncome') * (1 - field(fin, 'TaxRateForCalcs'))
+    invested_capital = (field(bs, 'TotalAssets') - field(bs, 'CurrentLiabilities')
+                        - field(bs, 'CashAndCashEquivalents'))
+    shares = field(fin, 'DilutedAverageShares')
+    equity_columns = [name for name in EQUITY_FIELDS if name in bsp.columns]
+    equity = (bsp[equity_columns].astype(float).bfill(axis=1).iloc[:, 0] if equity_columns
+              else pd.Series(np.nan, index=index))
+    cash_flow = panels['cashflow']
+
+    reports = pd.DataFrame({
+        'ROIC': nopat / invested_capital.where(invested_capital != 0) * 100,
+        'Equity': equity,
+        'Earnings': field(fin, 'NetIncome') / shares.where(shares != 0),
+        'Sales': field(panels['income_stmt'], 'TotalRevenue'),
+        'Free Cash Flow': field(cash_flow, 'Operating Cash Flow') - field(cash_flow, 'Capital Expenditure').abs(),
+    }, index=index)
+    return reports.sort_index()
+
+
+def rolling_average_growth(reports, lookback=4):
+    """
+    Average year-over-year growth of each metric over the last `lookback` reports.
+
+    Each ticker's growth series uses the growth_rates definitions and the
+    windowed mean is taken with per-ticker cumulative sums, so there is no
+    loop over tickers. With lookback=4 a report carries the same average the
+    live growth summary shows for the four annual statements yfinance returns.
+
+    Args:
+        reports (pd.DataFrame): Output of report_metrics
+        lookback (int): Number of reports in each window (growth values = lookback - 1)
+
+    Returns:
+        pd.DataFrame: Average growth (%) per metric, same index as reports
+    """
+    tickers = reports.index.get_level_values(0)
+    averages = {}
+    for metric, method in GROWTH_METRICS.items():
+        values = reports[metric]
+        previous = values.groupby(tickers).shift(1)
+        if method == 'difference':
+            growth = values - previous
+        else:
+            growth = (values - previous) / previous.abs().where(previous != 0) * 100
+
+        valid = growth.notna()
+        sums = growth.fillna(0.0).groupby(tickers).cumsum()
+        counts = valid.astype(float).groupby(tickers).cumsum()
+        window = lookback - 1
+        sums = sums - sums.groupby(tickers).shift(window).fillna(0.0)
+        counts = counts - counts.groupby(tickers).shift(window).fillna(0.0)
+        averages[metric] = sums / counts.where(counts > 0)
+    return pd.DataFrame(averages, index=reports.index)
+
+
+def rebalance_dates(index, frequency='M'):
+    # Last trading day of each period (month 'M', quarter 'Q', year 'Y') in a price index
+    index = pd.DatetimeIndex(index).sort_values()
+    return pd.DatetimeIndex(index.to_series().groupby(index.to_period(frequency)).max().to_numpy())
+
+
+def _as_of(frame, dates):
+    # Last row of frame on or before each date (frame indexed by date, sorted)
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    return frame.reindex(frame.index.union(dates)).ffill().reindex(dates)
+
+
+def point_in_time(reports, dates, tickers, filing_lag=90, max_report_age=550):
+    """
+    Picks, for every (date, ticker), the latest report that was public at that date.
+
+    A report dated D is treated as available from D + filing_lag days, and
+    reports older than max_report_age days are ignored, so no signal uses
+    figures that had not been filed yet or that a delisted/non-filing company
+    stopped updating long ago.
+
+    Args:
+        reports (pd.DataFrame): Indexed by (Ticker, Date), oldest first
+        dates (pd.DatetimeIndex): Rebalance dates
+        tickers (list): Output columns
+        filing_lag (int): Days between fiscal period end and public availability
+        max_report_age (int): Days after which a report is considered stale
+
+    Returns:
+        np.ndarray: Integer row positions into reports, shaped (dates, tickers), -1 where none
+    """
+    report_tickers = reports.index.get_level_values(0)
+    report_dates = pd.DatetimeIndex(reports.index.get_level_values(1))
+    available = pd.DataFrame({
+        'ticker': report_tickers,
+        'available': report_dates + pd.Timedelta(days=filing_lag),
+        'row': np.arange(len(reports), dtype=float),
+    }).pivot_table(index='available', columns='ticker', values='row', aggfunc='max')
+
+    rows = _as_of(available, dates).reindex(columns=tickers).to_numpy(dtype=float)
+    positions = np.where(np.isnan(rows), -1, rows).astype(np.int64)
+
+    if len(reports):
+        age = dates.to_numpy()[:, None] - report_dates.to_numpy()[np.maximum(positions, 0)]
+        positions[age > np.timedelta64(max_report_age, 'D')] = -1
+    return positions
+
+
+def _gather(values, positions):
+    # values[positions] with NaN where no report is available
+    gathered = np.asarray(values, dtype=np.float64)[np.maximum(positions, 0)]
+    gathered[positions < 0] = np.nan
+    return gathered
+
+
+def _last_observed(prices, dates):
+    # Date of each column's last actual (non-NaN) price on or before each date
+    stamps = np.where(prices.notna().to_numpy(), prices.index.to_numpy()[:, None], np.datetime64('NaT'))
+    return _as_of(pd.DataFrame(stamps, index=prices.index, columns=prices.columns), dates).to_numpy()
+
+
+def _trailing_sum(events, dates, days=365):
+    # Sum of event amounts (e.g. dividends) in the `days` before each date, per column
+    cumulative = events.fillna(0.0).sort_index().cumsum()
+    now = _as_of(cumulative, dates).to_numpy(dtype=float)
+    before = _as_of(cumulative, dates - pd.Timedelta(days=days)).to_numpy(dtype=float)
+    return np.nan_to_num(now) - np.nan_to_num(before)
+
+
+def backtest_screen(prices, statements, bond_yields, dividends=None, frequency='M', lookback=4,
+                    filing_lag=90, max_report_age=550, min_growth=GROWTH_BANDS[2][0], min_spread=0.0,
+                    benchmark='SPY', max_price_age=10, delisting_return=-0.3):
+    """
+    Backtests the growth and margin-of-safety screen with point-in-time data.
+
+    At each rebalance date every ticker gets the signals the dashboard would
+    have shown then: the average growth of ROIC, equity, earnings, sales and
+    free cash flow with their classifications, and the spread of earnings
+    yield plus dividend yield over the 10-year Treasury yield. Tickers whose
+    overall growth exceeds min_growth and whose spread exceeds min_spread are
+    held in equal weight until the next rebalance date.
+
+    Selection only uses data up to the rebalance date: a ticker can be bought
+    if its last actual price is at most max_price_age days old. A holding
+    that is halted or trades sparsely at a rebalance date (but has later
+    prices) is carried at its last traded price until it trades again. A
+    holding with no prices at all after the next rebalance date is booked at
+    its last traded price compounded with delisting_return (the average
+    delisting loss, -30% by default) instead of a forward-filled flat price;
+    with delisting_return=None such holdings are dropped from that period's
+    return. Either way they are counted in the 'Delisted' column.
+
+    Everything is computed on (dates x tickers) arrays; the only loops are
+    over the five growth metrics.
+
+    Args:
+        prices (pd.DataFrame): Daily close prices, dates x tickers (the benchmark may be a column)
+        statements (dict): Dataset name -> {ticker: statement}, see statements_from_analyses
+        bond_yields (pd.Series or float): 10-year Treasury yield (%) history, or a constant
+        dividends (pd.DataFrame): Optional dividend amounts per share on ex-dates, dates x tickers
+        frequency (str): Rebalance frequency ('M', 'Q' or 'Y')
+        lookback (int): Reports averaged for each growth metric
+        filing_lag (int): Days between fiscal period end and filing
+        max_report_age (int): Days after which a report is ignored
+        min_growth (float): Minimum overall average growth (%) to hold a ticker
+        min_spread (float): Minimum total stock yield minus bond yield (%) to hold a ticker
+        benchmark (str): Price column reported alongside the strategy, if present
+        max_price_age (int): Days after its last actual price that a ticker can still be bought
+        delisting_return (float): Return applied on top of the last traded price for
+            held tickers that never trade again (None to drop them instead)
+
+    Returns:
+        dict: 'signals' (dict of dates x tickers DataFrames), 'selected' (bool
+        DataFrame), 'returns' (per-period returns of the strategy, the equal-weight
+        universe and the benchmark, with the holdings and delisted holdings
+        counts) and 'summary' (performance table)
+    """
+    prices = prices.sort_index()
+    dates = rebalance_dates(prices.index, frequency)
+    tickers = [t for t in prices.columns if t != benchmark]
+
+    reports = report_metrics(statements)
+    averages = rolling_average_growth(reports, lookback)
+    positions = point_in_time(reports, dates, tickers, filing_lag, max_report_age)
+
+    def frame(values):
+        return pd.DataFrame(values, index=dates, columns=tickers)
+
+    signals = {f'{metric} Growth': frame(_gather(averages[metric], positions)) for metric in GROWTH_METRICS}
+    stacked = np.stack([s.to_numpy() for s in signals.values()])
+    with np.errstate(invalid='ignore'):
+        valid_counts = np.sum(~np.isnan(stacked), axis=0)
+        overall = np.where(valid_counts > 0, np.nansum(stacked, axis=0) / np.maximum(valid_counts, 1), np.nan)
+    signals['Overall Growth'] = frame(overall)
+    signals['Growth Class'] = frame(classify_growth_array(overall))
+
+    price_values = _as_of(prices[tickers], dates).to_numpy(dtype=float)
+    last_observed = _last_observed(prices[tickers], dates)
+    trading = dates.to_numpy()[:, None] - last_observed <= np.timedelta64(max_price_age, 'D')
+    # Listed until its final price: a halted or sparsely traded ticker with later prices
+    # stays listed, and only one with no prices after a rebalance date has delisted
+    final_price = _last_observed(prices[tickers], prices.index[-1:])
+    listed = trading | (~np.isnat(last_observed) & (final_price >= dates.to_numpy()[:, None]))
+    eps = _gather(reports['Earnings'], positions)
+    if isinstance(bond_yields, pd.Series):
+        bond = _as_of(bond_yields.to_frame(), dates).to_numpy(dtype=float)
+    else:
+        bond = np.full((len(dates), 1), float(bond_yields))
+    dividend_rate = (_trailing_sum(dividends.reindex(columns=tickers), dates) if dividends is not None
+                     else np.zeros_like(price_values))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid_price = np.where(price_values > 0, price_values, np.nan)
+        earnings_yield = eps / valid_price * 100
+        dividend_yield = dividend_rate / valid_price * 100
+        spread = earnings_yield + dividend_yield - bond
+        # Return to the next rebalance date, from the last traded price when the ticker stopped trading
+        forward = np.full_like(price_values, np.nan)
+        forward[:-1] = price_values[1:] / price_values[:-1] - 1
+    forward[~np.isfinite(forward) | ~listed] = np.nan
+    delisted = np.zeros_like(listed)
+    delisted[:-1] = listed[:-1] & ~listed[1:]
+    forward[delisted] = (1 + forward[delisted]) * (1 + delisting_return) - 1 if delisting_return is not None else np.nan
+
+    signals['Earnings Yield'] = frame(earnings_yield)
+    signals['Dividend Yield'] = frame(dividend_yield)
+    signals['Margin of Safety'] = frame(spread)
+
+    with np.errstate(invalid='ignore'):
+        # Decided from data available at the date only; forward returns are used just for scoring
+        selected = (overall > min_growth) & (spread > min_spread) & trading
+    # A listed ticker that is not trading cannot be bought or sold, so it keeps its last decision
+    carried = frame(np.where(listed & ~trading, np.nan, selected)).ffill()
+    selected = carried.fillna(0.0).to_numpy(dtype=bool) & listed
+    held = np.where(selected, forward, np.nan)
+    holdings = selected.sum(axis=1)
+    scored = (~np.isnan(held)).sum(axis=1)
+    strategy = np.where(scored > 0, np.nansum(held, axis=1) / np.maximum(scored, 1), 0.0)
+    priced = (~np.isnan(forward)).sum(axis=1)
+    universe = np.where(priced > 0, np.nansum(forward, axis=1) / np.maximum(priced, 1), np.nan)
+
+    returns = pd.DataFrame({'Strategy': strategy, 'Universe': universe, 'Holdings': holdings,
+                            'Delisted': (selected & delisted).sum(axis=1)}, index=dates)
+    if benchmark in prices.columns:
+        bench = _as_of(prices[[benchmark]], dates)[benchmark].to_numpy(dtype=float)
+        bench_forward = np.full_like(bench, np.nan)
+        bench_forward[:-1] = bench[1:] / bench[:-1] - 1
+        returns[benchmark] = bench_forward
+    returns = returns.iloc[:-1]  # The last date has no forward period
+
+    return {
+        'signals': signals,
+        'selected': frame(selected),
+        'returns': returns,
+        'summary': backtest_summary(returns, periods_per_year={'M': 12, 'Q': 4, 'Y': 1}.get(frequency, 12)),
+    }
+
+
+def backtest_summary(returns, periods_per_year=12):
+    # Annualized return, volatility, max drawdown and hit rate of each return column
+    columns = [c for c in returns.columns if c not in ('Holdings', 'Delisted')]
+    values = returns[columns].to_numpy(dtype=float)
+    growth = np.nancumprod(1 + values, axis=0)
+    # Drawdowns are measured from the starting value, so a loss in the first period counts
+    wealth = np.vstack([np.ones((1, len(columns))), growth])
+    years = len(returns) / periods_per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary = pd.DataFrame({
+            'Annualized Return (%)': (growth[-1] ** (1 / years) - 1) * 100 if len(returns) else np.nan,
+            'Annualized Volatility (%)': np.nanstd(values, axis=0, ddof=1) * np.sqrt(periods_per_year) * 100,
+            'Max Drawdown (%)': max_drawdown_array(wealth) * 100,
+            'Periods Beating Universe (%)': np.nanmean(values > values[:, [columns.index('Universe')]], axis=0) * 100,
+        }, index=columns)
+    summary['Average Holdings'] = returns['Holdings'].mean()
+    summary['Delisted Holdings'] = returns['Delisted'].sum() if 'Delisted' in returns else 0
+    return summary
+
+
+def print_backtest_summary(result):
+    summary = result['summary']
+    returns = result['returns']
+    print("\n")
+    print("╔" + "═" * 78 + "╗")
+    print("║" + " GROWTH AND MARGIN OF SAFETY BACKTEST ".center(78) + "║")
+    print("╠" + "═" * 78 + "╣")
+    if len(returns):
+        period = f" {returns.index[0]:%Y-%m-%d} to {returns.index[-1]:%Y-%m-%d}, {len(returns)} rebalances"
+        print("║" + period.ljust(78) + "║")
+    print("╚" + "═" * 78 + "╝")
+
+    print(f"\n{'Portfolio':<12} | {'Return':>9} | {'Volatility':>10} | {'Max DD':>9} | {'Beat Univ.':>10}")
+    print("-" * 62)
+    for name, row in summary.iterrows():
+        print(f"{name:<12} | {row['Annualized Return (%)']:>8.2f}% | {row['Annualized Volatility (%)']:>9.2f}% | "
+              f"{row['Max Drawdown (%)']:>8.2f}% | {row['Periods Beating Universe (%)']:>9.1f}%")
+    print(f"\nAverage holdings per period: {summary['Average Holdings'].iloc[0]:.1f}")
+    print(f"Holdings that stopped trading while held: {summary['Delisted Holdings'].iloc[0]:.0f}")
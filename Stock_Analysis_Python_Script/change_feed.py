@@ -0,0 +1,313 @@
+import argparse
+import json
+import math
+from dataclasses import dataclass
+
+from fetch_scheduler import REFRESH, fetch_priority
+from metrics import (DCF_DEFAULTS, EQUITY_FIELDS, average_growth, dcf_fair_value, dcf_margin_of_safety,
+                     ebit_by_year, eps_by_year, equity_by_year, fcf_by_year, roic_by_year, sales_by_year)
+from sqlite_store import SQLiteStore, _now, statement_rows
+
+# Pseudo ticker and dataset under which the Treasury yield is stored and diffed
+BOND_TICKER = '^TNX'
+BOND_DATASET = 'bond_yield'
+
+
+@dataclass(frozen=True)
+class Change:
+    ticker: str
+    dataset: str
+    fields: tuple
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    # inputs: dataset -> fields the metric reads; requires: metrics it is computed from
+    inputs: dict
+    compute: object
+    requires: tuple = ()
+
+
+def _yield(numerator, price):
+    # None (stored as NULL, skipped by peer ranks) when either input is missing, not a 0% yield
+    if numerator is None or not price:
+        return None
+    return numerator / price * 100
+
+
+def _dividend_rate(info):
+    # yfinance leaves dividendRate out of info for non-payers, so missing means no dividend
+    return info.get('dividendRate') or 0.0
+
+
+def _growth(series_of, dataset, method='relative'):
+    return lambda data, values: average_growth(series_of(data.statements.get(dataset)), method)
+
+
+def _yield_spread(data, values):
+    info = data.info
+    price = info.get('currentPrice')
+    earnings, dividend = _yield(info.get('trailingEps'), price), _yield(_dividend_rate(info), price)
+    if earnings is None or dividend is None or data.bond_yield is None:
+        return None
+    return earnings + dividend - data.bond_yield
+
+
+def _breakeven_price(data, values):
+    # Price at which forward earnings yield equals the bond yield (display_pe_and_earnings_yield)
+    forward_eps = data.info.get('forwardEps')
+    return forward_eps / (data.bond_yield / 100) if forward_eps and data.bond_yield else None
+
+
+ROIC_INPUTS = {
+    'financials': {'OperatingIncome', 'TaxRateForCalcs'},
+    'balance_sheet': {'TotalAssets', 'CurrentLiabilities', 'CashAndCashEquivalents'},
+}
+DCF_INPUTS = {'cashflow': {'Free Cash Flow'}, 'info': {'sharesOutstanding'}}
+
+# Every stored metric with the exact fields it depends on, in computation order
+METRICS = {
+    'roic': MetricSpec(ROIC_INPUTS, lambda data, values: {
+        int(year): float(value)
+        for year, value in roic_by_year(data.statements.get('financials'), data.statements.get('balance_sheet')).items()
+    }),
+    'avg_roic_growth': MetricSpec(ROIC_INPUTS, lambda data, values: average_growth(
+        roic_by_year(data.statements.get('financials'), data.statements.get('balance_sheet')), 'difference')),
+    'avg_equity_growth': MetricSpec({'balance_sheet_pretty': set(EQUITY_FIELDS)},
+                                    _growth(equity_by_year, 'balance_sheet_pretty')),
+    'avg_earnings_growth': MetricSpec({'financials': {'NetIncome', 'DilutedAverageShares'}},
+                                      _growth(eps_by_year, 'financials')),
+    'avg_sales_growth': MetricSpec({'income_stmt': {'TotalRevenue'}}, _growth(sales_by_year, 'income_stmt')),
+    'avg_fcf_growth': MetricSpec({'cashflow': {'Operating Cash Flow', 'Capital Expenditure'}},
+                                 _growth(fcf_by_year, 'cashflow')),
+    'avg_ebit_growth': MetricSpec({'financials': {'EBIT'}}, _growth(ebit_by_year, 'financials', 'ratio')),
+    'dcf_fair_value': MetricSpec(DCF_INPUTS, lambda data, values: dcf_fair_value(
+        data.statements.get('cashflow'), data.info.get('sharesOutstanding'), **DCF_DEFAULTS)),
+    'dcf_margin_of_safety': MetricSpec({'info': {'currentPrice'}}, lambda data, values: dcf_margin_of_safety(
+        values.get('dcf_fair_value'), data.info.get('currentPrice')), requires=('dcf_fair_value',)),
+    'earnings_yield': MetricSpec({'info': {'currentPrice', 'trailingEps'}}, lambda data, values: _yield(
+        data.info.get('trailingEps'), data.info.get('currentPrice'))),
+    'dividend_yield': MetricSpec({'info': {'currentPrice', 'dividendRate'}}, lambda data, values: _yield(
+        _dividend_rate(data.info), data.info.get('currentPrice'))),
+    'yield_spread': MetricSpec({'info': {'currentPrice', 'trailingEps', 'dividendRate'}, BOND_DATASET: {'value'}},
+                               _yield_spread),
+    'breakeven_price': MetricSpec({'info': {'forwardEps'}, BOND_DATASET: {'value'}}, _breakeven_price),
+}
+
+# Statement datasets pulled and diffed by the feed (the ones some metric reads)
+FEED_DATASETS = sorted({dataset for spec in METRICS.values() for dataset in spec.inputs} - {'info', BOND_DATASET})
+
+
+@dataclass
+class _Inputs:
+    statements: dict
+    info: dict
+    bond_yield: float
+
+
+def _same(old, new, rel_tol=1e-9):
+    if old is None or new is None:
+        return old is None and new is None
+    if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+        return math.isclose(old, new, rel_tol=rel_tol) or (math.isnan(old) and math.isnan(new))
+    return old == new
+
+
+def statement_changes(stored_cells, fresh_cells):
+    """
+    Fields whose values differ between a stored and a freshly pulled statement.
+
+    Args:
+        stored_cells (dict): (field, period) -> value from SQLiteStore.statement_cells
+        fresh_cells (dict): (field, period) -> value of the fresh pull
+
+    Returns:
+        list: Sorted changed fields, including fields or periods added or removed
+    """
+    changed = {field for (field, period) in stored_cells.keys() ^ fresh_cells.keys()}
+    changed.update(field for (field, period), value in fresh_cells.items()
+                   if (field, period) in stored_cells and not _same(stored_cells[(field, period)], value))
+    return sorted(changed)
+
+
+def info_changes(stored_info, fresh_info):
+    # Keys whose values differ (fresh info is JSON round-tripped so it compares like the stored copy)
+    fresh_info = json.loads(json.dumps(fresh_info, default=str))
+    stored_info = stored_info or {}
+    return sorted(key for key in stored_info.keys() | fresh_info.keys()
+                  if not _same(stored_info.get(key), fresh_info.get(key)))
+
+
+def affected_metrics(changes):
+    """
+    Metrics to recompute for one ticker's changes.
+
+    A metric is affected when one of the fields it reads changed, or when a
+    metric it is computed from is affected (e.g. the DCF margin of safety
+    after a new cash flow statement).
+
+    Args:
+        changes (list): Change records of one ticker (the bond yield change may be included)
+
+    Returns:
+        list: Metric names in computation order
+    """
+    changed = {}
+    for change in changes:
+        changed.setdefault(change.dataset, set()).update(change.fields)
+
+    affected = []
+    for name, spec in METRICS.items():
+        if (any(changed.get(dataset, set()) & fields for dataset, fields in spec.inputs.items())
+                or any(required in affected for required in spec.requires)):
+            affected.append(name)
+    return affected
+
+
+def compute_metrics(names, statements, info, bond_yield=None, stored=None):
+    """
+    Computes only the named metrics.
+
+    Args:
+        names (list): Metric names (see METRICS), in computation order
+        statements (dict): Dataset -> statement DataFrame
+        info (dict): Ticker info
+        bond_yield (float): 10-year Treasury yield (%)
+        stored (dict): Previously stored metrics, used for required metrics not being recomputed
+
+    Returns:
+        dict: Metric name -> value
+    """
+    data = _Inputs(statements, info or {}, bond_yield)
+    values = dict(stored or {})
+    results = {}
+    for name in names:
+        results[name] = values[name] = METRICS[name].compute(data, values)
+    return results
+
+
+class ChangeFeed:
+    """
+    Incremental refresh of the SQLite store.
+
+    Each fresh pull is diffed field by field against the stored statements,
+    info snapshot and Treasury yield. The differences are emitted as a feed
+    of Change(ticker, dataset, fields) records, only the changed cells and
+    snapshots are written back, and only the metrics that read a changed
+    field are recomputed. A ticker whose price moved but whose filings did
+    not gets its yield and margin-of-safety metrics refreshed and nothing else.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def bond_yield_change(self, bond_yield):
+        # Change record for the Treasury yield (or None), storing the new value
+        stored = self.store.metrics(BOND_TICKER).get('bond_yield')
+        if bond_yield is None or _same(stored, float(bond_yield)):
+            return None
+        self.store.upsert_metrics(BOND_TICKER, {'bond_yield': bond_yield})
+        return Change(BOND_TICKER, BOND_DATASET, ('value',))
+
+    def refresh(self, analysis, bond_change=None, bond_yield=None):
+        """
+        Diffs one ticker's fresh datasets against the store and recomputes what changed.
+
+        Args:
+            analysis (StockAnalysis): Source of the fresh datasets
+            bond_change (Change): Treasury yield change of this run, if any
+            bond_yield (float): Current 10-year Treasury yield (%)
+
+        Returns:
+            tuple: (list of Change records for the ticker, dict of recomputed metrics)
+        """
+        ticker = analysis.ticker_symbol
+        info = analysis.fetch('info')
+        statements = {dataset: analysis.fetch(dataset) for dataset in FEED_DATASETS}
+        stored_info = self.store.info(ticker)
+
+        changes, rows, updated_at = [], [], _now()
+        fields = info_changes(stored_info, info)
+        if fields:
+            changes.append(Change(ticker, 'info', tuple(fields)))
+            self.store.upsert_info(ticker, info)
+        for dataset, statement in statements.items():
+            fresh_cells = {(field, period): value for _, _, field, period, value, _
+                           in statement_rows(ticker, dataset, statement, updated_at)}
+            stored_cells = self.store.statement_cells(ticker, dataset)
+            fields = statement_changes(stored_cells, fresh_cells)
+            if fields:
+                changes.append(Change(ticker, dataset, tuple(fields)))
+                # Only changed cells are written; cells missing from the fresh pull are cleared
+                rows.extend((ticker, dataset, field, period, fresh_cells.get((field, period)), updated_at)
+                            for field, period in stored_cells.keys() | fresh_cells.keys()
+                            if not _same(stored_cells.get((field, period)), fresh_cells.get((field, period))))
+        self.store.upsert_statement_rows(rows)
+
+        # A ticker seen for the first time gets every metric
+        names = list(METRICS) if stored_info is None else affected_metrics(
+            changes + ([bond_change] if bond_change else []))
+        recomputed = compute_metrics(names, statements, info, bond_yield, self.store.metrics(ticker))
+        if recomputed:
+            self.store.upsert_metrics(ticker, recomputed)
+        return changes, recomputed
+
+    def run(self, analyses, bond_yield=None, priority=REFRESH):
+        """
+        Runs the change detection for many tickers.
+
+        Args:
+            analyses (list): Freshly constructed StockAnalysis objects
+            bond_yield (float): Current Treasury yield (default: fetched by the first analysis)
+            priority (int): Fetch scheduler priority for the pulls
+
+        Returns:
+            tuple: (change feed list, dict of ticker -> recomputed metrics)
+        """
+        feed, recomputed = [], {}
+        with fetch_priority(priority):
+            if bond_yield is None and analyses:
+                bond_yield = analyses[0].get_bond_yield()
+            bond_change = self.bond_yield_change(bond_yield)
+            if bond_change:
+                feed.append(bond_change)
+            for analysis in analyses:
+                changes, metrics = self.refresh(analysis, bond_change, bond_yield)
+                feed.extend(changes)
+                if metrics:
+                    recomputed[analysis.ticker_symbol] = metrics
+        return feed, recomputed
+
+
+def print_change_feed(feed, recomputed, max_fields=6):
+    print("\n")
+    print("╔" + "═" * 78 + "╗")
+    print("║" + " CHANGE FEED ".center(78) + "║")
+    print("╠" + "═" * 78 + "╣")
+    print("║" + f" Changes: {len(feed)}   Tickers recomputed: {len(recomputed)}".ljust(78) + "║")
+    print("╚" + "═" * 78 + "╝")
+
+    print(f"\n{'Ticker':<8} | {'Dataset':<20} | Fields changed")
+    print("-" * 80)
+    for change in feed:
+        fields = ', '.join(change.fields[:max_fields])
+        if len(change.fields) > max_fields:
+            fields += f" (+{len(change.fields) - max_fields} more)"
+        print(f"{change.ticker:<8} | {change.dataset:<20} | {fields}")
+
+    print("\n=== Recomputed Metrics ===")
+    for ticker, metrics in recomputed.items():
+        print(f"{ticker:<8} | {', '.join(metrics)}")
+
+
+if __name__ == "__main__":
+    from StockAnalysis import StockAnalysis
+
+    parser = argparse.ArgumentParser(description="Diff fresh pulls against the store and recompute changed metrics")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--db', default='fundamentals.db')
+    args = parser.parse_args()
+
+    with SQLiteStore(args.db) as store:
+        analyses = [StockAnalysis(ticker.upper()) for ticker in args.tickers]
+        print_change_feed(*ChangeFeed(store).run(analyses))
@@ -0,0 +1,133 @@
+import threading
+
+from fetch_scheduler import current_priority
+
+
+class _Call:
+    # One in-flight request and the outcome every waiter receives
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait for it and receive the same result
+    or exception. Nothing is cached once the call finishes, so the next
+    request after completion goes to the provider again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """
+        Runs function once for all concurrent callers with the same key.
+
+        Args:
+            key: Hashable request identity
+            function (callable): Called with no arguments by the leader
+
+        Returns:
+            tuple: (result, shared) where shared is True for callers that waited
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if leader:
+            try:
+                call.result = function()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+# Process-wide instance used by StockAnalysis and the price download helpers
+single_flight = SingleFlight()
+
+# Optional FetchScheduler every provider request is queued through (see install_scheduler)
+scheduler = None
+
+
+def install_scheduler(fetch_scheduler):
+    """
+    Routes every shared_fetch provider request through a FetchScheduler.
+
+    Args:
+        fetch_scheduler (FetchScheduler): Scheduler to use, or None to call providers directly
+
+    Returns:
+        FetchScheduler: The previously installed scheduler
+    """
+    global scheduler
+    previous, scheduler = scheduler, fetch_scheduler
+    return previous
+
+
+def charge_provider_request():
+    # Counts an extra provider request of the running job (a retry or fallback) against the rate budget
+    active = scheduler
+    if active is not None:
+        active.charge()
+
+
+def request_key(symbol, endpoint, **params):
+    # Identity of a provider request: (symbol, endpoint, sorted parameters)
+    symbol = tuple(symbol) if isinstance(symbol, (list, tuple)) else symbol
+    return symbol, endpoint, tuple(sorted((k, str(v)) for k, v in params.items()))
+
+
+def shared_fetch(symbol, endpoint, loader, priority=None, **params):
+    """
+    Runs loader through the process-wide single-flight layer.
+
+    When a FetchScheduler is installed the leader's request is queued at the
+    caller's priority; a more urgent caller joining an in-flight request
+    promotes it in the queue rather than waiting behind lower-priority work.
+
+    Args:
+        symbol (str or list): Symbol(s) the request is for
+        endpoint (str): Dataset or endpoint name
+        loader (callable): Performs the actual provider request
+        priority (int): Scheduler priority class (default: the caller's fetch_priority)
+        **params: Request parameters that distinguish otherwise identical requests
+
+    Returns:
+        The loader's result (shared with any concurrent identical request)
+    """
+    return shared_request(request_key(symbol, endpoint, **params), loader, priority)
+
+
+def shared_request(key, loader, priority=None):
+    # shared_fetch for a request already identified by request_key
+    active = scheduler
+    if active is not None:
+        priority = current_priority() if priority is None else priority
+        active.promote(key, priority)
+        run = lambda: active.run(loader, priority, key)
+    else:
+        run = loader
+    result, _ = single_flight.do(key, run)
+    return result
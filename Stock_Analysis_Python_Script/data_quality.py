@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from metrics import EQUITY_FIELDS
+
+# Statement fields each analysis needs, by dataset. A tuple lists alternative
+# row names; the first one the statement has is used. The first dataset's
+# report dates are the dates the analysis is evaluated on.
+REQUIRED_FIELDS = {
+    'roic': {
+        'financials': ['OperatingIncome', 'TaxRateForCalcs'],
+        'balance_sheet': ['TotalAssets', 'CurrentLiabilities', 'CashAndCashEquivalents'],
+    },
+    'equity': {'balance_sheet_pretty': [tuple(EQUITY_FIELDS)]},
+    'earnings': {'financials': ['NetIncome', 'DilutedAverageShares']},
+    'sales': {'income_stmt': ['TotalRevenue']},
+    'fcf': {'cashflow': ['Operating Cash Flow', 'Capital Expenditure']},
+}
+
+
+def _resolve(statement, field):
+    # Row name used for a field: the first alternative present (or the first listed)
+    if not isinstance(field, tuple):
+        return field
+    if statement is not None:
+        for name in field:
+            if name in statement.index:
+                return name
+    return field[0]
+
+
+def field_values(statement, fields, dates=None):
+    """
+    Numeric values of the given statement rows in one vectorized pass.
+
+    Missing rows, missing dates and non-numeric cells all become NaN, so
+    availability is simply values.notna().
+
+    Args:
+        statement (pd.DataFrame): Statement as returned by yfinance (fields x dates)
+        fields (list): Row names to extract
+        dates (pd.Index): Report dates to align to (default: the statement's own)
+
+    Returns:
+        pd.DataFrame: Float values shaped (fields, dates)
+    """
+    if statement is None or statement.empty:
+        return pd.DataFrame(np.nan, index=fields, columns=dates if dates is not None else [])
+    frame = statement.reindex(index=fields, columns=dates if dates is not None else statement.columns)
+    return frame.apply(pd.to_numeric, errors='coerce').astype(np.float64)
+
+
+@dataclass
+class InputCheck:
+    """
+    Availability of an analysis's required fields across its report dates.
+
+    values holds every required field (rows) for every report date
+    (columns); usable marks the dates where all of them are present, so
+    metrics are computed on values.loc[:, usable] without per-cell checks.
+    """
+    analysis: str
+    values: pd.DataFrame
+    usable: pd.Series
+
+    @property
+    def usable_dates(self):
+        return self.usable.index[self.usable.to_numpy()]
+
+    def missing(self):
+        # Field -> years it is missing for (only fields missing somewhere)
+        available = self.values.notna()
+        return {field: [date.year for date in available.columns[~row]]
+                for field, row in zip(available.index, available.to_numpy()) if not row.all()}
+
+    def summary(self):
+        # One line for the report, e.g. "3 of 4 years usable; missing TaxRateForCalcs (2020)"
+        line = f"Data quality: {int(self.usable.sum())} of {len(self.usable)} years usable"
+        missing = self.missing()
+        if missing:
+            line += "; missing " + ", ".join(
+                f"{field} ({', '.join(str(year) for year in years)})" for field, years in missing.items())
+        return line
+
+
+def check_inputs(statements, analysis):
+    """
+    Builds the values and availability mask of one analysis's required fields.
+
+    Args:
+        statements (dict): Dataset -> statement DataFrame (at least the datasets
+            REQUIRED_FIELDS lists for the analysis)
+        analysis (str): Key of REQUIRED_FIELDS
+
+    Returns:
+        InputCheck: Values, usable-date mask and missing-field details
+    """
+    requirements = REQUIRED_FIELDS[analysis]
+    first = statements.get(next(iter(requirements)))
+    dates = first.columns if first is not None and not first.empty else pd.Index([])
+
+    frames = []
+    for dataset, fields in requirements.items():
+        statement = statements.get(dataset)
+        names = [_resolve(statement, field) for field in fields]
+        frames.append(field_values(statement, names, dates))
+    values = pd.concat(frames) if frames else pd.DataFrame(columns=dates)
+    usable = pd.Series(values.notna().all(axis=0).to_numpy(), index=dates)
+    return InputCheck(analysis, values, usable)
+
+
+def data_quality_report(statements):
+    """
+    Per-analysis data-quality summary for one ticker.
+
+    Args:
+        statements (dict): Dataset -> statement DataFrame (see StockAnalysis.get_statements)
+
+    Returns:
+        pd.DataFrame: One row per analysis with years reported, years usable,
+        usable fraction and the missing fields
+    """
+    rows = {}
+    for analysis in REQUIRED_FIELDS:
+        check = check_inputs(statements, analysis)
+        missing = check.missing()
+        rows[analysis] = {
+            'Years': len(check.usable),
+            'Usable': int(check.usable.sum()),
+            'Coverage (%)': check.usable.mean() * 100 if len(check.usable) else 0.0,
+            'Missing Fields': ', '.join(missing) if missing else '',
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def universe_data_quality(statements_by_ticker):
+    # Ticker x analysis usable-year coverage (%) for many tickers at once
+    return pd.DataFrame({
+        ticker: data_quality_report(statements)['Coverage (%)']
+        for ticker, statements in statements_by_ticker.items()
+    }).T
+
+
+def print_data_quality(ticker, report):
+    print("\n")
+    print("╔" + "═" * 70 + "╗")
+    print("║" + f" DATA QUALITY: {ticker} ".center(70) + "║")
+    print("╚" + "═" * 70 + "╝")
+    print(f"\n{'Analysis':<10} | {'Usable':>8} | {'Coverage':>8} | Missing Fields")
+    print("-" * 70)
+    for analysis, row in report.iterrows():
+        print(f"{analysis:<10} | {row['Usable']:>3} of {row['Years']:<2} | {row['Coverage (%)']:>7.0f}% | "
+              f"{row['Missing Fields'] or '-'}")
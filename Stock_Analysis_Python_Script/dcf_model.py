@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+# Projection years that use the initial growth rate before switching to terminal growth
+HIGH_GROWTH_YEARS = 5
+
+
+def starting_free_cash_flow(cash_flow, periods=5):
+    """
+    Returns the starting FCF used by calculate_dcf: the mean of the most recent reported years.
+
+    Args:
+        cash_flow (pd.DataFrame): yfinance cash flow statement (fields x dates)
+        periods (int): Number of most recent years to average
+
+    Returns:
+        float: Average free cash flow, or None if no valid values exist
+    """
+    if cash_flow is None or cash_flow.empty or 'Free Cash Flow' not in cash_flow.index:
+        return None
+    recent_fcfs = cash_flow.loc['Free Cash Flow'].head(periods).dropna()
+    if recent_fcfs.empty:
+        return None
+    return float(recent_fcfs.mean())
+
+
+def dcf_present_value(fcf, growth_rate, discount_rate, terminal_growth, years=10):
+    """
+    Vectorized form of the calculate_dcf projection.
+
+    Cash flows grow at growth_rate for the first five years and terminal_growth
+    afterwards, and each year's cash flow is discounted back at discount_rate.
+    All arguments broadcast against each other, so one call values a whole
+    universe (or a grid of candidate rates).
+
+    Args:
+        fcf (array-like): Starting free cash flow
+        growth_rate (array-like): Growth rate for years 1-5 (decimal)
+        discount_rate (array-like): Discount rate (decimal)
+        terminal_growth (array-like): Growth rate for years 6+ (decimal)
+        years (int): Projection length
+
+    Returns:
+        np.ndarray: Sum of present values of the projected cash flows
+    """
+    fcf, growth_rate, discount_rate, terminal_growth = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (fcf, growth_rate, discount_rate, terminal_growth))
+    )
+    cash_flow = fcf.copy()
+    total = np.zeros_like(cash_flow)
+    for year_offset in range(1, years + 1):
+        rate = growth_rate if year_offset <= HIGH_GROWTH_YEARS else terminal_growth
+        cash_flow = cash_flow * (1 + rate)
+        total += cash_flow / (1 + discount_rate) ** year_offset
+    return total
+
+
+def _bisect(objective, low, high, shape, tol, max_iter):
+    # Vectorized bisection: every element keeps its own bracket and stops moving once solved
+    lo = np.full(shape, low, dtype=np.float64)
+    hi = np.full(shape, high, dtype=np.float64)
+    f_lo = objective(lo)
+    f_hi = objective(hi)
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi))
+
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        f_mid = objective(mid)
+        same_side = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(same_side, mid, lo)
+        f_lo = np.where(same_side, f_mid, f_lo)
+        hi = np.where(same_side, hi, mid)
+        if np.all(hi - lo < tol):
+            break
+
+    return np.where(bracketed, (lo + hi) / 2, np.nan)
+
+
+def implied_growth_rates(fcf, market_value, discount_rate=0.12, terminal_growth=0.02, years=10,
+                         low=-0.5, high=1.0, tol=1e-7, max_iter=100):
+    """
+    Solves for the years 1-5 growth rate at which the DCF value equals the market value.
+
+    Args:
+        fcf (array-like): Starting free cash flow per ticker
+        market_value (array-like): Current price x shares outstanding per ticker
+        discount_rate (array-like): Discount rate (decimal)
+        terminal_growth (array-like): Growth rate for years 6+ (decimal)
+        years (int): Projection length
+        low (float): Lower end of the growth-rate bracket
+        high (float): Upper end of the growth-rate bracket
+        tol (float): Bracket width at which the solve stops
+        max_iter (int): Maximum bisection steps
+
+    Returns:
+        np.ndarray: Implied growth rate per ticker (NaN when FCF is not positive or
+        no rate inside the bracket reproduces the market value)
+    """
+    fcf, market_value = np.broadcast_arrays(np.asarray(fcf, dtype=np.float64),
+                                            np.asarray(market_value, dtype=np.float64))
+    positive = fcf > 0
+
+    def objective(growth):
+        return dcf_present_value(fcf, growth, discount_rate, terminal_growth, years) - market_value
+
+    rates = _bisect(objective, low, high, fcf.shape, tol, max_iter)
+    return np.where(positive, rates, np.nan)
+
+
+def implied_discount_rates(fcf, market_value, growth_rate=0.05, terminal_growth=0.02, years=10,
+                           low=-0.05, high=2.0, tol=1e-7, max_iter=100):
+    """
+    Solves for the discount rate at which the DCF value equals the market value.
+
+    Args:
+        fcf (array-like): Starting free cash flow per ticker
+        market_value (array-like): Current price x shares outstanding per ticker
+        growth_rate (array-like): Growth rate for years 1-5 (decimal)
+        terminal_growth (array-like): Growth rate for years 6+ (decimal)
+        years (int): Projection length
+        low (float): Lower end of the discount-rate bracket
+        high (float): Upper end of the discount-rate bracket
+        tol (float): Bracket width at which the solve stops
+        max_iter (int): Maximum bisection steps
+
+    Returns:
+        np.ndarray: Implied discount rate per ticker (NaN when unsolvable)
+    """
+    fcf, market_value = np.broadcast_arrays(np.asarray(fcf, dtype=np.float64),
+                                            np.asarray(market_value, dtype=np.float64))
+    positive = fcf > 0
+
+    def objective(discount):
+        return dcf_present_value(fcf, growth_rate, discount, terminal_growth, years) - market_value
+
+    rates = _bisect(objective, low, high, fcf.shape, tol, max_iter)
+    return np.where(positive, rates, np.nan)
+
+
+def reverse_dcf(inputs, discount_rate=0.12, growth_rate=0.05, terminal_growth=0.02, years=10):
+    """
+    Runs both reverse-DCF solves over a table of per-ticker DCF inputs.
+
+    Args:
+        inputs (pd.DataFrame): Indexed by ticker with 'Free Cash Flow',
+            'Shares Outstanding' and 'Current Price' columns
+        discount_rate (float): Discount rate held fixed when solving for growth
+        growth_rate (float): Growth rate held fixed when solving for discount rate
+        terminal_growth (float): Growth rate for years 6+
+        years (int): Projection length
+
+    Returns:
+        pd.DataFrame: Inputs plus market value, implied growth and implied discount rate
+    """
+    fcf = inputs['Free Cash Flow'].to_numpy(dtype=float)
+    market_value = (inputs['Current Price'] * inputs['Shares Outstanding']).to_numpy(dtype=float)
+
+    result = inputs.copy()
+    result['Market Value'] = market_value
+    result['Implied Growth'] = implied_growth_rates(fcf, market_value, discount_rate, terminal_growth, years)
+    result['Implied Discount Rate'] = implied_discount_rates(fcf, market_value, growth_rate, terminal_growth, years)
+    return result
+
+
+def dcf_inputs_table(analyses):
+    # Collect get_dcf_inputs() from a list of StockAnalysis objects into one table
+    rows = {analysis.ticker_symbol: analysis.get_dcf_inputs() for analysis in analyses}
+    rows = {ticker: row for ticker, row in rows.items() if row is not None}
+    return pd.DataFrame.from_dict(
+        rows, orient='index', columns=['Free Cash Flow', 'Shares Outstanding', 'Current Price']
+    )
@@ -0,0 +1,199 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from price_store import PriceStore
+from risk_analytics import TRADING_DAYS, simple_returns
+
+# SPDR sector ETFs for the yfinance 'sector' names
+SECTOR_ETFS = {
+    'Technology': 'XLK',
+    'Financial Services': 'XLF',
+    'Healthcare': 'XLV',
+    'Consumer Cyclical': 'XLY',
+    'Consumer Defensive': 'XLP',
+    'Energy': 'XLE',
+    'Industrials': 'XLI',
+    'Basic Materials': 'XLB',
+    'Utilities': 'XLU',
+    'Real Estate': 'XLRE',
+    'Communication Services': 'XLC',
+}
+
+
+def _window_sums(values, window):
+    # Trailing-window sums down each column from one cumulative sum (row t covers t-window+1..t)
+    csum = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    sums = np.full(values.shape, np.nan)
+    sums[window - 1:] = csum[window:] - csum[:-window]
+    return sums
+
+
+def rolling_regression_array(returns, factor_returns, window=TRADING_DAYS, min_periods=None):
+    """
+    Rolling single-factor least squares r = alpha + beta * f for every column at once.
+
+    Each window uses only the dates where both the stock and the factor have
+    a return. The six sums the closed-form solution needs (n, Σr, Σf, Σr²,
+    Σf², Σrf) come from one cumulative sum each, so the cost is independent of
+    the window length and there is no loop over tickers or dates.
+
+    Args:
+        returns (np.ndarray): Stock returns shaped (dates, symbols)
+        factor_returns (np.ndarray): Factor returns shaped (dates,) for one shared
+            factor, or (dates, symbols) for a per-symbol factor such as its sector ETF
+        window (int): Window length in periods
+        min_periods (int): Minimum overlapping returns per window (default: window // 2)
+
+    Returns:
+        tuple: (alpha, beta, r_squared) arrays shaped (dates, symbols); alpha is
+        per period, NaN before the first full window or with too few returns
+    """
+    factor = factor_returns[:, None] if factor_returns.ndim == 1 else factor_returns
+    mask = ~np.isnan(returns) & ~np.isnan(factor)
+    r = np.where(mask, returns, 0.0)
+    f = np.where(mask, factor, 0.0)
+
+    n = _window_sums(mask.astype(np.float64), window)
+    sum_r, sum_f = _window_sums(r, window), _window_sums(f, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = _window_sums(r * f, window) - sum_r * sum_f / n
+        var_f = _window_sums(f * f, window) - sum_f * sum_f / n
+        var_r = _window_sums(r * r, window) - sum_r * sum_r / n
+        beta = cov / var_f
+        alpha = (sum_r - beta * sum_f) / n
+        r_squared = np.clip(cov * cov / (var_f * var_r), 0.0, 1.0)
+
+    too_short = ~(n >= (window // 2 if min_periods is None else min_periods))
+    for values in (alpha, beta, r_squared):
+        values[too_short | ~np.isfinite(values)] = np.nan
+    return alpha, beta, r_squared
+
+
+def sector_factor_columns(symbols, sectors, available):
+    """
+    Sector ETF to regress each symbol on.
+
+    Args:
+        symbols (list): Stock symbols
+        sectors (dict or pd.Series): Symbol -> yfinance sector name
+        available (iterable): Symbols present in the price data
+
+    Returns:
+        pd.Series: Symbol -> ETF symbol (NaN when the sector or its ETF is unknown)
+    """
+    etfs = pd.Series(sectors, dtype=object).reindex(symbols).map(SECTOR_ETFS)
+    return etfs.where(etfs.isin(set(available)))
+
+
+def factor_exposures(prices, benchmarks=('SPY', 'VTI'), sectors=None, window=TRADING_DAYS, frequency=None,
+                     min_periods=None, block_size=1000, symbols=None):
+    """
+    Rolling alpha, beta and R² of every symbol against the benchmarks and its sector ETF.
+
+    Symbols are processed in column blocks so memory stays bounded; each
+    block is solved for every date at once by rolling_regression_array.
+
+    Args:
+        prices (pd.DataFrame or PriceStore): Close prices with the benchmark (and sector ETF) columns
+        benchmarks (tuple): Shared factors to regress on
+        sectors (dict or pd.Series): Optional symbol -> sector name for a 'Sector' factor
+        window (int): Rolling window in trading days
+        frequency (str): None for the latest window only, or a pandas frequency
+            (e.g. 'M') to report the windows ending on each period's last trading day
+        min_periods (int): Minimum overlapping returns per window (default: window // 2)
+        block_size (int): Symbols per vectorized block
+        symbols (list): Symbols to regress (default: every non-factor column)
+
+    Returns:
+        pd.DataFrame: Indexed by (date, symbol) with 'Alpha vs X (%)' (annualized),
+        'Beta vs X' and 'R² vs X' columns per factor
+    """
+    if isinstance(prices, PriceStore):
+        columns, dates = prices.symbols, prices.dates
+        column_values = lambda names: np.asarray(prices.values(names), dtype=np.float64)
+    else:
+        prices = prices.sort_index()
+        columns, dates = list(prices.columns), pd.DatetimeIndex(prices.index)
+        column_values = lambda names: prices[names].to_numpy(dtype=float, na_value=np.nan)
+
+    missing = [b for b in benchmarks if b not in columns]
+    if missing:
+        raise ValueError(f"Benchmark columns missing from price matrix: {', '.join(missing)}")
+    etfs = sector_factor_columns(columns, sectors, columns) if sectors is not None else None
+    factor_symbols = set(benchmarks) | (set(etfs.dropna()) if etfs is not None else set())
+    symbols = [s for s in columns if s not in factor_symbols] if symbols is None else list(symbols)
+
+    if frequency is None:
+        rows = np.array([len(dates) - 1])
+    else:
+        periods = dates.to_period(frequency)
+        rows = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+
+    factor_returns = {b: simple_returns(column_values([b]))[:, 0] for b in benchmarks}
+    if etfs is not None:
+        sector_columns = sorted(set(etfs.dropna()))
+        sector_returns = simple_returns(column_values(sector_columns)) if sector_columns else None
+        sector_position = {etf: i for i, etf in enumerate(sector_columns)}
+
+    frames = []
+    for start in range(0, len(symbols), block_size):
+        names = symbols[start:start + block_size]
+        returns = simple_returns(column_values(names))
+        factors = dict(factor_returns)
+        if etfs is not None:
+            # Per-symbol factor matrix: each column is the returns of that symbol's sector ETF
+            positions = etfs.reindex(names).map(sector_position)
+            factor = np.full(returns.shape, np.nan)
+            known = positions.notna().to_numpy()
+            if known.any():
+                factor[:, known] = sector_returns[:, positions[known].astype(int).to_numpy()]
+            factors['Sector'] = factor
+
+        block = {}
+        for label, factor in factors.items():
+            alpha, beta, r_squared = rolling_regression_array(returns, factor, window, min_periods)
+            block[f'Alpha vs {label} (%)'] = alpha[rows].ravel() * TRADING_DAYS * 100
+            block[f'Beta vs {label}'] = beta[rows].ravel()
+            block[f'R² vs {label}'] = r_squared[rows].ravel()
+        index = pd.MultiIndex.from_product([dates[rows], names], names=['date', 'symbol'])
+        frames.append(pd.DataFrame(block, index=index))
+
+    return pd.concat(frames).sort_index() if frames else pd.DataFrame()
+
+
+def print_factor_exposures(exposures, symbols=None):
+    latest = exposures.xs(exposures.index.get_level_values('date').max(), level='date')
+    if symbols is not None:
+        latest = latest.reindex(symbols)
+    factors = [column[len('Beta vs '):] for column in latest.columns if column.startswith('Beta vs ')]
+
+    print("\n")
+    print("╔" + "═" * 78 + "╗")
+    print("║" + " FACTOR EXPOSURES (LATEST WINDOW) ".center(78) + "║")
+    print("╚" + "═" * 78 + "╝")
+    header = f"{'Symbol':<8}"
+    for factor in factors:
+        header += f" | {factor + ' α':>10} {'β':>6} {'R²':>5}"
+    print("\n" + header)
+    print("-" * len(header))
+    for symbol, row in latest.iterrows():
+        line = f"{symbol:<8}"
+        for factor in factors:
+            alpha, beta, r2 = row[f'Alpha vs {factor} (%)'], row[f'Beta vs {factor}'], row[f'R² vs {factor}']
+            line += (f" | {alpha:>9.2f}% {beta:>6.2f} {r2:>5.2f}" if not pd.isna(beta)
+                     else f" | {'N/A':>10} {'':>6} {'':>5}")
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling alpha, beta and R² against benchmark ETFs")
+    parser.add_argument('store', help="PriceStore directory (must include the benchmark columns)")
+    parser.add_argument('symbols', nargs='*', help="Symbols to print (default: all)")
+    parser.add_argument('--window', type=int, default=TRADING_DAYS)
+    parser.add_argument('--benchmarks', nargs='+', default=['SPY', 'VTI'])
+    args = parser.parse_args()
+
+    exposures = factor_exposures(PriceStore(args.store), benchmarks=tuple(args.benchmarks), window=args.window)
+    print_factor_exposures(exposures, args.symbols or None)
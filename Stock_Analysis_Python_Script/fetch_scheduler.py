@@ -0,0 +1,220 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+# Priority classes, most urgent first
+INTERACTIVE = 0  # An analyst waiting on a dashboard, the REPL or the service
+REFRESH = 1      # Scheduled refresh of the tracked universe
+BACKFILL = 2     # Historical backfill, runs only when nothing else is waiting
+
+PRIORITIES = {'interactive': INTERACTIVE, 'refresh': REFRESH, 'backfill': BACKFILL}
+
+_current_priority = contextvars.ContextVar('fetch_priority', default=INTERACTIVE)
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+@contextlib.contextmanager
+def fetch_priority(priority):
+    """
+    Runs the enclosed provider requests at the given priority class.
+
+    Args:
+        priority (int or str): INTERACTIVE, REFRESH or BACKFILL (or their names)
+    """
+    token = _current_priority.set(PRIORITIES.get(priority, priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def with_context(function):
+    """
+    Wraps function to run in a copy of the caller's context.
+
+    Worker threads of a ThreadPoolExecutor do not inherit context
+    variables, so work handed to a pool would otherwise run at the default
+    INTERACTIVE priority whatever fetch_priority the caller is in. Each call
+    gets its own copy, so the wrapper can run in several threads at once.
+
+    Args:
+        function (callable): Function to submit to a pool
+
+    Returns:
+        callable: Same signature as function
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
+
+
+class TokenBucket:
+    # Thread-safe token bucket: `rate` requests per second with bursts up to `burst`
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def refund(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class _Job:
+    def __init__(self, function, priority, key):
+        self.function = function
+        self.priority = priority
+        self.key = key
+        self.future = Future()
+
+
+class FetchScheduler:
+    """
+    Runs provider requests in priority order under one shared rate budget.
+
+    Every request waits in a single priority queue; a worker takes a token
+    from the shared bucket and only then picks the most urgent queued job
+    (a job that makes further provider requests, such as retries, takes a
+    token for each of them through charge()),
+    so an interactive lookup submitted behind thousands of refresh or
+    backfill jobs is the next one sent to the provider. Jobs of equal
+    priority run in submission order.
+
+    Queued jobs can be promoted: when an interactive caller asks for a
+    request that a backfill job has already queued, the job moves up instead
+    of the caller waiting behind the backfill.
+    """
+
+    def __init__(self, rate=2.0, burst=5, workers=4):
+        self.bucket = TokenBucket(rate, burst)
+        self._queue = []
+        self._queued = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f'fetch-{i}', daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, function, priority=None, key=None):
+        """
+        Queues a provider request.
+
+        Args:
+            function (callable): Performs the request, called with no arguments
+            priority (int): Priority class (default: the caller's fetch_priority)
+            key: Optional request identity; a queued job with the same key is
+                reused (and promoted if this priority is more urgent)
+
+        Returns:
+            Future: Resolves to the function's result
+        """
+        priority = current_priority() if priority is None else priority
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("FetchScheduler is shut down")
+            job = self._queued.get(key) if key is not None else None
+            if job is not None:
+                self._promote(job, priority)
+                return job.future
+            job = _Job(function, priority, key)
+            if key is not None:
+                self._queued[key] = job
+            heapq.heappush(self._queue, (priority, next(self._counter), job))
+            self._condition.notify()
+            return job.future
+
+    def run(self, function, priority=None, key=None):
+        # Submit and wait for the result in the calling thread
+        return self.submit(function, priority, key).result()
+
+    def charge(self):
+        # Take a token for an extra provider request made inside a running job (e.g. a retry)
+        self.bucket.acquire()
+
+    def promote(self, key, priority=None):
+        # Raise a queued job's priority (no-op if it is not queued or already as urgent)
+        priority = current_priority() if priority is None else priority
+        with self._condition:
+            job = self._queued.get(key)
+            if job is not None:
+                self._promote(job, priority)
+
+    def _promote(self, job, priority):
+        # The old heap entry is left behind and skipped when popped
+        if priority < job.priority:
+            job.priority = priority
+            heapq.heappush(self._queue, (priority, next(self._counter), job))
+            self._condition.notify()
+
+    def _pop(self):
+        # Most urgent live job, or None if only superseded entries remain
+        while self._queue:
+            priority, _, job = heapq.heappop(self._queue)
+            if priority == job.priority and not job.future.running() and job.future.set_running_or_notify_cancel():
+                if job.key is not None:
+                    self._queued.pop(job.key, None)
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed and not self._queue:
+                    return
+
+            # Take the token first, then the job that is most urgent at that moment
+            self.bucket.acquire()
+            with self._condition:
+                job = self._pop()
+            if job is None:
+                self.bucket.refund()
+                continue
+
+            try:
+                job.future.set_result(job.function())
+            except BaseException as e:
+                job.future.set_exception(e)
+
+    def pending(self):
+        # Number of queued jobs per priority class
+        with self._condition:
+            counts = {}
+            for priority, _, job in self._queue:
+                if priority == job.priority and not job.future.running() and not job.future.done():
+                    counts[priority] = counts.get(priority, 0) + 1
+            return counts
+
+    def shutdown(self, wait=True):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
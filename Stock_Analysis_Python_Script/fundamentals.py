@@ -0,0 +1,42 @@
+import pandas as pd
+
+# StockAnalysis datasets that hold financial statements (fields x dates)
+STATEMENT_DATASETS = ['cashflow', 'financials', 'balance_sheet', 'balance_sheet_pretty',
+                      'income_stmt', 'income_stmt_pretty']
+
+
+def statement_panel(statements):
+    """
+    Stacks per-ticker yfinance statements into one fundamentals panel.
+
+    yfinance returns each statement as fields x dates. The panel turns that
+    into rows indexed by (ticker, date), newest date first within each ticker
+    (the same order yfinance uses), with one column per field, so a metric
+    can be computed for every ticker with column arithmetic and groupby.
+
+    Args:
+        statements (dict): Mapping of ticker -> statement DataFrame (fields x dates)
+
+    Returns:
+        pd.DataFrame: Panel indexed by (ticker, date) with one column per field
+    """
+    frames = {}
+    for ticker, statement in statements.items():
+        if statement is None or statement.empty:
+            continue
+        frame = statement.T
+        frame.index = pd.to_datetime(frame.index)
+        frames[ticker] = frame.sort_index(ascending=False)
+
+    if not frames:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=['Ticker', 'Date']))
+
+    panel = pd.concat(frames, names=['Ticker', 'Date'])
+    return panel.apply(pd.to_numeric, errors='coerce')
+
+
+def field(panel, name):
+    # Column of the panel, or an all-NaN column when no ticker reports the field
+    if name in panel.columns:
+        return panel[name].astype(float)
+    return pd.Series(float('nan'), index=panel.index, name=name)
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from dcf_model import dcf_present_value, starting_free_cash_flow
+
+# Row names tried, in order, for stockholders' equity (same list analyze_equity_growth uses)
+EQUITY_FIELDS = ['Stockholders Equity', 'StockholdersEquity', 'Total Equity Gross Minority Interest', 'Common Stock Equity']
+
+# Default DCF parameters (same defaults as calculate_dcf)
+DCF_DEFAULTS = {'years': 10, 'growth_rate': 0.05, 'discount_rate': 0.12, 'terminal_growth': 0.02}
+
+
+def _row(statement, name):
+    # One statement row as a float Series indexed by fiscal year (NaN row if missing)
+    if statement is None or statement.empty or name not in statement.index:
+        return pd.Series(dtype=float)
+    row = pd.to_numeric(statement.loc[name], errors='coerce')
+    row.index = [date.year for date in pd.to_datetime(row.index)]
+    return row[~row.index.duplicated()].sort_index()
+
+
+def roic_by_year(financials, balance_sheet):
+    """
+    ROIC (%) per year: NOPAT / (Total Assets - Current Liabilities - Cash) x 100.
+
+    Args:
+        financials (pd.DataFrame): stock.get_financials()
+        balance_sheet (pd.DataFrame): stock.get_balance_sheet()
+
+    Returns:
+        pd.Series: ROIC per year, years with missing inputs or zero invested capital dropped
+    """
+    nopat = _row(financials, 'OperatingIncome') * (1 - _row(financials, 'TaxRateForCalcs'))
+    invested_capital = (_row(balance_sheet, 'TotalAssets')
+                        - _row(balance_sheet, 'CurrentLiabilities')
+                        - _row(balance_sheet, 'CashAndCashEquivalents'))
+    roic = nopat / invested_capital.where(invested_capital != 0) * 100
+    return roic.dropna()
+
+
+def equity_by_year(balance_sheet):
+    # Stockholders' equity per year, using the first equity row the statement has
+    for name in EQUITY_FIELDS:
+        if balance_sheet is not None and name in balance_sheet.index:
+            return _row(balance_sheet, name).dropna()
+    return pd.Series(dtype=float)
+
+
+def eps_by_year(financials):
+    # EPS per year: Net Income / Diluted Average Shares
+    shares = _row(financials, 'DilutedAverageShares')
+    return (_row(financials, 'NetIncome') / shares.where(shares != 0)).dropna()
+
+
+def sales_by_year(income_stmt):
+    return _row(income_stmt, 'TotalRevenue').dropna()
+
+
+def fcf_by_year(cash_flow):
+    # FCF per year: Operating Cash Flow - |Capital Expenditure|
+    return (_row(cash_flow, 'Operating Cash Flow') - _row(cash_flow, 'Capital Expenditure').abs()).dropna()
+
+
+def ebit_by_year(financials):
+    return _row(financials, 'EBIT').dropna()
+
+
+def growth_rates(values, method='relative'):
+    """
+    Year-over-year growth of a per-year Series.
+
+    Args:
+        values (pd.Series): Values indexed by year
+        method (str): 'relative' for (curr - prev) / |prev| x 100, 'difference'
+            for curr - prev (used for ROIC), 'ratio' for (curr / prev - 1) x 100 (used for EBIT)
+
+    Returns:
+        pd.Series: Growth per year, undefined periods (previous value of zero or
+        missing, e.g. after a gap year) dropped
+    """
+    values = values.sort_index()
+    if len(values):
+        # One row per fiscal year, so a missing year is a NaN step rather than bridged
+        values = values.reindex(range(int(values.index[0]), int(values.index[-1]) + 1))
+    previous = values.shift(1)
+    if method == 'difference':
+        growth = values - previous
+    elif method == 'ratio':
+        growth = (values / previous.where(previous != 0) - 1) * 100
+    else:
+        growth = (values - previous) / previous.abs().where(previous != 0) * 100
+    return growth.iloc[1:].dropna()
+
+
+def average_growth(values, method='relative'):
+    growth = growth_rates(values, method)
+    return float(growth.mean()) if len(growth) else None
+
+
+# Growth classification bands (lower bound, label) used by the growth summary
+GROWTH_BANDS = [(15, 'STRONG'), (10, 'GOOD'), (5, 'MODERATE'), (0, 'SLOW')]
+
+
+def classify_growth(rate):
+    # Label for an average growth rate (%) using GROWTH_BANDS
+    if rate is None or pd.isna(rate):
+        return "NO DATA"
+    for bound, label in GROWTH_BANDS:
+        if rate > bound:
+            return label
+    return "NEGATIVE"
+
+
+def classify_growth_array(rates):
+    # Vectorized classify_growth for an array of any shape
+    rates = np.asarray(rates, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        conditions = [np.isnan(rates)] + [rates > bound for bound, _ in GROWTH_BANDS]
+    labels = ["NO DATA"] + [label for _, label in GROWTH_BANDS]
+    return np.select(conditions, labels, default="NEGATIVE")
+
+
+def dcf_fair_value(cash_flow, shares_outstanding, years=10, growth_rate=0.05, discount_rate=0.12,
+                   terminal_growth=0.02):
+    # Fair value per share from the calculate_dcf model (None when inputs are missing)
+    fcf = starting_free_cash_flow(cash_flow)
+    if fcf is None or not shares_outstanding:
+        return None
+    total_pv = float(dcf_present_value(fcf, growth_rate, discount_rate, terminal_growth, years))
+    return total_pv / shares_outstanding
+
+
+def derive_metrics(statements, shares_outstanding=None, **dcf_params):
+    """
+    Computes every statement-derived metric of the dashboard without printing.
+
+    Args:
+        statements (dict): 'financials', 'balance_sheet', 'balance_sheet_pretty',
+            'income_stmt' and 'cashflow' statements as returned by yfinance
+        shares_outstanding (float): Shares used for the DCF fair value per share
+        **dcf_params: Overrides for DCF_DEFAULTS
+
+    Returns:
+        dict: ROIC by year, average growth rates and DCF fair value
+    """
+    params = {**DCF_DEFAULTS, **dcf_params}
+    roic = roic_by_year(statements.get('financials'), statements.get('balance_sheet'))
+
+    return {
+        'roic': {int(year): float(value) for year, value in roic.items()},
+        'avg_roic_growth': average_growth(roic, 'difference'),
+        'avg_equity_growth': average_growth(equity_by_year(statements.get('balance_sheet_pretty'))),
+        'avg_earnings_growth': average_growth(eps_by_year(statements.get('financials'))),
+        'avg_sales_growth': average_growth(sales_by_year(statements.get('income_stmt'))),
+        'avg_fcf_growth': average_growth(fcf_by_year(statements.get('cashflow'))),
+        'avg_ebit_growth': average_growth(ebit_by_year(statements.get('financials')), 'ratio'),
+        'dcf_fair_value': dcf_fair_value(statements.get('cashflow'), shares_outstanding, **params),
+    }
+
+
+def dcf_margin_of_safety(fair_value, current_price):
+    # Price-dependent part of the DCF output, kept out of the cached results
+    if not fair_value or current_price is None or np.isnan(fair_value):
+        return None
+    return (fair_value - current_price) / fair_value * 100
@@ -0,0 +1,129 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from sqlite_store import SQLiteStore
+
+# Metrics ranked against peers; higher is better for every one of them
+PEER_METRICS = {
+    'roic': 'ROIC',
+    'avg_roic_growth': 'ROIC Growth',
+    'avg_equity_growth': 'Equity Growth',
+    'avg_earnings_growth': 'Earnings Growth',
+    'avg_sales_growth': 'Sales Growth',
+    'avg_fcf_growth': 'FCF Growth',
+    'earnings_yield': 'Earnings Yield',
+    'dcf_margin_of_safety': 'DCF Margin of Safety',
+}
+
+# Peer groups, broadest first
+PEER_GROUPS = ['sector', 'industry']
+
+
+def universe_table(store):
+    """
+    Loads every stored ticker's peer metrics with its sector and industry.
+
+    ROIC is the most recent year's value; the other metrics are the stored
+    scalars written by store_analyses or the change feed.
+
+    Args:
+        store (SQLiteStore): Store holding info snapshots and metrics
+
+    Returns:
+        pd.DataFrame: One row per ticker with the PEER_GROUPS and PEER_METRICS columns
+    """
+    table = store.info_fields(PEER_GROUPS)
+    columns = {metric: store.latest_metric_values(metric) if metric == 'roic' else store.metric_values(metric)
+               for metric in PEER_METRICS}
+    return table.join(pd.DataFrame(columns), how='outer')
+
+
+def peer_percentiles(table, groups=PEER_GROUPS, metrics=None, min_peers=5):
+    """
+    Percentile (0-100) of each ticker's metrics within its peer groups.
+
+    Each group level is ranked with a single groupby(...).rank(pct=True) over
+    all metric columns, so the whole universe is ranked in one pass per level.
+    Tickers with a missing value or group, and groups with fewer than
+    min_peers values for a metric, get NaN.
+
+    Args:
+        table (pd.DataFrame): One row per ticker with group and metric columns (see universe_table)
+        groups (list): Group columns to rank within
+        metrics (list): Metric columns (default: the PEER_METRICS present in table)
+        min_peers (int): Smallest group size for which a percentile is reported
+
+    Returns:
+        dict: Group column -> DataFrame of percentiles (tickers x metrics)
+    """
+    metrics = [m for m in PEER_METRICS if m in table.columns] if metrics is None else list(metrics)
+    values = table[metrics].apply(pd.to_numeric, errors='coerce')
+
+    results = {}
+    for group in groups:
+        keys = table[group].where(table[group].notna() & (table[group] != ''))
+        grouped = values.groupby(keys)
+        percentiles = grouped.rank(pct=True, method='average') * 100
+        peers = grouped.transform('count')
+        results[group] = percentiles.where(peers >= min_peers).reindex(table.index)
+    return results
+
+
+def peer_label(percentile):
+    # Quartile label for a percentile, replacing the fixed growth bands with a peer-relative one
+    if percentile is None or pd.isna(percentile):
+        return "NO PEERS"
+    for bound, label in [(75, 'TOP QUARTILE'), (50, 'ABOVE MEDIAN'), (25, 'BELOW MEDIAN')]:
+        if percentile > bound:
+            return label
+    return "BOTTOM QUARTILE"
+
+
+def print_peer_ranking(ticker, table, percentiles):
+    row = table.loc[ticker]
+    print("\n")
+    print("╔" + "═" * 78 + "╗")
+    print("║" + f" PEER RANKING: {ticker} ".center(78) + "║")
+    print("╠" + "═" * 78 + "╣")
+    for group in percentiles:
+        group_name = row.get(group) if not pd.isna(row.get(group)) else 'N/A'
+        peers = int((table[group] == row.get(group)).sum()) if group_name != 'N/A' else 0
+        print("║" + f" {group.title():<10} {group_name} ({peers} tickers)".ljust(78) + "║")
+    print("╚" + "═" * 78 + "╝")
+
+    header = f"{'Metric':<22} | {'Value':>9}"
+    for group in percentiles:
+        header += f" | {group.title() + ' Pctl':>13}"
+    print("\n" + header + f" | {'Peer Verdict':<15}")
+    print("-" * len(header + " | " + " " * 15))
+    for metric, label in PEER_METRICS.items():
+        if metric not in table.columns:
+            continue
+        value = row[metric]
+        line = f"{label:<22} | " + (f"{value:>8.2f}%" if not pd.isna(value) else f"{'N/A':>9}")
+        for group in percentiles:
+            pct = percentiles[group].at[ticker, metric]
+            line += f" | {pct:>13.0f}" if not pd.isna(pct) else f" | {'N/A':>13}"
+        # Verdict against the narrowest peer group that has a percentile
+        verdict = next((percentiles[g].at[ticker, metric] for g in reversed(list(percentiles))
+                        if not pd.isna(percentiles[g].at[ticker, metric])), np.nan)
+        print(line + f" | {peer_label(verdict) if not pd.isna(value) else 'NO DATA':<15}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank tickers against sector and industry peers")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--db', default='fundamentals.db')
+    parser.add_argument('--min-peers', type=int, default=5)
+    args = parser.parse_args()
+
+    with SQLiteStore(args.db) as store:
+        table = universe_table(store)
+    percentiles = peer_percentiles(table, min_peers=args.min_peers)
+    for ticker in args.tickers:
+        if ticker.upper() in table.index:
+            print_peer_ranking(ticker.upper(), table, percentiles)
+        else:
+            print(f"{ticker.upper()} is not in {args.db}")
@@ -0,0 +1,252 @@
+import argparse
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fetch_scheduler import with_context
+from StockAnalysis import StockAnalysis
+
+# Growth averages of compute_derived_metrics aggregated across holdings
+GROWTH_FIELDS = {
+    'avg_roic_growth': 'ROIC Growth',
+    'avg_equity_growth': 'Equity Growth',
+    'avg_earnings_growth': 'Earnings Growth',
+    'avg_sales_growth': 'Sales Growth',
+    'avg_fcf_growth': 'FCF Growth',
+}
+
+
+def load_holdings(path):
+    """
+    Reads holdings from a CSV file with a 'ticker' column and a 'shares' or 'weight' column.
+
+    Args:
+        path (str): CSV file path
+
+    Returns:
+        tuple: (holdings dict of ticker -> amount, basis 'shares' or 'weight')
+    """
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    columns = {name.strip().lower() for name in (rows[0].keys() if rows else [])}
+    basis = 'shares' if 'shares' in columns else 'weight'
+    if basis not in columns:
+        raise ValueError(f"{path} needs a 'shares' or 'weight' column")
+
+    holdings = {}
+    for row in rows:
+        row = {k.strip().lower(): v for k, v in row.items()}
+        ticker = row['ticker'].strip().upper()
+        holdings[ticker] = holdings.get(ticker, 0.0) + float(row[basis])
+    return holdings, basis
+
+
+def holding_table(analyses, cache=None):
+    """
+    Collects the per-ticker inputs of the portfolio aggregates into one table.
+
+    Args:
+        analyses (dict): Ticker -> StockAnalysis
+        cache (ResultsCache): Optional derived-results cache for compute_derived_metrics
+
+    Returns:
+        pd.DataFrame: One row per ticker with price, EPS, dividend rate, DCF fair
+        value and the average growth rates
+    """
+    return _table({ticker: _holding_row(analysis, cache) for ticker, analysis in analyses.items()})
+
+
+def _holding_row(analysis, cache=None):
+    # One holding's price, EPS, dividend rate, DCF value and growth averages
+    info = analysis.fetch('info')
+    metrics = analysis.compute_derived_metrics(cache)
+    return {
+        'Price': info.get('currentPrice'),
+        'EPS': info.get('trailingEps'),
+        'Dividend Rate': info.get('dividendRate'),
+        'DCF Value': metrics.get('dcf_fair_value'),
+        **{label: metrics.get(name) for name, label in GROWTH_FIELDS.items()},
+    }
+
+
+def _table(rows):
+    return pd.DataFrame.from_dict(rows, orient='index').apply(pd.to_numeric, errors='coerce')
+
+
+def _attempt(function, *args):
+    # (result, None) or (None, error) so one bad ticker does not stop the others loading
+    try:
+        return function(*args), None
+    except Exception as e:
+        return None, e
+
+
+def _weighted_mean(values, weights):
+    # Weighted mean over the holdings that have a value, re-normalizing the weights
+    valid = ~np.isnan(values)
+    total = weights[valid].sum()
+    return float((values[valid] * weights[valid]).sum() / total) if total > 0 else np.nan
+
+
+def aggregate_portfolio(table, holdings, basis='weight', bond_yield=4.0):
+    """
+    Aggregates per-ticker results into portfolio-level yield, value and growth figures.
+
+    Weights are market-value weights: given directly (basis='weight', normalized
+    to sum to 1) or from share counts times price (basis='shares'). The
+    portfolio earnings and dividend yields are the weighted yields of the
+    holdings, i.e. aggregate earnings and dividends over aggregate value.
+
+    Args:
+        table (pd.DataFrame): Output of holding_table
+        holdings (dict): Ticker -> shares or weight
+        basis (str): 'shares' or 'weight'
+        bond_yield (float): 10-year Treasury yield (%)
+
+    Returns:
+        tuple: (per-holding DataFrame with weights and yields, dict of portfolio aggregates)
+    """
+    table = table.reindex(list(holdings)).copy()
+    amounts = np.array([holdings[t] for t in table.index], dtype=np.float64)
+    price = table['Price'].to_numpy(dtype=float)
+    valid_price = np.where(price > 0, price, np.nan)
+
+    if basis == 'shares':
+        market_value = amounts * valid_price
+        weights = np.nan_to_num(market_value) / np.nansum(market_value)
+        shares = amounts
+    else:
+        weights = amounts / amounts.sum()
+        # Notional shares for a portfolio worth 1.0, so DCF value is comparable to market value
+        shares = weights / valid_price
+        market_value = weights.copy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # A missing EPS stays NaN so _weighted_mean skips the holding; yfinance omits
+        # dividendRate for non-payers, so a missing dividend rate is a 0% yield
+        earnings_yield = table['EPS'].to_numpy(dtype=float) / valid_price * 100
+        dividend_yield = np.nan_to_num(table['Dividend Rate'].to_numpy(dtype=float)) / valid_price * 100
+    dcf_value = shares * table['DCF Value'].to_numpy(dtype=float)
+
+    table['Weight (%)'] = weights * 100
+    table['Market Value'] = market_value
+    table['Earnings Yield (%)'] = earnings_yield
+    table['Dividend Yield (%)'] = dividend_yield
+    table['DCF Aggregate'] = dcf_value
+
+    weighted_earnings_yield = _weighted_mean(earnings_yield, weights)
+    weighted_dividend_yield = _weighted_mean(dividend_yield, weights)
+    total_yield = weighted_earnings_yield + weighted_dividend_yield
+    has_dcf = ~np.isnan(dcf_value) & ~np.isnan(market_value)
+    dcf_total = float(dcf_value[has_dcf].sum())
+    covered_value = float(market_value[has_dcf].sum())
+
+    summary = {
+        'Holdings': len(table),
+        'Market Value': float(np.nansum(market_value)),
+        'Earnings Yield (%)': weighted_earnings_yield,
+        'Dividend Yield (%)': weighted_dividend_yield,
+        'Total Yield (%)': total_yield,
+        'Bond Yield (%)': bond_yield,
+        'Yield Spread (%)': total_yield - bond_yield,
+        'DCF Value': dcf_total,
+        'DCF / Market Value': dcf_total / covered_value if covered_value else np.nan,
+        'DCF Coverage (%)': covered_value / float(np.nansum(market_value)) * 100 if np.nansum(market_value) else np.nan,
+        'DCF Margin of Safety (%)': (dcf_total - covered_value) / dcf_total * 100 if dcf_total else np.nan,
+    }
+    for label in GROWTH_FIELDS.values():
+        summary[label + ' (%)'] = _weighted_mean(table[label].to_numpy(dtype=float), weights)
+    return table, summary
+
+
+def analyze_portfolio(holdings, basis='weight', cache=None, max_workers=8, snapshot=None):
+    """
+    Builds every holding's StockAnalysis concurrently and aggregates the results.
+
+    Each ticker's datasets are fetched once, concurrently, by its own
+    StockAnalysis and the Treasury yield is fetched once for the whole portfolio.
+    A holding that cannot be loaded (unknown or delisted ticker, provider
+    error) is reported and left out; the aggregates cover the holdings that
+    loaded, and summary['Failed Holdings'] lists the others.
+
+    Args:
+        holdings (dict): Ticker -> shares or weight
+        basis (str): 'shares' or 'weight'
+        cache (ResultsCache): Optional derived-results cache
+        max_workers (int): Threads used to load the holdings' datasets
+        snapshot (UniverseSnapshot): Optional offline data source
+
+    Returns:
+        tuple: (per-holding DataFrame, dict of portfolio aggregates)
+    """
+    analyses = {ticker: StockAnalysis(ticker, snapshot=snapshot) for ticker in holdings}
+    # Construction is lazy, so load every holding's datasets in parallel up front
+    with ThreadPoolExecutor(max_workers) as pool:
+        # with_context keeps the caller's fetch_priority in the worker threads
+        load = with_context(lambda analysis: _attempt(_holding_row, analysis, cache))
+        results = dict(zip(analyses, pool.map(load, analyses.values())))
+
+    rows, failed = {}, []
+    for ticker, (row, error) in results.items():
+        if error is not None:
+            print(f"Could not load {ticker}: {error}")
+            failed.append(ticker)
+        else:
+            rows[ticker] = row
+    if not rows:
+        raise ValueError("None of the holdings could be loaded")
+
+    bond_yield = analyses[next(iter(rows))].get_bond_yield()
+    table, summary = aggregate_portfolio(_table(rows), {ticker: holdings[ticker] for ticker in rows},
+                                         basis, bond_yield)
+    summary['Failed Holdings'] = failed
+    return table, summary
+
+
+def print_portfolio_summary(table, summary):
+    print("\n")
+    print("╔" + "═" * 78 + "╗")
+    print("║" + " PORTFOLIO ANALYSIS ".center(78) + "║")
+    print("╠" + "═" * 78 + "╣")
+    print("║" + f" Holdings: {summary['Holdings']}".ljust(78) + "║")
+    if summary.get('Failed Holdings'):
+        print("║" + f" Not loaded: {', '.join(summary['Failed Holdings'])}".ljust(78) + "║")
+    print("╚" + "═" * 78 + "╝")
+
+    print(f"\n{'Ticker':<8} | {'Weight':>8} | {'Earn. Yield':>11} | {'Div. Yield':>10} | {'DCF/Market':>10}")
+    print("-" * 60)
+    for ticker, row in table.sort_values('Weight (%)', ascending=False).iterrows():
+        ratio = row['DCF Aggregate'] / row['Market Value'] if row['Market Value'] else np.nan
+        ratio_str = f"{ratio:>9.2f}x" if not pd.isna(ratio) else f"{'N/A':>10}"
+        earnings = row['Earnings Yield (%)']
+        dividend = row['Dividend Yield (%)']
+        earnings_str = f"{earnings:>10.2f}%" if not pd.isna(earnings) else f"{'N/A':>11}"
+        dividend_str = f"{dividend:>9.2f}%" if not pd.isna(dividend) else f"{'N/A':>10}"
+        print(f"{ticker:<8} | {row['Weight (%)']:>7.2f}% | {earnings_str} | {dividend_str} | {ratio_str}")
+
+    print("\n=== Portfolio Yields ===")
+    for name in ['Earnings Yield (%)', 'Dividend Yield (%)', 'Total Yield (%)', 'Bond Yield (%)', 'Yield Spread (%)']:
+        value = summary[name]
+        print(f"{name.replace(' (%)', ''):<30} | " + (f"{value:>9.2f}%" if not pd.isna(value) else f"{'NO DATA':>10}"))
+
+    print("\n=== Aggregate DCF Value ===")
+    print(f"{'DCF Value / Market Value':<30} | {summary['DCF / Market Value']:>9.2f}x")
+    print(f"{'DCF Margin of Safety':<30} | {summary['DCF Margin of Safety (%)']:>9.2f}%")
+    print(f"{'Holdings with a DCF value':<30} | {summary['DCF Coverage (%)']:>9.2f}%")
+
+    print("\n=== Weighted Growth ===")
+    for label in GROWTH_FIELDS.values():
+        value = summary[label + ' (%)']
+        print(f"{label:<30} | " + (f"{value:>9.2f}%" if not pd.isna(value) else f"{'NO DATA':>10}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate StockAnalysis results over portfolio holdings")
+    parser.add_argument('holdings', help="CSV with a 'ticker' column and a 'shares' or 'weight' column")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    holdings, basis = load_holdings(args.holdings)
+    print_portfolio_summary(*analyze_portfolio(holdings, basis, max_workers=args.workers))
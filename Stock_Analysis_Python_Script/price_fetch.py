@@ -0,0 +1,74 @@
+import yfinance as yf
+import pandas as pd
+
+from data_access import shared_fetch
+
+# Benchmarks every performance comparison is measured against
+BENCHMARKS = ('SPY', 'VTI')
+
+
+def close_matrix(data, symbols):
+    """
+    Extracts an aligned close-price matrix from a yf.download result.
+
+    Handles both the multi-ticker layout (('Close', ticker) column pairs, in
+    either level order) and the flat single-ticker layout.
+
+    Args:
+        data (pd.DataFrame): Raw frame returned by yf.download
+        symbols (list): Symbols that were requested, in output column order
+
+    Returns:
+        pd.DataFrame: Close prices, dates x symbols (all-NaN column for any symbol
+        the provider returned nothing for)
+    """
+    if data is None or data.empty:
+        return pd.DataFrame(columns=symbols, dtype=float)
+
+    if isinstance(data.columns, pd.MultiIndex):
+        if 'Close' in data.columns.get_level_values(0):
+            closes = data['Close']
+        else:
+            closes = data.xs('Close', axis=1, level=1)
+    else:
+        closes = data[['Close']].set_axis(symbols[:1], axis=1)
+
+    closes = closes.reindex(columns=symbols).astype(float)
+    closes.index = pd.to_datetime(closes.index)
+    closes.columns.name = None
+    return closes.sort_index()
+
+
+def download_close_matrix(tickers, start=None, end=None, benchmarks=BENCHMARKS, interval='1d'):
+    """
+    Downloads adjusted close prices for a set of tickers plus benchmarks in one batched call.
+
+    Args:
+        tickers (list): Ticker symbols to fetch
+        start (str or datetime): First date to fetch
+        end (str or datetime): Last date to fetch
+        benchmarks (tuple): Benchmark symbols appended to the request
+        interval (str): Bar interval passed to yfinance
+
+    Returns:
+        pd.DataFrame: Close prices, dates x (tickers + benchmarks), duplicates removed
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys(list(tickers) + list(benchmarks)))
+
+    def download():
+        return yf.download(
+            symbols,
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=True,
+            group_by='column',
+            progress=False,
+            threads=True,
+        )
+
+    # Identical concurrent requests (e.g. many analyses asking for SPY/VTI) share one download
+    data = shared_fetch(symbols, 'download', download, start=start, end=end, interval=interval)
+    return close_matrix(data, symbols)
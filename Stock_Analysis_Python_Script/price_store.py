@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from price_fetch import download_close_matrix
+
+# File names inside a store version directory
+VALUES_FILE = 'prices.npy'
+INDEX_FILE = 'index.json'
+
+# File in the store directory naming its current version directory
+POINTER_FILE = 'CURRENT'
+
+# Superseded versions kept on disk, so a reader that has just read the old
+# pointer can still open the files it names
+KEEP_VERSIONS = 1
+
+
+def current_version(path):
+    # Directory holding the current files, as named by the store's pointer file
+    with open(os.path.join(path, POINTER_FILE)) as f:
+        return os.path.join(path, f.read().strip())
+
+
+def new_version(path):
+    # Fresh, uniquely named version directory to write a store into; names sort by creation time
+    os.makedirs(path, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"v{time.time_ns()}-", dir=path)
+
+
+def publish_version(path, version):
+    """
+    Makes a fully written version directory the store's current one.
+
+    The pointer file is replaced with one rename, so a reader sees either the
+    old version or the new one, never a mix of their files. Older versions
+    beyond KEEP_VERSIONS are removed.
+
+    Args:
+        path (str): Store directory
+        version (str): Version directory created by new_version
+    """
+    name = os.path.basename(version)
+    pointer_tmp = os.path.join(version, POINTER_FILE + '.tmp')
+    with open(pointer_tmp, 'w') as f:
+        f.write(name)
+    os.replace(pointer_tmp, os.path.join(path, POINTER_FILE))
+
+    older = sorted(entry for entry in os.listdir(path)
+                   if entry.startswith('v') and entry < name and os.path.isdir(os.path.join(path, entry)))
+    for entry in older[:max(0, len(older) - KEEP_VERSIONS)]:
+        shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+class PriceStore:
+    """
+    On-disk daily close-price matrix (dates x symbols) opened as a read-only memory map.
+
+    The values live in a column-major .npy file so that one symbol's full
+    history is contiguous on disk, and a JSON sidecar holds the date and
+    symbol labels. Every process that opens the same store maps the same
+    file, so the operating system page cache keeps a single physical copy
+    no matter how many workers read it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        version = current_version(path)
+        with open(os.path.join(version, INDEX_FILE)) as f:
+            index = json.load(f)
+
+        self.symbols = index['symbols']
+        self.dates = pd.DatetimeIndex(pd.to_datetime(index['dates']))
+        self._columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._values = np.load(os.path.join(version, VALUES_FILE), mmap_mode='r')
+
+    @classmethod
+    def build(cls, path, prices):
+        """
+        Writes a close-price DataFrame to a new store, replacing any existing one.
+
+        The values and index are written into a new version directory and
+        published by atomically replacing the store's pointer file, so
+        readers in other processes always open a matching pair of files and
+        never see a half-written store.
+
+        Args:
+            path (str): Store directory
+            prices (pd.DataFrame): Close prices, dates x symbols
+
+        Returns:
+            PriceStore: The newly written store, opened read-only
+        """
+        prices = prices.sort_index()
+        version = new_version(path)
+
+        values = np.lib.format.open_memmap(
+            os.path.join(version, VALUES_FILE), mode='w+', dtype=np.float64, shape=prices.shape,
+            fortran_order=True
+        )
+        values[:] = prices.to_numpy(dtype=float, na_value=np.nan)
+        values.flush()
+        del values
+
+        with open(os.path.join(version, INDEX_FILE), 'w') as f:
+            json.dump({
+                'symbols': [str(symbol) for symbol in prices.columns],
+                'dates': [d.strftime('%Y-%m-%d') for d in pd.to_datetime(prices.index)],
+            }, f)
+
+        publish_version(path, version)
+        return cls(path)
+
+    @classmethod
+    def from_download(cls, path, tickers, start='2000-01-01', end=None):
+        # Build a store straight from one batched download (benchmarks included)
+        return cls.build(path, download_close_matrix(tickers, start, end))
+
+    def __contains__(self, symbol):
+        return symbol in self._columns
+
+    def covers(self, symbols):
+        return all(symbol in self._columns for symbol in symbols)
+
+    def _date_slice(self, start=None, end=None):
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side='right')
+        return slice(lo, hi)
+
+    def values(self, symbols=None, start=None, end=None):
+        """
+        Returns the raw price array for a date range and set of symbols.
+
+        A date range over all symbols, a single symbol, or a run of symbols
+        that are adjacent in the store is returned as a view on the memory
+        map (no copy). Any other symbol selection gathers just those columns.
+
+        Args:
+            symbols (list): Symbols to select (default: all)
+            start: First date to include
+            end: Last date to include
+
+        Returns:
+            np.ndarray: Read-only array shaped (dates, symbols)
+        """
+        rows = self._date_slice(start, end)
+        if symbols is None:
+            return self._values[rows]
+
+        columns = [self._columns[symbol] for symbol in symbols]
+        if columns and columns == list(range(columns[0], columns[0] + len(columns))):
+            return self._values[rows, columns[0]:columns[0] + len(columns)]
+        return self._values[rows][:, columns]
+
+    def frame(self, symbols=None, start=None, end=None):
+        # DataFrame wrapper sharing memory with values() where possible
+        rows = self._date_slice(start, end)
+        columns = self.symbols if symbols is None else list(symbols)
+        return pd.DataFrame(
+            self.values(symbols, start, end),
+            index=self.dates[rows],
+            columns=columns,
+            copy=False,
+        )
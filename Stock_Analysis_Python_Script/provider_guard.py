@@ -0,0 +1,262 @@
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+from data_access import shared_request
+from fetch_scheduler import REFRESH
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # yfinance versions without a rate-limit exception
+    YFRateLimitError = None
+
+
+class CircuitOpenError(Exception):
+    # Raised instead of calling the provider while the circuit is open
+    pass
+
+
+class NoDataError(ValueError):
+    # The provider answered but has no data for the symbol (empty info, delisted
+    # ticker); a per-symbol problem that does not count against the circuit
+    pass
+
+
+# Failures that mean the provider itself is unreachable or refusing requests:
+# connection, timeout and HTTP errors (requests and curl_cffi errors are OSErrors)
+# and rate limiting. Anything else is a problem with one symbol's data.
+TRANSPORT_ERRORS = (OSError,) + ((YFRateLimitError,) if YFRateLimitError is not None else ())
+
+
+class CircuitBreaker:
+    """
+    Tracks provider failures and stops calling it while it is failing.
+
+    closed: calls go through; `failure_threshold` consecutive failures open it.
+    Only transport failures count (see TRANSPORT_ERRORS); a NoDataError or
+    other per-symbol error is passed through without opening the circuit.
+    open: calls fail fast until `reset_timeout` seconds have passed.
+    half-open: one trial call is let through; success closes the circuit,
+    failure opens it again for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def retry_in(self):
+        # Seconds until a trial call is allowed (0 when closed or half-open)
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self):
+        # True if a call may go to the provider now (claims the trial when half-open)
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+# Environment variable overriding the directory that holds the on-disk caches
+CACHE_DIR_ENV = 'STOCK_ANALYSIS_CACHE_DIR'
+
+
+def default_cache_dir(name='provider_cache'):
+    # Cache folder `name` in $STOCK_ANALYSIS_CACHE_DIR, else in the user cache directory
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        root = os.path.join(base, 'stock-analysis')
+    return os.path.join(root, name)
+
+
+class StaleCache:
+    """
+    Last good value per request key, kept in memory and (optionally) on disk.
+
+    directory may be a path, None for a memory-only cache, or a callable
+    returning the path; a callable is resolved on first disk access, so the
+    location is not fixed when the module is imported.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        if callable(self._directory):
+            self._directory = self._directory()
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        self._directory = value
+
+    def _path(self, key):
+        name = '_'.join(str(part) for part in key).replace('/', '_').replace(os.sep, '_')
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def get(self, key):
+        # (value, fetched_at) or None
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None and self.directory:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    entry = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return None
+            with self._lock:
+                self._memory[key] = entry
+        return entry
+
+    def put(self, key, value):
+        entry = (value, datetime.now())
+        with self._lock:
+            self._memory[key] = entry
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(key) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+
+
+class ProviderGuard:
+    """
+    Circuit breaker plus stale-while-revalidate cache around provider requests.
+
+    Successful results are remembered per request key. When the provider
+    is unreachable (a TRANSPORT_ERRORS failure), or the circuit is open and
+    calls are skipped, the last good value is returned together with the
+    time it was fetched, and the key is queued for background revalidation,
+    which refreshes it once the circuit lets a trial call through. Without a
+    cached value the failure is raised (immediately while open). Per-symbol
+    errors are raised as they are and never served stale.
+
+    Revalidation requests go through shared_request at REFRESH priority, so
+    they share the FetchScheduler rate budget and join (or are joined by)
+    identical foreground requests.
+    """
+
+    def __init__(self, breaker=None, cache=None, transport_errors=TRANSPORT_ERRORS):
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = cache or StaleCache()
+        self.transport_errors = transport_errors
+        self._pending = {}
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def call(self, key, loader):
+        """
+        Calls loader unless the circuit is open, falling back to the last good value.
+
+        Args:
+            key: Request identity (see data_access.request_key)
+            loader (callable): Performs the provider request
+
+        Returns:
+            tuple: (value, stale_since) where stale_since is None for a fresh
+            value and the datetime the cached value was fetched otherwise
+        """
+        if self.breaker.allow():
+            try:
+                value = loader()
+            except self.transport_errors as e:
+                self.breaker.record_failure()
+                return self._stale(key, loader, e)
+            except Exception:
+                # The provider answered; the problem is this symbol's data (e.g. NoDataError)
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            self.cache.put(key, value)
+            with self._lock:
+                self._pending.pop(key, None)
+            return value, None
+
+        return self._stale(key, loader, CircuitOpenError(
+            f"Data provider unavailable; retrying in {self.breaker.retry_in():.0f}s"
+        ))
+
+    def _stale(self, key, loader, error):
+        entry = self.cache.get(key)
+        if entry is None:
+            raise error
+        self._schedule_revalidation(key, loader)
+        return entry
+
+    def _schedule_revalidation(self, key, loader):
+        with self._lock:
+            self._pending.setdefault(key, loader)
+            if self._worker is None:
+                # Daemon thread so a provider that never recovers cannot block exit
+                self._worker = threading.Thread(target=self._revalidate, name='revalidate', daemon=True)
+                self._worker.start()
+
+    def stale_keys(self):
+        with self._lock:
+            return list(self._pending)
+
+    def _revalidate(self):
+        # Refresh queued keys one at a time, each through the scheduler, single-flight and breaker
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                key, loader = next(iter(self._pending.items()))
+
+            time.sleep(self.breaker.retry_in())
+            try:
+                _, stale_since = shared_request(key, lambda: self.call(key, loader), priority=REFRESH)
+            except Exception:
+                # The provider answered but has nothing usable for this key; stop retrying it
+                stale_since = None
+            if stale_since is None:
+                with self._lock:
+                    self._pending.pop(key, None)
+            else:
+                # Still failing, or another caller holds the half-open trial
+                time.sleep(0.1)
+
+
+# Process-wide guard used by StockAnalysis for live provider requests. The
+# on-disk copies go to default_cache_dir(); set provider_guard.cache.directory
+# to another path, or to None to keep them in memory only.
+provider_guard = ProviderGuard(cache=StaleCache(default_cache_dir))
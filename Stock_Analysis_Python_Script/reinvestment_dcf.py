@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from dcf_model import HIGH_GROWTH_YEARS
+from fundamentals import field
+
+# Share of operating cash flow treated as maintenance capex when nothing better is known
+# (the split calculate_amzn_dcf has always used)
+DEFAULT_MAINTENANCE_RATIO = 0.33
+
+
+def estimate_maintenance_ratios(panel, min_years=2):
+    """
+    Estimates each ticker's maintenance capex as a share of operating cash flow from history.
+
+    Maintenance capex for a year is approximated by depreciation and
+    amortization (the spend needed to stand still), capped at the capex
+    actually reported; if D&A is missing the full capex is used. The ratio to
+    operating cash flow is taken per year and the median across years is used.
+
+    Args:
+        panel (pd.DataFrame): Cash flow fundamentals panel indexed by (ticker, date)
+        min_years (int): Minimum years with positive OCF needed for an estimate
+
+    Returns:
+        pd.Series: Estimated ratio per ticker, clipped to [0, 1] (NaN if too little history)
+    """
+    ocf = field(panel, 'Operating Cash Flow')
+    capex = field(panel, 'Capital Expenditure').abs()
+    depreciation = field(panel, 'Depreciation And Amortization').abs()
+
+    maintenance = np.fmin(capex, depreciation)
+    ratios = (maintenance / ocf).where(ocf > 0)
+
+    grouped = ratios.groupby(level='Ticker', sort=False)
+    estimate = grouped.median().where(grouped.count() >= min_years)
+    return estimate.clip(0, 1).rename('Maintenance Ratio')
+
+
+def resolve_maintenance_ratios(tickers, panel=None, sectors=None, sector_ratios=None, overrides=None,
+                               method='history'):
+    """
+    Picks the maintenance capex ratio for each ticker.
+
+    Priority is: explicit per-ticker override, then the sector ratio when
+    method is 'sector', then the historical estimate when method is 'history',
+    then the ratio of the ticker's sector, and finally DEFAULT_MAINTENANCE_RATIO.
+
+    Args:
+        tickers (list): Tickers to resolve
+        panel (pd.DataFrame): Cash flow fundamentals panel (needed for 'history')
+        sectors (pd.Series or dict): Ticker -> sector name
+        sector_ratios (dict): Sector name -> maintenance ratio
+        overrides (dict): Ticker -> maintenance ratio
+        method (str): 'history' or 'sector'
+
+    Returns:
+        pd.DataFrame: 'Maintenance Ratio' and 'Ratio Source' per ticker
+    """
+    index = pd.Index(tickers, name='Ticker')
+    ratio = pd.Series(np.nan, index=index)
+    source = pd.Series('default', index=index, dtype=object)
+
+    from_sector = pd.Series(np.nan, index=index)
+    if sectors is not None and sector_ratios:
+        from_sector = pd.Series(sectors).reindex(index).map(sector_ratios).astype(float)
+
+    from_history = pd.Series(np.nan, index=index)
+    if panel is not None and method == 'history':
+        from_history = estimate_maintenance_ratios(panel).reindex(index)
+
+    candidates = [
+        (pd.Series(overrides or {}, dtype=float).reindex(index), 'override'),
+        (from_sector if method == 'sector' else from_history, method),
+        (from_sector, 'sector'),
+    ]
+    for values, label in candidates:
+        fill = ratio.isna() & values.notna()
+        ratio[fill] = values[fill]
+        source[fill] = label
+
+    default = ratio.isna()
+    ratio[default] = DEFAULT_MAINTENANCE_RATIO
+    return pd.DataFrame({'Maintenance Ratio': ratio, 'Ratio Source': source})
+
+
+def project_cash_flows(adjusted_fcf, growth_rate, discount_rate, terminal_growth, years):
+    """
+    Yearly projected cash flows and their present values for many tickers at once.
+
+    Args:
+        adjusted_fcf (np.ndarray): Starting adjusted FCF per ticker
+        growth_rate, discount_rate, terminal_growth: Scalars or per-ticker arrays shaped (tickers, 1)
+        years (int): Projection length
+
+    Returns:
+        tuple: (projected, present_values) arrays shaped (tickers, years)
+    """
+    # Rows are tickers, columns are projection years
+    year = np.arange(1, years + 1)[None, :]
+    yearly_growth = np.where(year <= HIGH_GROWTH_YEARS, growth_rate, terminal_growth)
+    projected = np.asarray(adjusted_fcf, dtype=float)[:, None] * np.cumprod(1 + yearly_growth, axis=1)
+    return projected, projected / (1 + discount_rate) ** year
+
+
+def reinvestment_dcf(panel, market, growth_rate=0.12, discount_rate=0.08, terminal_growth=0.02, years=15,
+                     ocf_periods=3, ratios=None, **ratio_options):
+    """
+    Values a whole universe with the reinvestment-adjusted ("Amazon-style") DCF in one pass.
+
+    Adjusted FCF = average recent Operating Cash Flow x (1 - Maintenance Ratio):
+    growth capex is treated as investment rather than a cost. Cash flows grow
+    at growth_rate for years 1-5 and terminal_growth afterwards, and a Gordon
+    growth terminal value is added, exactly as in calculate_amzn_dcf. Rates may
+    be scalars or per-ticker Series.
+
+    Args:
+        panel (pd.DataFrame): Cash flow fundamentals panel indexed by (ticker, date)
+        market (pd.DataFrame): Per ticker 'Shares Outstanding' and 'Current Price'
+        growth_rate: Growth rate for years 1-5 (decimal)
+        discount_rate: Discount rate (decimal)
+        terminal_growth: Growth rate for years 6+ and the terminal value (decimal)
+        years (int): Projection length
+        ocf_periods (int): Number of most recent years of OCF to average
+        ratios (pd.DataFrame): Output of resolve_maintenance_ratios (resolved here if None)
+        **ratio_options: Passed to resolve_maintenance_ratios when ratios is None
+
+    Returns:
+        pd.DataFrame: One row per ticker with inputs, enterprise value, fair value
+        per share and margin of safety (NaN where the model is invalid)
+    """
+    ocf = field(panel, 'Operating Cash Flow').dropna()
+    base_ocf = ocf.groupby(level='Ticker', sort=False).head(ocf_periods).groupby(level='Ticker', sort=False).mean()
+    tickers = base_ocf.index.intersection(market.index)
+    if ratios is None:
+        ratios = resolve_maintenance_ratios(list(tickers), panel, **ratio_options)
+
+    def per_ticker(value):
+        if isinstance(value, (pd.Series, dict)):
+            return pd.Series(value).reindex(tickers).to_numpy(dtype=float)
+        return np.full(len(tickers), float(value))
+
+    growth = per_ticker(growth_rate)[:, None]
+    discount = per_ticker(discount_rate)[:, None]
+    terminal = per_ticker(terminal_growth)[:, None]
+    ratio = ratios['Maintenance Ratio'].reindex(tickers).to_numpy(dtype=float)
+    ocf_values = base_ocf.reindex(tickers).to_numpy(dtype=float)
+
+    adjusted_fcf = ocf_values * (1 - ratio)
+    projected, present_values = project_cash_flows(adjusted_fcf, growth, discount, terminal, years)
+
+    # Keep the terminal growth below the discount rate, as calculate_amzn_dcf does
+    terminal = np.where(terminal >= discount, discount - 0.02, terminal)[:, 0]
+    discount = discount[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terminal_value = projected[:, -1] * (1 + terminal) / (discount - terminal)
+    terminal_value_pv = terminal_value / (1 + discount) ** years
+    enterprise_value = present_values.sum(axis=1) + terminal_value_pv
+    enterprise_value[terminal_value < 0] = np.nan
+
+    shares = market['Shares Outstanding'].reindex(tickers).to_numpy(dtype=float)
+    price = market['Current Price'].reindex(tickers).to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair_value = np.where(shares > 0, enterprise_value / shares, np.nan)
+        margin_of_safety = (fair_value - price) / fair_value * 100
+
+    return pd.DataFrame({
+        'Operating Cash Flow': ocf_values,
+        'Maintenance Ratio': ratio,
+        'Ratio Source': ratios['Ratio Source'].reindex(tickers).to_numpy(),
+        'Adjusted FCF': adjusted_fcf,
+        'PV of Cash Flows': present_values.sum(axis=1),
+        'PV of Terminal Value': terminal_value_pv,
+        'Enterprise Value': enterprise_value,
+        'Fair Value': fair_value,
+        'Current Price': price,
+        'Margin of Safety (%)': margin_of_safety,
+    }, index=tickers)
@@ -0,0 +1,72 @@
+import sys
+
+# Verbosity levels, from least to most output
+SUMMARY = 0  # Headline figures and verdicts
+TABLE = 1    # Plus the per-year and projection tables
+FULL = 2     # Plus formulas, derivations and explanations
+
+LEVELS = {'summary': SUMMARY, 'table': TABLE, 'full': FULL}
+
+
+def verbosity_level(verbosity):
+    # Accept a level name or number
+    if isinstance(verbosity, str):
+        if verbosity.lower() not in LEVELS:
+            raise ValueError(f"Unknown verbosity '{verbosity}', expected one of: {', '.join(LEVELS)}")
+        return LEVELS[verbosity.lower()]
+    return int(verbosity)
+
+
+class ReportWriter:
+    """
+    Collects report lines in memory and writes them out in a single call.
+
+    Lines above the configured verbosity are dropped before they are stored.
+    Callers guard expensive detail with `if out.full:` (or enabled(level)) so
+    derivation text is not even formatted unless it will be shown.
+
+    Used as a context manager: everything written inside the block is
+    flushed once when the block exits, including when it exits with an error.
+    """
+
+    def __init__(self, verbosity=FULL, stream=None):
+        self.level = verbosity_level(verbosity)
+        # Resolved at flush time so a redirected sys.stdout (e.g. ThreadLocalStdout) is honored
+        self.stream = stream
+        self._lines = []
+
+    def enabled(self, level):
+        return self.level >= level
+
+    @property
+    def table(self):
+        return self.level >= TABLE
+
+    @property
+    def full(self):
+        return self.level >= FULL
+
+    def line(self, text='', level=SUMMARY):
+        if self.level >= level:
+            self._lines.append(str(text))
+
+    def lines(self, texts, level=SUMMARY):
+        if self.level >= level:
+            self._lines.extend(str(text) for text in texts)
+
+    def flush(self):
+        # One write for everything collected so far (e.g. before prompting for input)
+        if self._lines:
+            stream = self.stream or sys.stdout
+            stream.write('\n'.join(self._lines) + '\n')
+            stream.flush()
+            self._lines = []
+
+    def getvalue(self):
+        return '\n'.join(self._lines) + '\n' if self._lines else ''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
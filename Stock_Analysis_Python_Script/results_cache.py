@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from provider_guard import default_cache_dir
+
+# Bump when the derived metrics change meaning, so old entries stop matching
+CACHE_VERSION = 2
+
+
+def content_hash(statements, params=None):
+    """
+    Hashes statement data and calculation parameters into a stable cache key.
+
+    Each DataFrame contributes its labels and a per-row hash of its values,
+    so the key changes whenever any reported figure, field or period changes
+    and stays identical when a fresh download is byte-for-byte the same.
+
+    Args:
+        statements (dict): Name -> DataFrame (or any JSON-serializable value)
+        params (dict): Calculation parameters
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for name in sorted(statements):
+        value = statements[name]
+        digest.update(name.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(value.index)).encode())
+            if isinstance(value, pd.DataFrame):
+                digest.update(repr(list(value.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultsCache:
+    """
+    Derived-results cache with one pickle file per ticker, keyed by content hash.
+
+    Each entry stores the key it was computed from; a lookup only hits when
+    the caller's key matches, so changed statements or parameters always
+    trigger a recompute and overwrite the entry. Entries go to a
+    results_cache folder next to the provider cache unless a directory is given.
+    """
+
+    def __init__(self, directory=None):
+        directory = directory if directory is not None else default_cache_dir('results_cache')
+        self.directory = directory
+        self._memory = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker):
+        return os.path.join(self.directory, f"{ticker.replace('/', '_')}.pkl")
+
+    def get(self, ticker, key):
+        entry = self._memory.get(ticker)
+        if entry is None:
+            try:
+                with open(self._path(ticker), 'rb') as f:
+                    entry = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return None
+            self._memory[ticker] = entry
+        return entry['results'] if entry['key'] == key else None
+
+    def put(self, ticker, key, results):
+        entry = {'key': key, 'results': results}
+        tmp_path = self._path(ticker) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f)
+        os.replace(tmp_path, self._path(ticker))
+        self._memory[ticker] = entry
+
+    def get_or_compute(self, ticker, statements, params, compute):
+        """
+        Returns cached results when the statements and parameters are unchanged.
+
+        Args:
+            ticker (str): Ticker symbol
+            statements (dict): Input statement data hashed into the key
+            params (dict): Calculation parameters hashed into the key
+            compute (callable): Called with no arguments on a cache miss
+
+        Returns:
+            tuple: (results, hit) where hit is True when nothing was recomputed
+        """
+        key = content_hash(statements, params)
+        results = self.get(ticker, key)
+        if results is not None:
+            return results, True
+        results = compute()
+        self.put(ticker, key, results)
+        return results, False
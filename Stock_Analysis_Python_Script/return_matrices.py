@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from price_store import PriceStore, current_version, new_version, publish_version
+from risk_analytics import forward_fill, simple_returns
+
+# File names inside a matrices version directory
+COVARIANCE_FILE = 'covariance.npy'
+CORRELATION_FILE = 'correlation.npy'
+INDEX_FILE = 'index.json'
+
+# Default minimum overlapping returns for a pair, per return frequency
+MIN_PERIODS = {'D': 60, 'M': 24}
+
+
+def _month_end_rows(dates):
+    # Row position of the last trading day of each month
+    periods = pd.DatetimeIndex(dates).to_period('M')
+    return np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+
+
+def block_returns(prices, frequency='D', month_rows=None):
+    """
+    Demeaned returns and validity mask for one block of price columns.
+
+    Daily returns keep NaN wherever a price is missing; monthly returns are
+    taken between month-end prices, carrying the last close forward over gaps.
+    Each column is demeaned over its own valid returns so the pairwise sums
+    below stay well conditioned.
+
+    Args:
+        prices (np.ndarray): Close prices shaped (dates, symbols)
+        frequency (str): 'D' for daily or 'M' for monthly returns
+        month_rows (np.ndarray): Month-end row positions (required for 'M')
+
+    Returns:
+        tuple: (returns with NaN replaced by 0, float mask of valid returns)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if frequency == 'M':
+        prices = forward_fill(prices)[month_rows]
+    returns = simple_returns(prices)[1:]
+    valid = ~np.isnan(returns)
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore'):
+        means = np.where(counts > 0, np.nansum(returns, axis=0) / np.maximum(counts, 1), 0.0)
+    return np.where(valid, returns - means, 0.0), valid.astype(np.float64)
+
+
+def pairwise_cov_corr(x, mask_x, y, mask_y, min_periods=60):
+    """
+    Pairwise-complete covariance and correlation between two column blocks.
+
+    Every statistic of a pair (i, j) uses only the dates where both i and j
+    have a return, matching DataFrame.cov()/corr() with min_periods, but
+    computed for the whole block with six matrix products.
+
+    Args:
+        x, y (np.ndarray): Returns shaped (dates, bx) and (dates, by), 0 where missing
+        mask_x, mask_y (np.ndarray): Float masks of valid returns, same shapes
+        min_periods (int): Minimum overlapping returns; pairs with fewer are NaN
+
+    Returns:
+        tuple: (covariance, correlation) arrays shaped (bx, by)
+    """
+    n = mask_x.T @ mask_y
+    sum_x = x.T @ mask_y
+    sum_y = mask_x.T @ y
+    sum_xy = x.T @ y
+    sum_xx = (x * x).T @ mask_y
+    sum_yy = mask_x.T @ (y * y)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        co_moment = sum_xy - sum_x * sum_y / n
+        covariance = co_moment / (n - 1)
+        correlation = co_moment / np.sqrt((sum_xx - sum_x * sum_x / n) * (sum_yy - sum_y * sum_y / n))
+
+    too_short = n < max(min_periods, 2)
+    covariance[too_short] = np.nan
+    correlation[too_short] = np.nan
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    return covariance, correlation
+
+
+class ReturnMatrices:
+    """
+    Covariance and correlation matrices of returns stored as memory-mappable .npy files.
+
+    Same layout as PriceStore: the N x N matrices are .npy files opened
+    read-only with mmap_mode='r' and a JSON sidecar holds the symbols and
+    settings, so reopening a matrix for thousands of tickers costs nothing
+    and processes sharing it share one copy in the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        version = current_version(path)
+        with open(os.path.join(version, INDEX_FILE)) as f:
+            index = json.load(f)
+
+        self.symbols = index['symbols']
+        self.frequency = index['frequency']
+        self.min_periods = index['min_periods']
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.covariance = np.load(os.path.join(version, COVARIANCE_FILE), mmap_mode='r')
+        self.correlation = np.load(os.path.join(version, CORRELATION_FILE), mmap_mode='r')
+
+    @classmethod
+    def build(cls, path, prices, symbols=None, frequency='D', start=None, end=None, block_size=256,
+              workers=None, min_periods=None, dtype=np.float32):
+        """
+        Computes the matrices block by block and writes them to a new directory.
+
+        The symbols are split into blocks of block_size columns and every
+        pair of blocks (upper triangle only) is one task on a thread pool;
+        the matrix products release the GIL, so the tasks run on all cores.
+        Only the price columns of the two blocks a task works on are read,
+        so memory stays around workers x 2 blocks of returns however large
+        the universe is, and results go straight into the memory-mapped
+        output files. Like PriceStore.build, the files are written into a new
+        version directory that is published with one pointer rename.
+
+        Args:
+            path (str): Output directory
+            prices (PriceStore or pd.DataFrame): Close prices, dates x symbols
+            symbols (list): Symbols to include (default: all)
+            frequency (str): 'D' for daily or 'M' for monthly returns
+            start, end: Date range of the prices used
+            block_size (int): Symbols per block
+            workers (int): Threads (default: CPU count)
+            min_periods (int): Minimum overlapping returns per pair (default: MIN_PERIODS)
+            dtype: Stored dtype (float32 halves the file size of an N x N matrix)
+
+        Returns:
+            ReturnMatrices: The newly written matrices, opened read-only
+        """
+        if not isinstance(prices, PriceStore):
+            prices = prices.sort_index().loc[start:end]
+        symbols = list(symbols if symbols is not None else prices.symbols if isinstance(prices, PriceStore)
+                       else prices.columns)
+        dates = prices.dates[prices._date_slice(start, end)] if isinstance(prices, PriceStore) else prices.index
+        min_periods = MIN_PERIODS[frequency] if min_periods is None else min_periods
+        month_rows = _month_end_rows(dates) if frequency == 'M' else None
+
+        def load(block):
+            names = symbols[block * block_size:(block + 1) * block_size]
+            values = (prices.values(names, start, end) if isinstance(prices, PriceStore)
+                      else prices[names].to_numpy(dtype=float, na_value=np.nan))
+            return block_returns(values, frequency, month_rows)
+
+        n = len(symbols)
+        version = new_version(path)
+        covariance = np.lib.format.open_memmap(os.path.join(version, COVARIANCE_FILE), mode='w+', dtype=dtype,
+                                               shape=(n, n))
+        correlation = np.lib.format.open_memmap(os.path.join(version, CORRELATION_FILE), mode='w+', dtype=dtype,
+                                                shape=(n, n))
+
+        def compute(pair):
+            i, j = pair
+            x, mask_x = load(i)
+            y, mask_y = (x, mask_x) if i == j else load(j)
+            block_cov, block_corr = pairwise_cov_corr(x, mask_x, y, mask_y, min_periods)
+            rows = slice(i * block_size, i * block_size + block_cov.shape[0])
+            columns = slice(j * block_size, j * block_size + block_cov.shape[1])
+            # Each task owns its two (disjoint) tiles, so no locking is needed
+            covariance[rows, columns] = block_cov
+            correlation[rows, columns] = block_corr
+            covariance[columns, rows] = block_cov.T
+            correlation[columns, rows] = block_corr.T
+
+        n_blocks = -(-n // block_size)
+        pairs = [(i, j) for i in range(n_blocks) for j in range(i, n_blocks)]
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            list(pool.map(compute, pairs))
+
+        covariance.flush()
+        correlation.flush()
+        del covariance, correlation
+
+        with open(os.path.join(version, INDEX_FILE), 'w') as f:
+            json.dump({'symbols': [str(s) for s in symbols], 'frequency': frequency, 'min_periods': min_periods}, f)
+
+        publish_version(path, version)
+        return cls(path)
+
+    def __contains__(self, symbol):
+        return symbol in self._positions
+
+    def frame(self, kind='correlation', symbols=None):
+        # Sub-matrix for a set of symbols as a labeled DataFrame
+        matrix = self.correlation if kind == 'correlation' else self.covariance
+        if symbols is None:
+            return pd.DataFrame(matrix, index=self.symbols, columns=self.symbols, copy=False)
+        positions = [self._positions[symbol] for symbol in symbols]
+        return pd.DataFrame(matrix[np.ix_(positions, positions)], index=symbols, columns=symbols)
+
+    def most_correlated(self, symbol, count=10):
+        # Symbols with the highest correlation to `symbol`, excluding itself
+        row = pd.Series(np.asarray(self.correlation[self._positions[symbol]], dtype=np.float64),
+                        index=self.symbols).drop(symbol)
+        return row.dropna().sort_values(ascending=False).head(count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build correlation and covariance matrices from a price store")
+    parser.add_argument('store', help="PriceStore directory")
+    parser.add_argument('output', help="Output directory for the matrices")
+    parser.add_argument('--frequency', choices=['D', 'M'], default='D')
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--block-size', type=int, default=256)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    matrices = ReturnMatrices.build(args.output, PriceStore(args.store), frequency=args.frequency,
+                                    start=args.start, end=args.end, block_size=args.block_size,
+                                    workers=args.workers)
+    print(f"Wrote {len(matrices.symbols)} x {len(matrices.symbols)} {args.frequency} matrices to {args.output}")
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+# Trading days used to annualize daily statistics
+TRADING_DAYS = 252
+
+
+def _as_matrix(prices):
+    # Accept a DataFrame (dates x symbols) or a Series and return a float64 matrix
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+    return prices, np.asarray(prices.to_numpy(dtype=float, na_value=np.nan), dtype=np.float64)
+
+
+def forward_fill(values):
+    """
+    Forward fills NaN gaps down each column of a 2-D array without a Python loop.
+
+    Args:
+        values (np.ndarray): Array shaped (dates, symbols)
+
+    Returns:
+        np.ndarray: Copy with every NaN replaced by the last valid value above it
+    """
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+def simple_returns(values):
+    # Daily simple returns; first row is NaN so the shape matches the price matrix
+    returns = np.full_like(values, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = values[1:] / values[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def _rolling_sums(values, window):
+    # Windowed sums of values and of valid-cell counts using one cumulative sum each
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    csum = np.concatenate([zeros, np.cumsum(filled, axis=0)])
+    csq = np.concatenate([zeros, np.cumsum(filled * filled, axis=0)])
+    ccount = np.concatenate([zeros, np.cumsum(valid, axis=0, dtype=np.float64)])
+
+    sums = np.full_like(values, np.nan)
+    squares = np.full_like(values, np.nan)
+    counts = np.zeros_like(values)
+    sums[window - 1:] = csum[window:] - csum[:-window]
+    squares[window - 1:] = csq[window:] - csq[:-window]
+    counts[window - 1:] = ccount[window:] - ccount[:-window]
+    return sums, squares, counts
+
+
+def rolling_volatility_array(returns, window=63, annualize=True, min_periods=None):
+    """
+    Computes rolling standard deviation of returns for every column at once.
+
+    Args:
+        returns (np.ndarray): Daily returns shaped (dates, symbols), NaN where missing
+        window (int): Rolling window length in trading days
+        annualize (bool): Scale by sqrt(252) when True
+        min_periods (int): Minimum valid returns in a window (default: window)
+
+    Returns:
+        np.ndarray: Rolling volatility, NaN where the window has too few observations
+    """
+    min_periods = window if min_periods is None else min_periods
+    sums, squares, counts = _rolling_sums(returns, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (squares - sums * sums / counts) / (counts - 1)
+    variance[(counts < max(min_periods, 2))] = np.nan
+    volatility = np.sqrt(np.clip(variance, 0, None))
+    if annualize:
+        volatility *= np.sqrt(TRADING_DAYS)
+    return volatility
+
+
+def max_drawdown_array(values):
+    """
+    Computes the maximum peak-to-trough decline of each price column.
+
+    Args:
+        values (np.ndarray): Prices shaped (dates, symbols)
+
+    Returns:
+        np.ndarray: Maximum drawdown per symbol as a negative fraction (NaN if no data)
+    """
+    filled = forward_fill(values)
+    running_peak = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = filled / running_peak - 1
+    return np.fmin.reduce(drawdowns, axis=0)
+
+
+def beta_correlation_array(returns, benchmark_returns, min_periods=60):
+    """
+    Computes beta and correlation of every column against one benchmark series.
+
+    Only dates where both the symbol and the benchmark have a return are used,
+    so symbols with shorter histories are compared over their own lifetime.
+
+    Args:
+        returns (np.ndarray): Daily returns shaped (dates, symbols)
+        benchmark_returns (np.ndarray): Benchmark daily returns shaped (dates,)
+        min_periods (int): Minimum overlapping observations required
+
+    Returns:
+        tuple: (beta, correlation) arrays shaped (symbols,)
+    """
+    bench = benchmark_returns[:, None]
+    mask = ~np.isnan(returns) & ~np.isnan(bench)
+    n = mask.sum(axis=0).astype(np.float64)
+
+    x = np.where(mask, returns, 0.0)
+    b = np.where(mask, bench, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = x.sum(axis=0) / n
+        mean_b = b.sum(axis=0) / n
+        cov = (x * b).sum(axis=0) / n - mean_x * mean_b
+        var_x = (x * x).sum(axis=0) / n - mean_x * mean_x
+        var_b = (b * b).sum(axis=0) / n - mean_b * mean_b
+        beta = cov / var_b
+        correlation = cov / np.sqrt(var_x * var_b)
+
+    too_short = n < min_periods
+    beta[too_short] = np.nan
+    correlation[too_short] = np.nan
+    return beta, correlation
+
+
+def rolling_excess_return_array(values, benchmark_values, window=TRADING_DAYS):
+    """
+    Computes the trailing-window compounded return of each column minus the benchmark's.
+
+    Args:
+        values (np.ndarray): Prices shaped (dates, symbols)
+        benchmark_values (np.ndarray): Benchmark prices shaped (dates,)
+        window (int): Window length in trading days
+
+    Returns:
+        np.ndarray: Excess return shaped (dates, symbols), NaN for the first window rows
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_prices = np.log(forward_fill(values))
+        log_bench = np.log(forward_fill(benchmark_values[:, None]))
+
+    excess = np.full_like(values, np.nan)
+    stock_return = np.expm1(log_prices[window:] - log_prices[:-window])
+    bench_return = np.expm1(log_bench[window:] - log_bench[:-window])
+    excess[window:] = stock_return - bench_return
+    return excess
+
+
+def rolling_volatility(prices, window=63, annualize=True):
+    # DataFrame wrapper around rolling_volatility_array
+    prices, values = _as_matrix(prices)
+    volatility = rolling_volatility_array(simple_returns(values), window, annualize)
+    return pd.DataFrame(volatility, index=prices.index, columns=prices.columns)
+
+
+def max_drawdown(prices):
+    # Series wrapper around max_drawdown_array
+    prices, values = _as_matrix(prices)
+    return pd.Series(max_drawdown_array(values), index=prices.columns, name='Max Drawdown')
+
+
+def rolling_excess_return(prices, benchmark, window=TRADING_DAYS):
+    # DataFrame wrapper around rolling_excess_return_array
+    prices, values = _as_matrix(prices)
+    bench = np.asarray(pd.Series(benchmark).reindex(prices.index), dtype=np.float64)
+    excess = rolling_excess_return_array(values, bench, window)
+    return pd.DataFrame(excess, index=prices.index, columns=prices.columns)
+
+
+def compute_risk_metrics(prices, benchmarks=('SPY', 'VTI'), volatility_window=63,
+                         excess_window=TRADING_DAYS, block_size=1000):
+    """
+    Computes a risk and return summary for every symbol in an aligned price matrix.
+
+    The benchmark columns must be present in the matrix (as returned by
+    download_close_matrix). Symbols are processed in column blocks so memory
+    stays bounded for very large universes; each block is fully vectorized.
+
+    Args:
+        prices (pd.DataFrame): Close prices, dates x symbols
+        benchmarks (tuple): Benchmark columns to compare against
+        volatility_window (int): Rolling volatility window in trading days
+        excess_window (int): Rolling excess-return window in trading days
+        block_size (int): Number of symbols processed per vectorized block
+
+    Returns:
+        pd.DataFrame: One row per symbol with volatility, drawdown, beta,
+        correlation and latest rolling excess return per benchmark
+    """
+    prices = prices.sort_index()
+    missing = [b for b in benchmarks if b not in prices.columns]
+    if missing:
+        raise ValueError(f"Benchmark columns missing from price matrix: {', '.join(missing)}")
+
+    bench_values = {b: prices[b].to_numpy(dtype=float, na_value=np.nan) for b in benchmarks}
+    bench_returns = {b: simple_returns(v[:, None])[:, 0] for b, v in bench_values.items()}
+
+    frames = []
+    for start in range(0, prices.shape[1], block_size):
+        block = prices.iloc[:, start:start + block_size]
+        values = block.to_numpy(dtype=float, na_value=np.nan)
+        returns = simple_returns(values)
+
+        volatility = rolling_volatility_array(returns, volatility_window)
+        summary = {
+            'Volatility (Latest)': forward_fill(volatility)[-1],
+            'Volatility (Full Period)': np.nanstd(returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+            if returns.shape[0] > 2 else np.full(values.shape[1], np.nan),
+            'Max Drawdown': max_drawdown_array(values),
+        }
+        for bench in benchmarks:
+            beta, correlation = beta_correlation_array(returns, bench_returns[bench])
+            excess = rolling_excess_return_array(values, bench_values[bench], excess_window)
+            summary[f'Beta vs {bench}'] = beta
+            summary[f'Correlation vs {bench}'] = correlation
+            summary[f'Excess Return vs {bench}'] = excess[-1] if len(excess) else np.nan
+
+        frames.append(pd.DataFrame(summary, index=block.columns))
+
+    return pd.concat(frames) if frames else pd.DataFrame()
@@ -0,0 +1,211 @@
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from fetch_scheduler import with_context
+
+
+@dataclass
+class Section:
+    """
+    One dashboard section: the StockAnalysis method it runs and what it needs.
+
+    inputs are dataset names passed to StockAnalysis.fetch, requires are
+    sections whose outputs (instance attributes) this section reads, and
+    outputs are the attributes this section sets. Interactive sections ask
+    for input() and always run on the main thread.
+    """
+    name: str
+    method: str
+    inputs: tuple = ()
+    requires: tuple = ()
+    outputs: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    header: str = None
+    subheader: str = None
+    interactive: bool = False
+
+
+# Dashboard sections in display order (same order and headers as the original script)
+SECTIONS = [
+    Section('basic_info', 'display_basic_info', inputs=('info', 'cashflow'), header='BASIC INFORMATION'),
+    Section('principles', 'remind_fundamental_principle', header='BASIC INFORMATION'),
+    Section('stock_info', 'display_stock_info', inputs=('info',)),
+    Section('annual_performance', 'compare_annual_performance',
+            header='PERFORMANCE METRICS', subheader='Annual Performance'),
+    Section('roic', 'analyze_roic', inputs=('financials', 'balance_sheet'), outputs=('avg_roic_growth',),
+            header='BUSINESS VALUATION METRICS', subheader='ROIC Analysis'),
+    Section('equity_growth', 'analyze_equity_growth', inputs=('balance_sheet_pretty',),
+            outputs=('avg_equity_growth',), subheader='Equity Growth'),
+    Section('earnings_growth', 'eps_growth_rate', inputs=('financials',),
+            outputs=('avg_earnings_growth',), subheader='Earnings Growth'),
+    Section('sales_growth', 'sales_growth_rate', inputs=('income_stmt',),
+            outputs=('avg_sales_growth',), subheader='Sales Growth'),
+    Section('fcf_growth', 'free_cash_flow_growth_rate', inputs=('cashflow',),
+            outputs=('avg_fcf_growth',), subheader='Free Cash Flow Growth'),
+    Section('growth_summary', 'print_growth_metrics_summary',
+            requires=('roic', 'equity_growth', 'earnings_growth', 'sales_growth', 'fcf_growth')),
+    Section('pe_yield', 'display_pe_and_earnings_yield', inputs=('info', 'bond_yield'),
+            outputs=('breakeven_price',), header='VALUATION METRICS', subheader='PE and Earnings Yield'),
+    Section('margin_of_safety', 'get_margin_of_safety', inputs=('info', 'bond_yield'), outputs=('bond_yield',)),
+    Section('ebit', 'get_ebit_stock', inputs=('financials',), header='FINANCIAL ANALYSIS', subheader='EBIT Analysis'),
+    Section('profit_factors', 'analyze_profit_factors', header='PROFIT REDUCTION ANALYSIS'),
+    Section('dcf', 'calculate_dcf', inputs=('cashflow', 'info'),
+            outputs=('dcf_years', 'dcf_growth', 'dcf_discount', 'dcf_terminal'),
+            kwargs={'years': 10, 'growth_rate': 0.05, 'discount_rate': 0.12, 'terminal_growth': 0.02},
+            header='DCF VALUATION', interactive=True),
+    Section('amzn_dcf', 'calculate_amzn_dcf', inputs=('cashflow', 'info'), requires=('dcf',)),
+    Section('market_cap', 'calculate_market_cap_at_price', inputs=('info', 'bond_yield'),
+            header='MARKET CAP ANALYSIS', interactive=True),
+]
+
+
+class ThreadLocalStdout:
+    # sys.stdout stand-in that sends a thread's prints to its own buffer while
+    # local.buffer is set, and to the wrapped stream otherwise
+    def __init__(self, target):
+        self.target = target
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (self.target if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(self.local, 'buffer', None) is None:
+            self.target.flush()
+
+
+class SectionExecutor:
+    """
+    Runs dashboard sections as a dependency graph.
+
+    Only the requested sections and the sections they require are run. The
+    datasets they declare are fetched up front, each exactly once and in
+    parallel, then independent sections run concurrently on a thread pool.
+    Each section's printed output is buffered and written in display order,
+    so the dashboard reads the same as a sequential run.
+    """
+
+    def __init__(self, analysis, sections=None, max_workers=4, print_header=None, print_subheader=None):
+        self.analysis = analysis
+        self.sections = {section.name: section for section in (sections or SECTIONS)}
+        self.max_workers = max_workers
+        self.print_header = print_header
+        self.print_subheader = print_subheader
+
+    def plan(self, names=None):
+        """
+        Returns the sections needed for the requested names, in display order.
+
+        Args:
+            names (list): Section names (default: every section)
+
+        Returns:
+            list: Section objects including all transitive requirements
+        """
+        if names is None:
+            return list(self.sections.values())
+
+        needed = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self.sections:
+                raise KeyError(f"Unknown section: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.sections[name].requires)
+        return [section for section in self.sections.values() if section.name in needed]
+
+    def _inline(self, plan):
+        # Sections that must run on the main thread: interactive ones and anything after them
+        inline = set()
+        for section in plan:
+            if section.interactive or any(r in inline for r in section.requires):
+                inline.add(section.name)
+        return inline
+
+    def prefetch(self, plan):
+        datasets = list(dict.fromkeys(d for section in plan for d in section.inputs))
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            # Workers keep the caller's fetch_priority
+            list(pool.map(with_context(self._prefetch_one), datasets))
+        return datasets
+
+    def _prefetch_one(self, dataset):
+        # A failed fetch is left for the section itself to report
+        try:
+            self.analysis.fetch(dataset)
+        except Exception as e:
+            print(f"Error fetching {dataset}: {e}")
+
+    def _print_headers(self, section):
+        if section.header and self.print_header:
+            self.print_header(section.header)
+        if section.subheader and self.print_subheader:
+            self.print_subheader(section.subheader)
+
+    def _call(self, section, params):
+        kwargs = {**section.kwargs, **params.get(section.name, {})}
+        self._print_headers(section)
+        return getattr(self.analysis, section.method)(**kwargs)
+
+    def _run_buffered(self, section, params, dependencies, stdout):
+        for dependency in dependencies:
+            dependency.result()
+        previous = getattr(stdout.local, 'buffer', None)
+        stdout.local.buffer = io.StringIO()
+        try:
+            return self._call(section, params), stdout.local.buffer.getvalue()
+        finally:
+            stdout.local.buffer = previous
+
+    def run(self, names=None, params=None):
+        """
+        Runs the requested sections and returns their return values.
+
+        Args:
+            names (list): Section names (default: every section)
+            params (dict): Section name -> keyword arguments overriding Section.kwargs
+
+        Returns:
+            dict: Section name -> value returned by its method
+        """
+        params = params or {}
+        plan = self.plan(names)
+        inline = self._inline(plan)
+        self.prefetch(plan)
+
+        # Reuse an already installed ThreadLocalStdout (e.g. inside the analysis
+        # service) so output still lands in the calling thread's buffer
+        real_stdout = sys.stdout
+        if isinstance(real_stdout, ThreadLocalStdout):
+            stdout = real_stdout
+        else:
+            stdout = ThreadLocalStdout(real_stdout)
+            sys.stdout = stdout
+
+        results = {}
+        try:
+            futures = {}
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                for section in plan:
+                    if section.name in inline:
+                        continue
+                    dependencies = [futures[r] for r in section.requires if r in futures]
+                    futures[section.name] = pool.submit(with_context(self._run_buffered), section, params,
+                                                        dependencies, stdout)
+
+                for section in plan:
+                    if section.name in inline:
+                        results[section.name] = self._call(section, params)
+                    else:
+                        value, output = futures[section.name].result()
+                        stdout.write(output)
+                        results[section.name] = value
+        finally:
+            sys.stdout = real_stdout
+        return results
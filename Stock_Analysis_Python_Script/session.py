@@ -0,0 +1,258 @@
+import argparse
+import cmd
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from dcf_model import dcf_present_value
+from fetch_scheduler import with_context
+from metrics import DCF_DEFAULTS, classify_growth
+from portfolio import GROWTH_FIELDS, _attempt
+from section_graph import SECTIONS, SectionExecutor
+from StockAnalysis import StockAnalysis, print_section_header, print_subsection_header
+from valuation_ladder import ladder_inputs, valuation_ladder
+
+# dcf command keywords -> DCF_DEFAULTS parameter
+DCF_KEYWORDS = {'growth': 'growth_rate', 'discount': 'discount_rate', 'terminal': 'terminal_growth', 'years': 'years'}
+
+
+def _number(text):
+    # '8%' -> 0.08, '0.08' -> 0.08, '150' -> 150.0
+    text = text.strip()
+    return float(text[:-1]) / 100 if text.endswith('%') else float(text)
+
+
+def _split(arg):
+    # Positional words and key=value pairs of a command line
+    words, options = [], {}
+    for token in arg.split():
+        if '=' in token:
+            key, value = token.split('=', 1)
+            options[key.lower()] = value
+        else:
+            words.append(token)
+    return words, options
+
+
+class AnalysisSession(cmd.Cmd):
+    """
+    Interactive session that keeps tickers loaded between queries.
+
+    Each ticker's StockAnalysis, the inputs of the price and DCF what-ifs
+    (valuation ladder row, starting FCF, shares) and its derived metrics are
+    built once when it is added. Follow-up queries are arithmetic on those
+    cached inputs, so a new target price or new DCF rates answer without
+    any provider request; dashboard sections run on the already loaded data.
+    """
+
+    intro = "Stock analysis session. Type 'help' for commands, 'quit' to exit."
+    prompt = "(stocks) "
+
+    def __init__(self, tickers=(), snapshot=None, cache=None, max_workers=8, **kwargs):
+        super().__init__(**kwargs)
+        self.snapshot = snapshot
+        self.cache = cache
+        self.max_workers = max_workers
+        self.analyses = {}
+        self.ladder = pd.DataFrame()
+        self.dcf_inputs = {}
+        self.metrics = {}
+        self.bond_yield = None
+        self.current = None
+        self._started = None
+        if tickers:
+            self.load(tickers)
+
+    def load(self, tickers):
+        """
+        Loads tickers (in parallel) and caches everything the what-if queries need.
+
+        Args:
+            tickers (list): Ticker symbols; already loaded ones are skipped
+        """
+        new = [t.upper() for t in tickers if t.upper() not in self.analyses]
+        analyses = {ticker: StockAnalysis(ticker, snapshot=self.snapshot) for ticker in new}
+
+        def warm(analysis):
+            analysis.fetch('info')
+            analysis.get_statements()
+            return analysis.compute_derived_metrics(self.cache)
+
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            results = dict(zip(analyses, pool.map(with_context(lambda a: _attempt(warm, a)), analyses.values())))
+
+        for ticker, (metrics, error) in results.items():
+            if error is not None:
+                print(f"Could not load {ticker}: {error}")
+                continue
+            analysis = analyses[ticker]
+            self.analyses[ticker] = analysis
+            self.metrics[ticker] = metrics
+            self.dcf_inputs[ticker] = analysis.get_dcf_inputs()
+            self.ladder = pd.concat([self.ladder.drop(ticker, errors='ignore'),
+                                     ladder_inputs({ticker: analysis.fetch('info')})])
+            self.current = ticker
+
+        if self.bond_yield is None and self.analyses:
+            self.bond_yield = next(iter(self.analyses.values())).get_bond_yield()
+
+    def _ticker(self, words):
+        # Ticker named on the command line (if loaded) or the current one
+        for word in words:
+            if word.upper() in self.analyses:
+                words.remove(word)
+                return word.upper()
+        if self.current is None:
+            raise ValueError("No ticker loaded; use 'add TICKER' first")
+        return self.current
+
+    # Timing of every query
+    def precmd(self, line):
+        self._started = time.perf_counter()
+        return line
+
+    def postcmd(self, stop, line):
+        if line.strip() and not stop:
+            print(f"[{(time.perf_counter() - self._started) * 1000:.1f} ms]")
+        return stop
+
+    def onecmd(self, line):
+        try:
+            return super().onecmd(line)
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}")
+            return False
+
+    def emptyline(self):
+        # Do not repeat the last command on an empty line
+        return False
+
+    def do_add(self, arg):
+        """add TICKER [TICKER ...]: load tickers and make the last one current"""
+        words, _ = _split(arg)
+        if not words:
+            raise ValueError("usage: add TICKER [TICKER ...]")
+        self.load(words)
+        self.do_list('')
+
+    def do_use(self, arg):
+        """use TICKER: make a loaded ticker current"""
+        ticker = arg.strip().upper()
+        if ticker not in self.analyses:
+            raise ValueError(f"{ticker} is not loaded; use 'add {ticker}'")
+        self.current = ticker
+
+    def do_list(self, arg):
+        """list: loaded tickers with their current price"""
+        for ticker, row in self.ladder.iterrows():
+            marker = '*' if ticker == self.current else ' '
+            print(f"{marker} {ticker:<8} ${row['currentPrice']:>10,.2f}")
+        if self.bond_yield is not None:
+            print(f"  Bond yield: {self.bond_yield:.2f}%")
+
+    def do_bond(self, arg):
+        """bond YIELD: override the 10-year Treasury yield (%) used by the what-ifs"""
+        self.bond_yield = float(arg.strip().rstrip('%'))
+
+    def do_price(self, arg):
+        """price PRICE|CHANGE% [TICKER]: market cap analysis at a target price (e.g. 'price 150', 'price -10%')"""
+        words, _ = _split(arg)
+        ticker = self._ticker(words)
+        if not words:
+            raise ValueError("usage: price PRICE|CHANGE% [TICKER]")
+        inputs = self.ladder.loc[[ticker]]
+        current = inputs['currentPrice'].iloc[0]
+        change = _number(words[0]) if words[0].endswith('%') else float(words[0]) / current - 1
+
+        # A one-point ladder is exactly the calculate_market_cap_at_price arithmetic at that price
+        row = valuation_ladder(inputs, self.bond_yield, points=1, low=change, high=change).iloc[0]
+        print(f"\n{ticker} at ${row['Price']:,.2f} ({change:+.1%} vs ${current:,.2f})")
+        print(f"{'Market Cap':<22} | ${row['Market Cap'] / 1e9:>10,.2f}B")
+        print(f"{'P/E Ratio':<22} | {row['P/E Ratio']:>10.2f}x")
+        print(f"{'Earnings Yield':<22} | {row['Earnings Yield (%)']:>10.2f}%")
+        print(f"{'Total Yield':<22} | {row['Total Yield (%)']:>10.2f}%")
+        print(f"{'Yield Spread vs Bond':<22} | {row['Yield Spread (%)']:>10.2f}%")
+        print(f"{'Breakeven Price':<22} | ${row['Breakeven Price']:>10,.2f}")
+        print(f"{'Margin of Safety':<22} | {row['Margin of Safety (%)']:>10.2f}%")
+
+        fair_value = self.metrics[ticker].get('dcf_fair_value')
+        if fair_value:
+            print(f"{'DCF Margin of Safety':<22} | {(fair_value - row['Price']) / fair_value * 100:>10.2f}%")
+
+    def do_dcf(self, arg):
+        """dcf [growth=5%] [discount=12%] [terminal=2%] [years=10] [TICKER]: DCF fair value with new inputs"""
+        words, options = _split(arg)
+        ticker = self._ticker(words)
+        unknown = set(options) - set(DCF_KEYWORDS)
+        if unknown:
+            raise ValueError(f"unknown DCF inputs: {', '.join(sorted(unknown))}")
+        params = {**DCF_DEFAULTS, **{DCF_KEYWORDS[k]: _number(v) for k, v in options.items()}}
+        params['years'] = int(params['years'])
+
+        inputs = self.dcf_inputs.get(ticker)
+        if inputs is None:
+            raise ValueError(f"No DCF inputs (free cash flow, shares, price) for {ticker}")
+        total_pv = float(dcf_present_value(inputs['Free Cash Flow'], params['growth_rate'],
+                                           params['discount_rate'], params['terminal_growth'], params['years']))
+        fair_value = total_pv / inputs['Shares Outstanding']
+        price = inputs['Current Price']
+
+        print(f"\n{ticker} DCF: growth {params['growth_rate']:.1%}, discount {params['discount_rate']:.1%}, "
+              f"terminal {params['terminal_growth']:.1%}, {params['years']} years")
+        print(f"{'Starting FCF':<22} | ${inputs['Free Cash Flow']:>16,.0f}")
+        print(f"{'Present Value':<22} | ${total_pv:>16,.0f}")
+        print(f"{'Fair Value / Share':<22} | ${fair_value:>16,.2f}")
+        print(f"{'Current Price':<22} | ${price:>16,.2f}")
+        print(f"{'Margin of Safety':<22} | {(fair_value - price) / fair_value * 100:>16.1f}%")
+
+    def do_metrics(self, arg):
+        """metrics [TICKER]: cached growth averages and DCF value"""
+        words, _ = _split(arg)
+        ticker = self._ticker(words)
+        metrics = self.metrics[ticker]
+        print(f"\n{ticker}")
+        for name, label in GROWTH_FIELDS.items():
+            value = metrics.get(name)
+            shown = f"{value:>8.2f}%" if value is not None else f"{'N/A':>9}"
+            print(f"{label:<22} | {shown} | {classify_growth(value)}")
+        if metrics.get('dcf_fair_value'):
+            print(f"{'DCF Fair Value':<22} | ${metrics['dcf_fair_value']:>8,.2f}")
+
+    def do_section(self, arg):
+        """section NAME [NAME ...] [TICKER]: run dashboard sections on the loaded data"""
+        words, _ = _split(arg)
+        ticker = self._ticker(words)
+        names = {section.name for section in SECTIONS}
+        unknown = [w for w in words if w not in names]
+        if not words or unknown:
+            raise ValueError(f"sections: {', '.join(section.name for section in SECTIONS)}")
+        SectionExecutor(self.analyses[ticker], print_header=print_section_header,
+                        print_subheader=print_subsection_header).run(words)
+
+    def do_refresh(self, arg):
+        """refresh [TICKER]: drop a ticker's cached data and load it again"""
+        words, _ = _split(arg)
+        ticker = self._ticker(words)
+        for store in (self.analyses, self.metrics, self.dcf_inputs):
+            store.pop(ticker, None)
+        self.load([ticker])
+
+    def do_quit(self, arg):
+        """quit: leave the session"""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, arg):
+        print()
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interactive what-if session over preloaded tickers")
+    parser.add_argument('tickers', nargs='*')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    AnalysisSession(args.tickers, max_workers=args.workers).cmdloop()
@@ -0,0 +1,353 @@
+import json
+import math
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from fetch_scheduler import REFRESH, fetch_priority
+from fundamentals import STATEMENT_DATASETS
+from universe_snapshot import SnapshotTicker
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    ticker     TEXT NOT NULL,
+    dataset    TEXT NOT NULL,
+    field      TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    value      REAL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (ticker, dataset, field, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS statements_ticker_field_period ON statements (ticker, field, period);
+CREATE INDEX IF NOT EXISTS statements_field_period ON statements (field, period);
+
+CREATE TABLE IF NOT EXISTS info_snapshots (
+    ticker TEXT NOT NULL,
+    as_of  TEXT NOT NULL,
+    info   TEXT NOT NULL,
+    PRIMARY KEY (ticker, as_of)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS metrics (
+    ticker      TEXT NOT NULL,
+    metric      TEXT NOT NULL,
+    period      TEXT NOT NULL,
+    value       REAL,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (ticker, metric, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_metric_period ON metrics (metric, period);
+"""
+
+# Period used for metrics that are a single number rather than one value per year
+LATEST = ''
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _number(value):
+    # SQLite REAL or NULL; NaN and non-numeric values are stored as NULL
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def statement_rows(ticker, dataset, statement, updated_at=None):
+    """
+    Flattens a yfinance statement (fields x dates) into statements table rows.
+
+    Args:
+        ticker (str): Ticker symbol
+        dataset (str): StockAnalysis dataset name (e.g. 'cashflow')
+        statement (pd.DataFrame): Statement as returned by yfinance
+        updated_at (str): Timestamp stored with every row (default: now)
+
+    Returns:
+        list: (ticker, dataset, field, period, value, updated_at) tuples
+    """
+    if statement is None or statement.empty:
+        return []
+    updated_at = updated_at or _now()
+    values = statement.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    n_fields, n_periods = values.shape
+    fields = np.repeat(statement.index.astype(str).to_numpy(dtype=object), n_periods)
+    periods = np.tile(pd.to_datetime(statement.columns).strftime('%Y-%m-%d').to_numpy(dtype=object), n_fields)
+    cells = values.ravel().astype(object)
+    cells[~np.isfinite(values.ravel())] = None
+    return [(ticker, dataset, field, period, value, updated_at)
+            for field, period, value in zip(fields, periods, cells)]
+
+
+def metric_rows(ticker, metrics, computed_at=None):
+    """
+    Flattens a derived-metrics dict into metrics table rows.
+
+    Scalars are stored under the LATEST period; dicts keyed by year (such as
+    'roic') get one row per year. Anything non-numeric is skipped.
+
+    Args:
+        ticker (str): Ticker symbol
+        metrics (dict): Output of StockAnalysis.compute_derived_metrics or derive_metrics
+        computed_at (str): Timestamp stored with every row (default: now)
+
+    Returns:
+        list: (ticker, metric, period, value, computed_at) tuples
+    """
+    computed_at = computed_at or _now()
+    rows = []
+    for metric, value in metrics.items():
+        if isinstance(value, dict):
+            rows.extend((ticker, metric, str(period), _number(v), computed_at) for period, v in value.items())
+        elif value is None or isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            rows.append((ticker, metric, LATEST, _number(value), computed_at))
+    return rows
+
+
+class SQLiteStore:
+    """
+    SQLite storage for statements, info snapshots and computed metrics.
+
+    Statements are kept in long form (one row per ticker, dataset, field and
+    period) with indexes on (ticker, field, period) and (field, period), so a
+    point lookup for one ticker and a cross-section of every ticker for one
+    field in one year are both index range scans. Writes go through batched
+    executemany upserts, each batch inside a single transaction.
+
+    Also provides ticker()/covers() so StockAnalysis(ticker, snapshot=store)
+    can run from the stored statements and latest info snapshot.
+    """
+
+    # No stored Treasury yield or prices; StockAnalysis falls back to fetching them
+    bond_yield = None
+
+    def __init__(self, path='fundamentals.db', batch_size=50000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _upsert(self, sql, rows):
+        # One transaction per batch keeps memory bounded and avoids per-row commits
+        rows = list(rows)
+        for start in range(0, len(rows), self.batch_size):
+            with self.connection:
+                self.connection.executemany(sql, rows[start:start + self.batch_size])
+        return len(rows)
+
+    def upsert_statement_rows(self, rows):
+        """
+        Inserts or updates statement rows in batched transactions.
+
+        Args:
+            rows (iterable): (ticker, dataset, field, period, value, updated_at) tuples
+
+        Returns:
+            int: Number of rows written
+        """
+        return self._upsert(
+            "INSERT INTO statements (ticker, dataset, field, period, value, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (ticker, dataset, field, period) "
+            "DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            rows,
+        )
+
+    def upsert_statement(self, ticker, dataset, statement):
+        return self.upsert_statement_rows(statement_rows(ticker, dataset, statement))
+
+    def upsert_info(self, ticker, info, as_of=None):
+        # One snapshot per (ticker, as_of); storing again on the same day replaces it
+        return self.upsert_info_rows([(ticker, as_of or _today(), json.dumps(info, default=str))])
+
+    def upsert_info_rows(self, rows):
+        return self._upsert(
+            "INSERT INTO info_snapshots (ticker, as_of, info) VALUES (?, ?, ?) "
+            "ON CONFLICT (ticker, as_of) DO UPDATE SET info = excluded.info",
+            rows,
+        )
+
+    def upsert_metrics(self, ticker, metrics):
+        return self.upsert_metric_rows(metric_rows(ticker, metrics))
+
+    def upsert_metric_rows(self, rows):
+        return self._upsert(
+            "INSERT INTO metrics (ticker, metric, period, value, computed_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (ticker, metric, period) "
+            "DO UPDATE SET value = excluded.value, computed_at = excluded.computed_at",
+            rows,
+        )
+
+    def store_analyses(self, analyses, metrics=None, as_of=None, priority=REFRESH):
+        """
+        Saves the statements and info of many StockAnalysis objects in one pass.
+
+        Args:
+            analyses (list): StockAnalysis objects (their datasets are fetched if needed)
+            metrics (dict): Optional ticker -> derived metrics dict to store as well
+            as_of (str): Date stamp for the info snapshots (default: today)
+            priority (int): Fetch scheduler priority for any datasets not loaded yet
+
+        Returns:
+            int: Number of statement rows written
+        """
+        updated_at, as_of = _now(), as_of or _today()
+        rows, info_rows, computed = [], [], []
+        with fetch_priority(priority):
+            for analysis in analyses:
+                info_rows.append((analysis.ticker_symbol, as_of, json.dumps(analysis.fetch('info'), default=str)))
+                for dataset in STATEMENT_DATASETS:
+                    rows.extend(statement_rows(analysis.ticker_symbol, dataset, analysis.fetch(dataset), updated_at))
+        for ticker, values in (metrics or {}).items():
+            computed.extend(metric_rows(ticker, values, updated_at))
+
+        self.upsert_info_rows(info_rows)
+        self.upsert_metric_rows(computed)
+        return self.upsert_statement_rows(rows)
+
+    def statement(self, ticker, dataset):
+        """
+        Rebuilds one stored statement in yfinance layout (fields x dates, newest first).
+
+        Args:
+            ticker (str): Ticker symbol
+            dataset (str): StockAnalysis dataset name
+
+        Returns:
+            pd.DataFrame: The statement (empty if nothing is stored)
+        """
+        rows = pd.read_sql_query(
+            "SELECT field, period, value FROM statements WHERE ticker = ? AND dataset = ?",
+            self.connection, params=(ticker, dataset),
+        )
+        if rows.empty:
+            return pd.DataFrame()
+        statement = rows.pivot(index='field', columns='period', values='value')
+        statement.columns = pd.to_datetime(statement.columns)
+        statement.columns.name = None
+        statement.index.name = None
+        return statement[sorted(statement.columns, reverse=True)]
+
+    def statement_cells(self, ticker, dataset):
+        # One stored statement as {(field, period): value}, the form change_feed diffs against
+        rows = self.connection.execute(
+            "SELECT field, period, value FROM statements WHERE ticker = ? AND dataset = ?", (ticker, dataset),
+        )
+        return {(field, period): value for field, period, value in rows}
+
+    def field_history(self, ticker, field):
+        # One ticker's values for a field across periods (served by the ticker/field/period index)
+        rows = self.connection.execute(
+            "SELECT period, value FROM statements WHERE ticker = ? AND field = ? ORDER BY period",
+            (ticker, field),
+        ).fetchall()
+        return pd.Series({pd.Timestamp(period): value for period, value in rows}, dtype=float, name=field)
+
+    def field_values(self, field, year=None, dataset=None):
+        """
+        Cross-section of every ticker's value for a field, optionally for one fiscal year.
+
+        The year filter is a period range rather than a function of period,
+        so the (field, period) index is used for it.
+
+        Args:
+            field (str): Statement field (e.g. 'Free Cash Flow')
+            year (int): Calendar year of the period end date
+            dataset (str): Restrict to one dataset when a field appears in several
+
+        Returns:
+            pd.DataFrame: Columns ticker, dataset, period and value
+        """
+        sql = "SELECT ticker, dataset, period, value FROM statements WHERE field = ?"
+        params = [field]
+        if year is not None:
+            sql += " AND period >= ? AND period < ?"
+            params += [f"{int(year):04d}-01-01", f"{int(year) + 1:04d}-01-01"]
+        if dataset is not None:
+            sql += " AND dataset = ?"
+            params.append(dataset)
+        return pd.read_sql_query(sql + " ORDER BY ticker, period", self.connection, params=params)
+
+    def info(self, ticker, as_of=None):
+        # Latest info snapshot on or before as_of (or the latest overall), or None
+        sql = "SELECT info FROM info_snapshots WHERE ticker = ?"
+        params = [ticker]
+        if as_of is not None:
+            sql += " AND as_of <= ?"
+            params.append(str(as_of))
+        row = self.connection.execute(sql + " ORDER BY as_of DESC LIMIT 1", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def metric_values(self, metric, period=LATEST):
+        # Every ticker's stored value for a metric (Series indexed by ticker)
+        rows = self.connection.execute(
+            "SELECT ticker, value FROM metrics WHERE metric = ? AND period = ? ORDER BY ticker",
+            (metric, str(period)),
+        ).fetchall()
+        return pd.Series(dict(rows), dtype=float, name=metric)
+
+    def latest_metric_values(self, metric):
+        # Every ticker's value for a per-period metric (e.g. 'roic') in its most recent period
+        rows = self.connection.execute(
+            "SELECT ticker, value FROM metrics AS m WHERE metric = ? AND period = "
+            "(SELECT MAX(period) FROM metrics WHERE ticker = m.ticker AND metric = m.metric) ORDER BY ticker",
+            (metric,),
+        ).fetchall()
+        return pd.Series(dict(rows), dtype=float, name=metric)
+
+    def info_fields(self, fields):
+        """
+        Selected info fields of every ticker's latest snapshot, extracted in SQL.
+
+        Args:
+            fields (list): Info keys (e.g. ['sector', 'industry'])
+
+        Returns:
+            pd.DataFrame: One row per ticker, one column per field
+        """
+        columns = ', '.join(f"json_extract(info, '$.{field}') AS \"{field}\"" for field in fields)
+        return pd.read_sql_query(
+            f"SELECT ticker, {columns} FROM info_snapshots AS s "
+            "WHERE as_of = (SELECT MAX(as_of) FROM info_snapshots WHERE ticker = s.ticker) ORDER BY ticker",
+            self.connection,
+        ).set_index('ticker')
+
+    def metrics(self, ticker):
+        # All stored metrics for one ticker as {metric: value or {period: value}}
+        results = {}
+        for metric, period, value in self.connection.execute(
+            "SELECT metric, period, value FROM metrics WHERE ticker = ? ORDER BY metric, period", (ticker,)
+        ):
+            if period == LATEST:
+                results[metric] = value
+            else:
+                results.setdefault(metric, {})[period] = value
+        return results
+
+    def ticker(self, symbol):
+        if self.info(symbol) is None:
+            raise KeyError(f"{symbol} is not in store {self.path}")
+        return SnapshotTicker(self, symbol)
+
+    def covers(self, symbols):
+        return False
@@ -0,0 +1,257 @@
+import json
+import struct
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from fundamentals import STATEMENT_DATASETS
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pyarrow is only needed for snapshots
+    pa = None
+
+# File layout: MAGIC, 8-byte header length, JSON header, then one Arrow IPC file per table
+MAGIC = b'STKSNAP1'
+SNAPSHOT_VERSION = 1
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Universe snapshots require pyarrow: pip install pyarrow")
+
+
+def _ipc_bytes(table, compression):
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _statement_rows(ticker, dataset, statement):
+    # Long rows (ticker, dataset, field, period, value) preserving field order
+    if statement is None or statement.empty:
+        return None
+    values = statement.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    n_fields, n_periods = values.shape
+    return {
+        'ticker': np.full(values.size, ticker, dtype=object),
+        'dataset': np.full(values.size, dataset, dtype=object),
+        'field': np.repeat(statement.index.astype(str).to_numpy(dtype=object), n_periods),
+        'period': np.tile(pd.to_datetime(statement.columns).to_numpy(dtype='datetime64[ns]'), n_fields),
+        'value': values.ravel(),
+    }
+
+
+def export_snapshot(path, analyses, prices=None, bond_yield=None, compression='zstd'):
+    """
+    Packs the fundamentals, info and prices for a universe into one snapshot file.
+
+    Args:
+        path (str): Output file
+        analyses (list): StockAnalysis objects (their datasets are fetched if needed)
+        prices (pd.DataFrame): Optional close-price matrix, dates x symbols
+        bond_yield (float): 10-year Treasury yield to store (default: fetched once)
+        compression (str): Arrow IPC buffer compression ('zstd', 'lz4' or None)
+
+    Returns:
+        str: The path written
+    """
+    _require_pyarrow()
+
+    frames, infos = [], {}
+    for analysis in sorted(analyses, key=lambda a: a.ticker_symbol):
+        infos[analysis.ticker_symbol] = json.dumps(analysis.fetch('info'), default=str)
+        for dataset in STATEMENT_DATASETS:
+            rows = _statement_rows(analysis.ticker_symbol, dataset, analysis.fetch(dataset))
+            if rows is not None:
+                frames.append(rows)
+
+    if bond_yield is None and analyses:
+        bond_yield = analyses[0].get_bond_yield()
+
+    # Rows are grouped by ticker so each ticker is a contiguous, zero-copy slice
+    ticker_rows, position = {}, 0
+    for rows in frames:
+        ticker = rows['ticker'][0]
+        start = ticker_rows.get(ticker, [position])[0]
+        position += len(rows['value'])
+        ticker_rows[ticker] = [start, position]
+
+    columns = ['ticker', 'dataset', 'field', 'period', 'value']
+    if frames:
+        arrays = {c: np.concatenate([rows[c] for rows in frames]) for c in columns}
+    else:
+        arrays = {c: np.array([], dtype=object) for c in columns[:3]}
+        arrays.update(period=np.array([], dtype='datetime64[ns]'), value=np.array([], dtype=np.float64))
+    statements_table = pa.table({
+        'ticker': pa.array(arrays['ticker'], pa.string()).dictionary_encode(),
+        'dataset': pa.array(arrays['dataset'], pa.string()).dictionary_encode(),
+        'field': pa.array(arrays['field'], pa.string()).dictionary_encode(),
+        'period': pa.array(arrays['period']),
+        'value': pa.array(arrays['value'], pa.float64()),
+    })
+    info_table = pa.table({'ticker': list(infos), 'info': list(infos.values())})
+
+    blobs = {'statements': _ipc_bytes(statements_table, compression), 'info': _ipc_bytes(info_table, compression)}
+    if prices is not None:
+        prices = prices.sort_index()
+        price_table = pa.table(
+            {'date': pd.to_datetime(prices.index).values,
+             **{str(c): prices[c].to_numpy(dtype=float) for c in prices.columns}}
+        )
+        blobs['prices'] = _ipc_bytes(price_table, compression)
+
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'bond_yield': bond_yield,
+        'ticker_rows': ticker_rows,
+        'info_rows': {ticker: i for i, ticker in enumerate(infos)},
+        'tables': {},
+    }
+
+    # Offsets depend on the header length, so lay out blobs after a fixed-size prefix
+    header_bytes = json.dumps(header).encode()
+    offset = len(MAGIC) + 8 + len(header_bytes)
+    while True:
+        position = offset
+        for name, blob in blobs.items():
+            header['tables'][name] = [position, blob.size]
+            position += blob.size
+        new_header = json.dumps(header).encode()
+        if len(MAGIC) + 8 + len(new_header) == offset:
+            break
+        offset = len(MAGIC) + 8 + len(new_header)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(new_header)))
+        f.write(new_header)
+        for blob in blobs.values():
+            f.write(blob)
+    return path
+
+
+class SnapshotTicker:
+    """
+    Stand-in for yf.Ticker that serves one ticker's data from a UniverseSnapshot.
+
+    Exposes the same attributes and getters StockAnalysis.DATASETS uses.
+    """
+
+    def __init__(self, snapshot, symbol):
+        self.snapshot = snapshot
+        self.ticker = symbol
+
+    @property
+    def info(self):
+        return self.snapshot.info(self.ticker)
+
+    @property
+    def cashflow(self):
+        return self.snapshot.statement(self.ticker, 'cashflow')
+
+    @property
+    def balance_sheet(self):
+        return self.snapshot.statement(self.ticker, 'balance_sheet_pretty')
+
+    @property
+    def income_stmt(self):
+        return self.snapshot.statement(self.ticker, 'income_stmt_pretty')
+
+    def get_financials(self):
+        return self.snapshot.statement(self.ticker, 'financials')
+
+    def get_balance_sheet(self):
+        return self.snapshot.statement(self.ticker, 'balance_sheet')
+
+    def get_income_stmt(self):
+        return self.snapshot.statement(self.ticker, 'income_stmt')
+
+
+class UniverseSnapshot:
+    """
+    Read-only view of a snapshot file, memory-mapped so opening it costs almost nothing.
+
+    Tables are decoded from the mapped file on first use, and each ticker's
+    statements are rebuilt into yfinance-shaped DataFrames only when asked for.
+    Also provides covers()/frame() so it can stand in for a PriceStore.
+    """
+
+    def __init__(self, path):
+        _require_pyarrow()
+        self.path = path
+        self._file = pa.memory_map(path, 'r')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a universe snapshot")
+        (header_length,) = struct.unpack('<Q', self._file.read(8))
+        self.header = json.loads(self._file.read(header_length))
+        self.bond_yield = self.header['bond_yield']
+        self.tickers = list(self.header['info_rows'])
+        self._tables = {}
+        self._info_cache = {}
+
+    def _table(self, name):
+        if name not in self._tables:
+            offset, length = self.header['tables'][name]
+            buffer = self._file.read_at(length, offset)
+            self._tables[name] = pa.ipc.open_file(buffer).read_all()
+        return self._tables[name]
+
+    def ticker(self, symbol):
+        if symbol not in self.header['info_rows']:
+            raise KeyError(f"{symbol} is not in snapshot {self.path}")
+        return SnapshotTicker(self, symbol)
+
+    def info(self, symbol):
+        if symbol not in self._info_cache:
+            row = self.header['info_rows'][symbol]
+            self._info_cache[symbol] = json.loads(self._table('info').column('info')[row].as_py())
+        return self._info_cache[symbol]
+
+    def statement(self, symbol, dataset):
+        """
+        Rebuilds one statement in yfinance layout (fields x dates, newest date first).
+
+        Args:
+            symbol (str): Ticker symbol
+            dataset (str): One of STATEMENT_DATASETS
+
+        Returns:
+            pd.DataFrame: The statement (empty if the ticker did not report it)
+        """
+        start, stop = self.header['ticker_rows'].get(symbol, [0, 0])
+        rows = self._table('statements').slice(start, stop - start).to_pandas()
+        rows = rows[rows['dataset'] == dataset]
+        if rows.empty:
+            return pd.DataFrame()
+
+        field_order = pd.unique(rows['field'].astype(str))
+        statement = rows.pivot_table(index='field', columns='period', values='value',
+                                     aggfunc='first', dropna=False, observed=True)
+        statement.index = statement.index.astype(str)
+        statement = statement.reindex(field_order)
+        statement.columns = pd.DatetimeIndex(statement.columns)
+        statement.columns.name = None
+        statement.index.name = None
+        return statement[sorted(statement.columns, reverse=True)]
+
+    def covers(self, symbols):
+        if 'prices' not in self.header['tables']:
+            return False
+        names = set(self._table('prices').column_names)
+        return all(symbol in names for symbol in symbols)
+
+    def frame(self, symbols=None, start=None, end=None):
+        # Close prices (dates x symbols) from the snapshot, same contract as PriceStore.frame
+        table = self._table('prices')
+        columns = [c for c in table.column_names if c != 'date'] if symbols is None else list(symbols)
+        dates = pd.DatetimeIndex(table.column('date').to_numpy())
+        lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side='right')
+        values = {c: table.column(c).slice(lo, hi - lo).to_numpy() for c in columns}
+        return pd.DataFrame(values, index=dates[lo:hi], columns=columns, dtype=np.float64)
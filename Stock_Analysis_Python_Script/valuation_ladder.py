@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# yfinance info fields the ladder needs for each ticker
+LADDER_FIELDS = ['currentPrice', 'sharesOutstanding', 'trailingEps', 'dividendRate']
+
+
+def ladder_inputs(infos):
+    """
+    Builds the per-ticker input table for valuation_ladder from yfinance info dicts.
+
+    Args:
+        infos (dict): Mapping of ticker -> info dict (e.g. StockAnalysis.stock.info)
+
+    Returns:
+        pd.DataFrame: One row per ticker with the LADDER_FIELDS columns
+    """
+    rows = {ticker: {field: info.get(field) for field in LADDER_FIELDS} for ticker, info in infos.items()}
+    inputs = pd.DataFrame.from_dict(rows, orient='index', columns=LADDER_FIELDS).astype(float)
+    inputs['dividendRate'] = inputs['dividendRate'].fillna(0)
+    return inputs
+
+
+def valuation_ladder(inputs, bond_yield, points=200, low=-0.5, high=0.5):
+    """
+    Evaluates the market cap analysis metrics over a ladder of prices for many tickers at once.
+
+    The ladder runs from current price x (1 + low) to current price x (1 + high).
+    Every metric is computed on a (tickers, points) grid with NumPy broadcasting,
+    using the same formulas as calculate_market_cap_at_price: total yield is the
+    earnings yield at the ladder price plus the dividend yield at the current
+    price, and the breakeven price is (EPS + Dividend) / Bond Yield (NaN, like
+    the margin of safety, when that is zero or negative).
+
+    Args:
+        inputs (pd.DataFrame): Per-ticker table from ladder_inputs
+        bond_yield (float): 10-year Treasury yield in percent (e.g. 4.5)
+        points (int): Number of prices in the ladder
+        low (float): Lowest price change as a fraction of current price
+        high (float): Highest price change as a fraction of current price
+
+    Returns:
+        pd.DataFrame: Rows indexed by (ticker, price change %) with one column per metric
+    """
+    steps = np.linspace(low, high, points)
+
+    current = inputs['currentPrice'].to_numpy(dtype=float)[:, None]
+    shares = inputs['sharesOutstanding'].to_numpy(dtype=float)[:, None]
+    eps = inputs['trailingEps'].to_numpy(dtype=float)[:, None]
+    dividend = inputs['dividendRate'].to_numpy(dtype=float)[:, None]
+
+    price = current * (1 + steps)[None, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pe_ratio = np.where(eps != 0, price / eps, np.nan)
+        earnings_yield = eps / price * 100
+        dividend_yield = dividend / price * 100
+        current_dividend_yield = np.where(current != 0, dividend / current * 100, 0.0)
+        total_yield = earnings_yield + current_dividend_yield
+        breakeven = (eps + dividend) / (bond_yield / 100)
+        # No breakeven (and so no margin of safety) without positive earnings plus dividends
+        breakeven = np.where(breakeven > 0, breakeven, np.nan)
+        margin_of_safety = (breakeven - price) / breakeven * 100
+
+    n_tickers = len(inputs)
+    index = pd.MultiIndex.from_arrays(
+        [np.repeat(inputs.index.to_numpy(), points), np.tile(steps * 100, n_tickers)],
+        names=['Ticker', 'Price Change (%)'],
+    )
+    return pd.DataFrame({
+        'Price': price.ravel(),
+        'Market Cap': (price * shares).ravel(),
+        'P/E Ratio': pe_ratio.ravel(),
+        'Earnings Yield (%)': earnings_yield.ravel(),
+        'Dividend Yield (%)': dividend_yield.ravel(),
+        'Total Yield (%)': total_yield.ravel(),
+        'Yield Spread (%)': (total_yield - bond_yield).ravel(),
+        'Breakeven Price': np.broadcast_to(breakeven, price.shape).ravel(),
+        'Margin of Safety (%)': margin_of_safety.ravel(),
+    }, index=index)
+
+
+def buy_limits(ladder, min_margin_of_safety=0.0):
+    """
+    Returns the highest ladder price per ticker that still meets a margin-of-safety floor.
+
+    Args:
+        ladder (pd.DataFrame): Output of valuation_ladder
+        min_margin_of_safety (float): Required margin of safety in percent
+
+    Returns:
+        pd.Series: Highest qualifying price per ticker (NaN if no ladder price qualifies)
+    """
+    qualifying = ladder['Price'].where(ladder['Margin of Safety (%)'] >= min_margin_of_safety)
+    return qualifying.groupby(level='Ticker', sort=False).max().rename('Buy Limit')
@@ -0,0 +1,249 @@
+import argparse
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from price_fetch import download_close_matrix
+
+# Cached per-symbol inputs of the price-dependent metrics
+INPUT_FIELDS = ['trailingEps', 'dividendRate', 'currentPrice']
+
+
+@dataclass(frozen=True)
+class Alert:
+    symbol: str
+    metric: str
+    threshold: float
+    previous: float
+    value: float
+    price: float
+    at: datetime
+
+    @property
+    def direction(self):
+        return 'above' if self.value > self.threshold else 'below'
+
+    def __str__(self):
+        return (f"{self.at:%H:%M:%S} {self.symbol:<6} {self.metric} crossed {self.direction} "
+                f"{self.threshold:g} ({self.previous:.2f} -> {self.value:.2f}) at ${self.price:,.2f}")
+
+
+class BatchedPriceFeed:
+    # Latest intraday prices polled with one yf.download request per batch of symbols
+    def __init__(self, symbols, batch_size=200, interval='1m'):
+        self.symbols = list(symbols)
+        self.batch_size = batch_size
+        self.interval = interval
+
+    def poll(self):
+        start = datetime.now().strftime('%Y-%m-%d')
+        prices = []
+        for i in range(0, len(self.symbols), self.batch_size):
+            batch = self.symbols[i:i + self.batch_size]
+            closes = download_close_matrix(batch, start=start, interval=self.interval, benchmarks=())
+            prices.append(closes.ffill().iloc[-1] if not closes.empty else pd.Series(np.nan, index=batch))
+        return pd.concat(prices) if prices else pd.Series(dtype=float)
+
+
+class ReplayFeed:
+    # Local stand-in feed: replays a price frame (dates x symbols) one row per poll
+    def __init__(self, prices):
+        self.prices = prices.sort_index()
+        self._row = 0
+
+    def poll(self):
+        if self._row >= len(self.prices):
+            raise StopIteration
+        row = self.prices.iloc[self._row]
+        self._row += 1
+        return row
+
+
+class WatchlistMonitor:
+    """
+    Tracks the yield spread and breakeven margin of a watchlist tick by tick.
+
+    The price-independent inputs (trailing EPS, dividend rate, the bond
+    yield and the breakeven price derived from them) are cached as arrays
+    once. A tick only recomputes, for the symbols whose price moved, the
+    two price-dependent metrics:
+
+        yield spread (%)   = (EPS + Dividend) / Price x 100 - Bond Yield   (get_margin_of_safety)
+        breakeven margin (%) = (Breakeven - Price) / Breakeven x 100       (calculate_market_cap_at_price)
+
+    and compares them with the previous values to raise an Alert whenever
+    a threshold is crossed. Everything is vectorized over the watchlist.
+    """
+
+    def __init__(self, inputs, bond_yield, spread_thresholds=(0.0,), margin_thresholds=(0.0,)):
+        """
+        Args:
+            inputs (pd.DataFrame): One row per symbol with 'trailingEps', 'dividendRate' and
+                optionally 'currentPrice' (see inputs_from_store / inputs_from_analyses)
+            bond_yield (float): 10-year Treasury yield (%)
+            spread_thresholds (tuple): Yield spread levels (%) that raise alerts when crossed
+            margin_thresholds (tuple): Breakeven margin levels (%) that raise alerts when crossed
+        """
+        inputs = inputs.reindex(columns=INPUT_FIELDS).apply(pd.to_numeric, errors='coerce')
+        self.symbols = inputs.index.to_numpy()
+        self.eps = inputs['trailingEps'].to_numpy(dtype=float)
+        self.dividend = np.nan_to_num(inputs['dividendRate'].to_numpy(dtype=float))
+        self.thresholds = {'Yield Spread (%)': np.asarray(spread_thresholds, dtype=float),
+                           'Breakeven Margin (%)': np.asarray(margin_thresholds, dtype=float)}
+        self.price = np.full(len(self.symbols), np.nan)
+        self.metrics = {name: np.full(len(self.symbols), np.nan) for name in self.thresholds}
+        self.set_bond_yield(bond_yield)
+        self.update(inputs['currentPrice'], alert=False)
+
+    def set_bond_yield(self, bond_yield):
+        # The breakeven price depends only on EPS, dividend and the bond yield
+        self.bond_yield = float(bond_yield)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.breakeven = np.where(np.nan_to_num(self.eps) != 0,
+                                      (self.eps + self.dividend) / (self.bond_yield / 100), np.nan)
+        changed = ~np.isnan(self.price)
+        self._recompute(changed)
+
+    def _recompute(self, rows):
+        price = self.price[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            earnings_yield = np.where(np.nan_to_num(self.eps[rows]) != 0, self.eps[rows] / price * 100, 0.0)
+            total_yield = earnings_yield + self.dividend[rows] / price * 100
+            self.metrics['Yield Spread (%)'][rows] = total_yield - self.bond_yield
+            self.metrics['Breakeven Margin (%)'][rows] = (self.breakeven[rows] - price) / self.breakeven[rows] * 100
+
+    def update(self, prices, alert=True, at=None):
+        """
+        Applies one tick of prices.
+
+        Args:
+            prices (pd.Series): Symbol -> latest price (symbols not on the watchlist and
+                missing or unchanged prices are ignored)
+            alert (bool): Whether to look for threshold crossings
+            at (datetime): Tick time stamped on the alerts (default: now)
+
+        Returns:
+            list: Alert for every threshold crossed on this tick
+        """
+        new = pd.Series(prices, dtype=float).reindex(self.symbols).to_numpy()
+        rows = np.flatnonzero(~np.isnan(new) & (new > 0) & (new != self.price))
+        if not len(rows):
+            return []
+
+        previous = {name: values[rows] for name, values in self.metrics.items()}
+        self.price[rows] = new[rows]
+        self._recompute(rows)
+        if not alert:
+            return []
+
+        at = at or datetime.now()
+        alerts = []
+        for name, thresholds in self.thresholds.items():
+            before, after = previous[name][:, None], self.metrics[name][rows][:, None]
+            # A crossing is a change of side; NaN on either side (no previous value) never crosses
+            crossed = ((before >= thresholds) != (after >= thresholds)) & ~np.isnan(before) & ~np.isnan(after)
+            for i, k in zip(*np.nonzero(crossed)):
+                row = rows[i]
+                alerts.append(Alert(self.symbols[row], name, float(thresholds[k]), float(before[i, 0]),
+                                    float(after[i, 0]), float(self.price[row]), at))
+        return alerts
+
+    def snapshot(self):
+        # Current price, breakeven and metrics for every symbol
+        return pd.DataFrame({'Price': self.price, 'Breakeven Price': self.breakeven, **self.metrics},
+                            index=pd.Index(self.symbols, name='Symbol'))
+
+    def run(self, feed, interval=60.0, max_ticks=None, on_alert=print):
+        """
+        Polls a feed and applies each tick until the feed ends or max_ticks is reached.
+
+        Args:
+            feed: Object whose poll() returns a Series of prices (raises StopIteration when done)
+            interval (float): Seconds between polls (0 for a replay as fast as possible)
+            max_ticks (int): Optional number of ticks to run
+            on_alert (callable): Called with every Alert
+
+        Returns:
+            int: Number of ticks applied
+        """
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            started = time.monotonic()
+            try:
+                prices = feed.poll()
+            except StopIteration:
+                break
+            for alert in self.update(prices):
+                on_alert(alert)
+            ticks += 1
+            if interval:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        return ticks
+
+
+def inputs_from_store(store, symbols):
+    # Cached inputs from the latest info snapshots of a SQLiteStore
+    return store.info_fields(INPUT_FIELDS).reindex([s.upper() for s in symbols])
+
+
+def inputs_from_analyses(analyses):
+    # Cached inputs from StockAnalysis objects (fetches info once per symbol)
+    return pd.DataFrame.from_dict(
+        {a.ticker_symbol: {field: a.fetch('info').get(field) for field in INPUT_FIELDS} for a in analyses},
+        orient='index', columns=INPUT_FIELDS,
+    )
+
+
+def print_watchlist(monitor):
+    table = monitor.snapshot()
+    print("\n")
+    print("╔" + "═" * 70 + "╗")
+    print("║" + " WATCHLIST ".center(70) + "║")
+    print("╠" + "═" * 70 + "╣")
+    print("║" + f" Symbols: {len(table)}   Bond Yield: {monitor.bond_yield:.2f}%".ljust(70) + "║")
+    print("╚" + "═" * 70 + "╝")
+    print(f"\n{'Symbol':<8} | {'Price':>10} | {'Breakeven':>10} | {'Spread':>8} | {'Margin':>8}")
+    print("-" * 57)
+    for symbol, row in table.iterrows():
+        breakeven = f"${row['Breakeven Price']:>9,.2f}" if not pd.isna(row['Breakeven Price']) else f"{'N/A':>10}"
+        margin = f"{row['Breakeven Margin (%)']:>7.2f}%" if not pd.isna(row['Breakeven Margin (%)']) else f"{'N/A':>8}"
+        print(f"{symbol:<8} | ${row['Price']:>9,.2f} | {breakeven} | {row['Yield Spread (%)']:>7.2f}% | {margin}")
+
+
+if __name__ == "__main__":
+    from sqlite_store import SQLiteStore
+    from StockAnalysis import StockAnalysis
+
+    parser = argparse.ArgumentParser(description="Watch yield spreads and breakeven prices for a watchlist")
+    parser.add_argument('symbols', nargs='+')
+    parser.add_argument('--db', help="SQLiteStore with the symbols' info snapshots (default: fetch info)")
+    parser.add_argument('--replay', help="PriceStore directory to replay instead of polling live prices")
+    parser.add_argument('--interval', type=float, default=60.0, help="Seconds between polls")
+    parser.add_argument('--ticks', type=int, help="Stop after this many polls")
+    parser.add_argument('--spread', type=float, nargs='+', default=[0.0], help="Yield spread alert levels (%)")
+    parser.add_argument('--margin', type=float, nargs='+', default=[0.0], help="Breakeven margin alert levels (%)")
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    analyses = [StockAnalysis(symbol) for symbol in symbols]
+    if args.db:
+        with SQLiteStore(args.db) as store:
+            inputs = inputs_from_store(store, symbols)
+    else:
+        inputs = inputs_from_analyses(analyses)
+
+    monitor = WatchlistMonitor(inputs, analyses[0].get_bond_yield(), args.spread, args.margin)
+    print_watchlist(monitor)
+    if args.replay:
+        from price_store import PriceStore
+        feed = ReplayFeed(PriceStore(args.replay).frame(symbols))
+    else:
+        feed = BatchedPriceFeed(symbols)
+    try:
+        monitor.run(feed, interval=args.interval, max_ticks=args.ticks)
+    except KeyboardInterrupt:
+        pass
+    print_watchlist(monitor)
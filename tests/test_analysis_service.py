@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import analysis_service
+from analysis_service import AnalysisService
+
+
+class FakeAnalysis:
+    # Counts how often a ticker's data is (re)loaded
+    loads = []
+
+    def __init__(self, ticker):
+        self.ticker_symbol = ticker
+        FakeAnalysis.loads.append(ticker)
+        self.price = 100.0 + len(FakeAnalysis.loads)
+
+    def get_dcf_inputs(self):
+        return {'Current Price': self.price}
+
+
+@pytest.fixture(autouse=True)
+def fake_analysis(monkeypatch):
+    FakeAnalysis.loads = []
+    monkeypatch.setattr(analysis_service, 'StockAnalysis', FakeAnalysis)
+
+
+def _get(service, path):
+    return asyncio.run(service.handle(path, {}))
+
+
+def test_instances_and_results_are_reused_within_ttl():
+    service = AnalysisService(result_ttl=900)
+    first = _get(service, '/analysis/aapl/dcf-inputs')
+    assert _get(service, '/analysis/AAPL/dcf-inputs') == first
+    assert FakeAnalysis.loads == ['AAPL']
+
+
+def test_expired_results_are_recomputed_from_fresh_data():
+    service = AnalysisService(result_ttl=0)
+    first = _get(service, '/analysis/AAPL/dcf-inputs')[1]['Current Price']
+    second = _get(service, '/analysis/AAPL/dcf-inputs')[1]['Current Price']
+    assert FakeAnalysis.loads == ['AAPL', 'AAPL']
+    assert second != first
+
+
+def test_loaded_tickers_are_capped_least_recently_used_first():
+    service = AnalysisService(max_tickers=2)
+    for ticker in ['A', 'B', 'A', 'C']:
+        _get(service, f'/analysis/{ticker}/dcf-inputs')
+    assert _get(service, '/health')[1]['tickers'] == ['A', 'C']
+    assert FakeAnalysis.loads == ['A', 'B', 'C']
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest_screen, backtest_summary
+
+REPORT_DATES = pd.to_datetime([f'{year}-12-31' for year in range(2015, 2021)])
+DELISTED_AFTER = pd.Timestamp('2020-06-15')
+
+
+def _financials(growth):
+    # Annual statement, newest first, with EPS compounding at `growth` (only the Earnings signal)
+    net_income = 1e9 * (1 + growth) ** np.arange(len(REPORT_DATES))
+    return pd.DataFrame([net_income[::-1], np.full(len(REPORT_DATES), 1e9)],
+                        index=['NetIncome', 'DilutedAverageShares'], columns=REPORT_DATES[::-1])
+
+
+@pytest.fixture
+def universe():
+    # A and B grow 20% a year, C shrinks; B stops trading in mid-June 2020
+    dates = pd.bdate_range('2019-01-01', '2021-06-30')
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(20 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), 4)), axis=0)),
+                          index=dates, columns=['A', 'B', 'C', 'SPY'])
+    prices.loc[prices.index > DELISTED_AFTER, 'B'] = np.nan
+    statements = {'financials': {'A': _financials(0.2), 'B': _financials(0.2), 'C': _financials(-0.1)}}
+    return prices, statements
+
+
+def test_selection_uses_only_data_up_to_each_rebalance_date(universe):
+    prices, statements = universe
+    result = backtest_screen(prices, statements, bond_yields=1.0)
+
+    cutoff = pd.Timestamp('2020-09-30')
+    changed = prices.copy()
+    changed.loc[changed.index > cutoff] *= 3
+    changed.loc[changed.index > cutoff, 'A'] = np.nan
+    rerun = backtest_screen(changed, statements, bond_yields=1.0)
+
+    pd.testing.assert_frame_equal(rerun['selected'].loc[:cutoff], result['selected'].loc[:cutoff])
+    assert not result['selected']['C'].any()
+
+
+def test_delisted_holding_books_delisting_loss(universe):
+    prices, statements = universe
+    result = backtest_screen(prices, statements, bond_yields=1.0, delisting_return=-0.3)
+    returns, selected = result['returns'], result['selected']
+
+    last_trading = pd.Timestamp('2020-05-29')
+    assert selected.loc[last_trading, ['A', 'B']].all()
+    assert not selected.loc[selected.index > last_trading, 'B'].any()
+    assert returns['Delisted'].sum() == returns.loc[last_trading, 'Delisted'] == 1
+    assert result['summary']['Delisted Holdings'].iloc[0] == 1
+
+    close = prices.ffill()
+    forward_a = close.loc['2020-06-30', 'A'] / close.loc[last_trading, 'A'] - 1
+    forward_b = (close.loc[DELISTED_AFTER, 'B'] / close.loc[last_trading, 'B']) * 0.7 - 1
+    assert returns.loc[last_trading, 'Strategy'] == pytest.approx((forward_a + forward_b) / 2)
+
+
+def test_delisted_holding_dropped_without_delisting_return(universe):
+    prices, statements = universe
+    returns = backtest_screen(prices, statements, bond_yields=1.0, delisting_return=None)['returns']
+
+    last_trading = pd.Timestamp('2020-05-29')
+    close = prices.ffill()
+    assert returns.loc[last_trading, 'Holdings'] == 2 and returns.loc[last_trading, 'Delisted'] == 1
+    assert returns.loc[last_trading, 'Strategy'] == pytest.approx(
+        close.loc['2020-06-30', 'A'] / close.loc[last_trading, 'A'] - 1)
+
+
+def test_halted_holding_is_carried_not_delisted(universe):
+    prices, statements = universe
+    # A stops trading for seven weeks over the end of March, then trades again
+    halt = (prices.index > pd.Timestamp('2020-03-02')) & (prices.index < pd.Timestamp('2020-04-20'))
+    prices.loc[halt, 'A'] = np.nan
+    result = backtest_screen(prices, statements, bond_yields=1.0)
+    returns, selected = result['returns'], result['selected']
+
+    assert selected.loc['2020-02-28':'2020-04-30', 'A'].all()
+    assert returns['Delisted'].sum() == 1  # Only B
+    close = prices.ffill()
+    assert returns.loc['2020-03-31', 'Strategy'] == pytest.approx(
+        (close.loc['2020-04-30', ['A', 'B']] / close.loc['2020-03-31', ['A', 'B']] - 1).mean())
+
+
+def test_summary_drawdown_counts_a_first_period_loss():
+    returns = pd.DataFrame({'Strategy': [-0.2, 0.1], 'Universe': [0.05, 0.05], 'Holdings': [1, 1]},
+                           index=pd.to_datetime(['2020-01-31', '2020-02-29']))
+    summary = backtest_summary(returns)
+    assert summary.loc['Strategy', 'Max Drawdown (%)'] == pytest.approx(-20.0)
+    assert summary.loc['Universe', 'Max Drawdown (%)'] == pytest.approx(0.0)
@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from change_feed import (BOND_DATASET, BOND_TICKER, METRICS, Change, ChangeFeed, affected_metrics,
+                         compute_metrics, info_changes, statement_changes)
+from sqlite_store import SQLiteStore
+
+INFO = {'currentPrice': 100.0, 'trailingEps': 5.0, 'dividendRate': 1.0, 'forwardEps': 6.0,
+        'sharesOutstanding': 1e9}
+
+
+def test_statement_changes_reports_changed_added_and_removed_fields():
+    stored = {('Free Cash Flow', '2023-12-31'): 1e9, ('Capital Expenditure', '2023-12-31'): -2e8,
+              ('Operating Cash Flow', '2023-12-31'): 1.2e9, ('Net Income', '2023-12-31'): math.nan,
+              ('Dividends Paid', '2022-12-31'): -1e8}
+    fresh = {('Free Cash Flow', '2023-12-31'): 1.1e9, ('Capital Expenditure', '2023-12-31'): -2e8 * (1 + 1e-12),
+             ('Operating Cash Flow', '2023-12-31'): 1.2e9, ('Net Income', '2023-12-31'): math.nan,
+             ('Operating Cash Flow', '2024-12-31'): 1.3e9}
+    # Float noise and NaN == NaN are not changes; a new period or a dropped field are
+    assert statement_changes(stored, fresh) == ['Dividends Paid', 'Free Cash Flow', 'Operating Cash Flow']
+    assert statement_changes(fresh, fresh) == []
+
+
+def test_info_changes():
+    fresh = {**INFO, 'currentPrice': 101.0, 'sector': 'Technology'}
+    assert info_changes(INFO, fresh) == ['currentPrice', 'sector']
+    assert info_changes(None, {'currentPrice': 1.0}) == ['currentPrice']
+    assert info_changes(INFO, dict(INFO)) == []
+
+
+@pytest.mark.parametrize('changes, expected', [
+    ([Change('AAPL', 'info', ('currentPrice',))],
+     ['dcf_margin_of_safety', 'earnings_yield', 'dividend_yield', 'yield_spread']),
+    ([Change('AAPL', 'cashflow', ('Free Cash Flow',))], ['dcf_fair_value', 'dcf_margin_of_safety']),
+    ([Change('AAPL', 'cashflow', ('Operating Cash Flow',))], ['avg_fcf_growth']),
+    ([Change(BOND_TICKER, BOND_DATASET, ('value',))], ['yield_spread', 'breakeven_price']),
+    ([Change('AAPL', 'financials', ('TaxRateForCalcs',)), Change('AAPL', 'info', ('forwardEps',))],
+     ['roic', 'avg_roic_growth', 'breakeven_price']),
+    ([Change('AAPL', 'info', ('longBusinessSummary',))], []),
+])
+def test_affected_metrics(changes, expected):
+    assert affected_metrics(changes) == expected
+
+
+def test_affected_metrics_keep_computation_order():
+    every_field = [Change('AAPL', dataset, tuple(fields))
+                   for spec in METRICS.values() for dataset, fields in spec.inputs.items()]
+    assert affected_metrics(every_field) == list(METRICS)
+
+
+def test_compute_metrics_uses_stored_required_values():
+    results = compute_metrics(['dcf_margin_of_safety', 'yield_spread', 'breakeven_price'], {}, INFO,
+                              bond_yield=4.0, stored={'dcf_fair_value': 200.0})
+    assert results['dcf_margin_of_safety'] == pytest.approx(50.0)
+    assert results['yield_spread'] == pytest.approx(5.0 + 1.0 - 4.0)
+    assert results['breakeven_price'] == pytest.approx(150.0)
+
+    # yfinance omits dividendRate for non-payers: a 0% dividend yield, while a missing EPS is unknown
+    no_dividend = {key: value for key, value in INFO.items() if key != 'dividendRate'}
+    results = compute_metrics(['dividend_yield', 'yield_spread'], {}, no_dividend, 4.0)
+    assert results == {'dividend_yield': 0.0, 'yield_spread': pytest.approx(5.0 - 4.0)}
+    no_eps = {**INFO, 'trailingEps': None}
+    assert compute_metrics(['earnings_yield', 'yield_spread'], {}, no_eps, 4.0) == {
+        'earnings_yield': None, 'yield_spread': None}
+
+
+class FakeAnalysis:
+    # Fresh pull of one ticker: info plus statements (missing datasets come back empty)
+    def __init__(self, ticker_symbol, info, statements):
+        self.ticker_symbol = ticker_symbol
+        self.info = info
+        self.statements = statements
+
+    def fetch(self, dataset):
+        return self.info if dataset == 'info' else self.statements.get(dataset, pd.DataFrame())
+
+
+def _cashflow(free_cash_flow):
+    dates = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31'])
+    return pd.DataFrame({date: [fcf, fcf * 1.25, -fcf * 0.25] for date, fcf in zip(dates, free_cash_flow)},
+                        index=['Free Cash Flow', 'Operating Cash Flow', 'Capital Expenditure'])
+
+
+def test_refresh_recomputes_only_affected_metrics(tmp_path):
+    feed = ChangeFeed(SQLiteStore(str(tmp_path / 'stocks.db')))
+    cashflow = _cashflow([1.2e9, 1.1e9, 1e9])
+
+    # First sighting: every metric is computed
+    changes, recomputed = feed.refresh(FakeAnalysis('AAPL', INFO, {'cashflow': cashflow}), bond_yield=4.0)
+    assert list(recomputed) == list(METRICS)
+    assert {change.dataset for change in changes} == {'info', 'cashflow'}
+
+    # Same data again: nothing changes and nothing is recomputed
+    assert feed.refresh(FakeAnalysis('AAPL', INFO, {'cashflow': cashflow}), bond_yield=4.0) == ([], {})
+
+    # A price move only touches the price-dependent metrics
+    moved = {**INFO, 'currentPrice': 80.0}
+    changes, recomputed = feed.refresh(FakeAnalysis('AAPL', moved, {'cashflow': cashflow}), bond_yield=4.0)
+    assert changes == [Change('AAPL', 'info', ('currentPrice',))]
+    assert list(recomputed) == ['dcf_margin_of_safety', 'earnings_yield', 'dividend_yield', 'yield_spread']
+    assert recomputed['earnings_yield'] == pytest.approx(6.25)
+
+    # A restated free cash flow reprices the DCF and is written back cell by cell
+    restated = cashflow.copy()
+    restated.iloc[0, 0] = 1.5e9
+    changes, recomputed = feed.refresh(FakeAnalysis('AAPL', moved, {'cashflow': restated}), bond_yield=4.0)
+    assert changes == [Change('AAPL', 'cashflow', ('Free Cash Flow',))]
+    assert list(recomputed) == ['dcf_fair_value', 'dcf_margin_of_safety']
+    stored = feed.store.statement_cells('AAPL', 'cashflow')
+    assert np.isclose([value for (field, _), value in stored.items() if field == 'Free Cash Flow'], 1.5e9).any()
+
+
+def test_bond_yield_change(tmp_path):
+    feed = ChangeFeed(SQLiteStore(str(tmp_path / 'stocks.db')))
+    assert feed.bond_yield_change(4.0) == Change(BOND_TICKER, BOND_DATASET, ('value',))
+    assert feed.bond_yield_change(4.0) is None
+    assert feed.bond_yield_change(None) is None
+    assert feed.bond_yield_change(4.5) is not None
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from factor_regression import rolling_regression_array
+
+
+def _data(n_dates=300, n_symbols=5, seed=0):
+    # Stock returns linear in the factor plus noise, with gaps in both
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, n_dates)
+    returns = (rng.normal(0, 0.0005, n_symbols) + rng.normal(1, 0.4, n_symbols) * factor[:, None]
+               + rng.normal(0, 0.01, (n_dates, n_symbols)))
+    returns[rng.random(returns.shape) < 0.1] = np.nan
+    factor[rng.random(n_dates) < 0.05] = np.nan
+    return returns, factor
+
+
+def _polyfit(returns, factor, end, window):
+    # Reference fit of one window ending at row `end` for every column
+    expected = []
+    for column in range(returns.shape[1]):
+        r = returns[end - window + 1:end + 1, column]
+        f = factor[end - window + 1:end + 1] if factor.ndim == 1 else factor[end - window + 1:end + 1, column]
+        keep = ~np.isnan(r) & ~np.isnan(f)
+        beta, alpha = np.polyfit(f[keep], r[keep], 1)
+        r_squared = np.corrcoef(f[keep], r[keep])[0, 1] ** 2
+        expected.append((alpha, beta, r_squared))
+    return np.array(expected).T
+
+
+@pytest.mark.parametrize('window', [20, 63])
+def test_matches_polyfit_per_column(window):
+    returns, factor = _data()
+    alpha, beta, r_squared = rolling_regression_array(returns, factor, window)
+
+    for end in (window - 1, window + 17, len(returns) - 1):
+        expected = _polyfit(returns, factor, end, window)
+        np.testing.assert_allclose(alpha[end], expected[0], rtol=1e-6, atol=1e-12)
+        np.testing.assert_allclose(beta[end], expected[1], rtol=1e-6)
+        np.testing.assert_allclose(r_squared[end], expected[2], rtol=1e-6)
+
+
+def test_per_symbol_factor_matches_polyfit():
+    returns, _ = _data()
+    factors = np.column_stack([_data(seed=seed)[1] for seed in range(1, returns.shape[1] + 1)])
+    alpha, beta, _ = rolling_regression_array(returns, factors, window=40)
+
+    expected = _polyfit(returns, factors, 150, 40)
+    np.testing.assert_allclose(alpha[150], expected[0], rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(beta[150], expected[1], rtol=1e-6)
+
+
+def test_nan_before_first_window_and_with_too_few_returns():
+    returns, factor = _data()
+    returns[:, 0] = np.nan
+    returns[100:, 1] = np.nan
+    alpha, beta, r_squared = rolling_regression_array(returns, factor, window=30, min_periods=20)
+
+    assert np.isnan(beta[:29]).all()
+    assert np.isnan(beta[:, 0]).all()
+    # Column 1 has a result exactly where its window still holds 20 overlapping returns
+    valid = ~np.isnan(returns[:, 1]) & ~np.isnan(factor)
+    counts = np.array([valid[max(0, end - 29):end + 1].sum() for end in range(len(valid))])
+    np.testing.assert_array_equal(np.isfinite(beta[29:, 1]), counts[29:] >= 20)
+    assert np.isnan(beta[129:, 1]).all()
+    finite = r_squared[np.isfinite(r_squared)]
+    assert ((finite >= 0) & (finite <= 1)).all()
+    np.testing.assert_array_equal(np.isnan(alpha), np.isnan(beta))
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from StockAnalysis import StockAnalysis
+
+DATES = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31', '2020-12-31'])
+
+
+def _analysis(**datasets):
+    # StockAnalysis over preloaded statements, so the growth analyses make no provider request
+    analysis = StockAnalysis('TEST')
+    analysis._datasets = datasets
+    return analysis
+
+
+def test_growth_is_not_bridged_across_a_missing_year(capsys):
+    # 2022 is missing: 2021 -> 2023 is a two-year change and must not count as one annual rate
+    revenue = pd.DataFrame([[180.0, np.nan, 140.0, 126.0]], index=['TotalRevenue'], columns=DATES)
+    financials = pd.DataFrame([[180.0, np.nan, 140.0, 126.0], [10.0] * 4],
+                              index=['NetIncome', 'DilutedAverageShares'], columns=DATES)
+    analysis = _analysis(income_stmt=revenue, financials=financials)
+
+    analysis.sales_growth_rate()
+    analysis.eps_growth_rate()
+    assert analysis.avg_sales_growth == pytest.approx(100 / 9)
+    assert analysis.avg_earnings_growth == pytest.approx(100 / 9)
+
+    rows = [line for line in capsys.readouterr().out.splitlines() if line.startswith(('2022', '2023'))]
+    assert all('N/A' in row for row in rows)
+    assert '+28.57%' not in ''.join(rows)
+
+
+def test_growth_over_complete_years():
+    cash_flow = pd.DataFrame([[200.0, 150.0, 120.0, 100.0], [-20.0] * 4],
+                             index=['Operating Cash Flow', 'Capital Expenditure'], columns=DATES)
+    analysis = _analysis(cashflow=cash_flow)
+    analysis.free_cash_flow_growth_rate()
+    assert analysis.avg_fcf_growth == pytest.approx(np.mean([100 / 80 * 100 - 100, 130 / 100 * 100 - 100,
+                                                             180 / 130 * 100 - 100]))
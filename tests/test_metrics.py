@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import average_growth, growth_rates
+from provider_guard import CACHE_DIR_ENV
+from results_cache import ResultsCache
+
+
+def test_growth_rates_do_not_bridge_a_missing_year():
+    # 2022 is missing (dropped by the *_by_year helpers): 2021 -> 2023 is not one annual rate
+    sales = pd.Series({2020: 126.0, 2021: 140.0, 2023: 180.0})
+    growth = growth_rates(sales)
+    assert list(growth.index) == [2021]
+    assert growth[2021] == pytest.approx(100 / 9)
+    assert average_growth(sales) == pytest.approx(100 / 9)
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('relative', [25.0, -20.0]),
+    ('difference', [25.0, -25.0]),
+    ('ratio', [25.0, -20.0]),
+])
+def test_growth_rates_methods(method, expected):
+    values = pd.Series({2023: 100.0, 2021: 100.0, 2022: 125.0})
+    np.testing.assert_allclose(growth_rates(values, method).to_numpy(), expected)
+
+
+def test_average_growth_without_growth_periods():
+    assert average_growth(pd.Series(dtype=float)) is None
+    assert average_growth(pd.Series({2020: 0.0, 2021: 5.0})) is None
+
+
+def test_results_cache_defaults_to_user_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    cache = ResultsCache()
+    assert cache.directory == str(tmp_path / 'results_cache')
+    results, hit = cache.get_or_compute('AAPL', {'info': {'a': 1}}, {}, lambda: {'roic': 1.0})
+    assert (results, hit) == ({'roic': 1.0}, False)
+    assert ResultsCache().get_or_compute('AAPL', {'info': {'a': 1}}, {}, lambda: None) == ({'roic': 1.0}, True)
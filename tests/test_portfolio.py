@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import portfolio
+from portfolio import aggregate_portfolio
+
+
+def _table(rows):
+    columns = ['Price', 'EPS', 'Dividend Rate', 'DCF Value', 'ROIC Growth', 'Equity Growth',
+               'Earnings Growth', 'Sales Growth', 'FCF Growth']
+    return pd.DataFrame.from_dict(rows, orient='index', columns=columns).astype(float)
+
+
+def test_non_payer_counts_as_zero_dividend_yield():
+    table = _table({'PAY': [100.0, 5.0, 4.0, np.nan] + [np.nan] * 5,
+                    'NOPAY': [100.0, 5.0, np.nan, np.nan] + [np.nan] * 5})
+    holdings, summary = aggregate_portfolio(table, {'PAY': 0.5, 'NOPAY': 0.5}, bond_yield=4.0)
+
+    assert summary['Dividend Yield (%)'] == pytest.approx(2.0)
+    assert summary['Total Yield (%)'] == pytest.approx(7.0)
+    assert summary['Yield Spread (%)'] == pytest.approx(3.0)
+    assert holdings.loc['NOPAY', 'Dividend Yield (%)'] == 0.0
+
+
+def test_missing_eps_is_skipped_not_zero():
+    table = _table({'A': [100.0, 5.0, 0.0, np.nan] + [np.nan] * 5,
+                    'B': [50.0, np.nan, 0.0, np.nan] + [np.nan] * 5})
+    _, summary = aggregate_portfolio(table, {'A': 0.5, 'B': 0.5})
+    assert summary['Earnings Yield (%)'] == pytest.approx(5.0)
+
+
+class FakeAnalysis:
+    # Holding with fixed info; 'BAD' behaves like a delisted ticker
+    def __init__(self, ticker, snapshot=None):
+        self.ticker_symbol = ticker
+
+    def fetch(self, dataset):
+        if self.ticker_symbol == 'BAD':
+            raise ValueError("No data found for BAD")
+        return {'currentPrice': 100.0, 'trailingEps': 5.0, 'dividendRate': 2.0}
+
+    def compute_derived_metrics(self, cache=None):
+        return {'dcf_fair_value': 120.0}
+
+    def get_bond_yield(self):
+        return 4.0
+
+
+def test_failed_holding_is_reported_and_left_out(monkeypatch, capsys):
+    monkeypatch.setattr(portfolio, 'StockAnalysis', FakeAnalysis)
+    table, summary = portfolio.analyze_portfolio({'GOOD': 0.5, 'BAD': 0.25, 'ALSO': 0.25})
+
+    assert summary['Failed Holdings'] == ['BAD']
+    assert list(table.index) == ['GOOD', 'ALSO']
+    assert table['Weight (%)'].sum() == pytest.approx(100.0)
+    assert summary['Total Yield (%)'] == pytest.approx(7.0)
+    assert "Could not load BAD" in capsys.readouterr().out
+
+
+def test_no_loaded_holding_raises(monkeypatch):
+    monkeypatch.setattr(portfolio, 'StockAnalysis', FakeAnalysis)
+    with pytest.raises(ValueError, match="None of the holdings"):
+        portfolio.analyze_portfolio({'BAD': 1.0})
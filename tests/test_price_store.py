@@ -0,0 +1,67 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from price_store import POINTER_FILE, PriceStore
+
+
+def _prices(symbols, periods=50, start='2024-01-01'):
+    values = np.arange(periods * len(symbols), dtype=float).reshape(periods, len(symbols))
+    values[3, 0] = np.nan
+    return pd.DataFrame(values, index=pd.bdate_range(start, periods=periods), columns=symbols)
+
+
+def test_build_round_trip(tmp_path):
+    prices = _prices(['AAPL', 'MSFT', 'SPY'])
+    store = PriceStore.build(str(tmp_path / 'prices'), prices)
+
+    pd.testing.assert_frame_equal(store.frame(), prices, check_freq=False, check_names=False)
+    pd.testing.assert_frame_equal(store.frame(['SPY', 'AAPL'], start='2024-01-10', end='2024-01-20'),
+                                  prices.loc['2024-01-10':'2024-01-20', ['SPY', 'AAPL']],
+                                  check_freq=False, check_names=False)
+    assert store.covers(['AAPL', 'SPY']) and not store.covers(['TSLA'])
+
+
+def test_rebuild_publishes_new_version_and_keeps_open_reader_valid(tmp_path):
+    path = str(tmp_path / 'prices')
+    old = PriceStore.build(path, _prices(['AAPL', 'MSFT']))
+    new = PriceStore.build(path, _prices(['AAPL', 'MSFT', 'NVDA'], periods=60))
+
+    # The reader opened before the rebuild still sees its own matching files
+    assert old.frame().shape == (50, 2)
+    assert PriceStore(path).frame().shape == new.frame().shape == (60, 3)
+
+    # Only the current version and one superseded version stay on disk
+    PriceStore.build(path, _prices(['AAPL'], periods=10))
+    assert sorted(os.listdir(path))[0] == POINTER_FILE
+    assert len([entry for entry in os.listdir(path) if entry.startswith('v')]) == 2
+    assert PriceStore(path).symbols == ['AAPL']
+
+
+def test_concurrent_rebuilds_never_expose_mixed_files(tmp_path):
+    path = str(tmp_path / 'prices')
+    shapes = {(50, 2), (60, 3)}
+    PriceStore.build(path, _prices(['AAPL', 'MSFT']))
+    done, errors = threading.Event(), []
+
+    def read():
+        while not done.is_set():
+            try:
+                store = PriceStore(path)
+                if store.frame().shape not in shapes:
+                    errors.append(store.frame().shape)
+            except FileNotFoundError:
+                # A reader may race a prune of the version it just named; it never sees a mix
+                pass
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(40):
+        PriceStore.build(path, _prices(['AAPL', 'MSFT']) if i % 2 else _prices(['AAPL', 'MSFT', 'NVDA'], 60))
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
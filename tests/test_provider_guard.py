@@ -0,0 +1,216 @@
+import os
+import time
+
+import pytest
+
+import provider_guard
+from data_access import install_scheduler
+from fetch_scheduler import REFRESH, FetchScheduler
+from provider_guard import (CACHE_DIR_ENV, CircuitBreaker, CircuitOpenError, NoDataError, ProviderGuard,
+                            StaleCache, default_cache_dir)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(provider_guard.time, 'monotonic', clock)
+    return clock
+
+
+def _fail():
+    raise ConnectionError("provider down")
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+
+    # A success resets the count
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+    assert breaker.retry_in() == 60
+
+
+def test_breaker_half_open_trial_closes_on_success(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == 'open' and breaker.retry_in() == 30
+
+    clock.now += 30
+    assert breaker.state == 'half-open' and breaker.retry_in() == 0
+    assert breaker.allow()
+    # Only one trial call at a time
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_breaker_half_open_trial_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and breaker.retry_in() == 60
+    assert not breaker.allow()
+
+
+def test_guard_fails_fast_while_open_without_cache(clock):
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    calls = []
+
+    def loader():
+        calls.append(1)
+        _fail()
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            guard.call(('X', 'info'), loader)
+    with pytest.raises(CircuitOpenError):
+        guard.call(('X', 'info'), loader)
+    assert len(calls) == 2
+
+
+def test_no_data_error_does_not_open_the_circuit():
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=1))
+
+    def no_data():
+        raise NoDataError("no data for BAD")
+
+    with pytest.raises(NoDataError):
+        guard.call(('BAD', 'info'), no_data)
+    assert guard.breaker.state == 'closed'
+    assert guard.call(('GOOD', 'info'), lambda: {'symbol': 'GOOD'}) == ({'symbol': 'GOOD'}, None)
+
+
+def test_per_symbol_errors_are_raised_not_served_stale():
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=1))
+    key = ('ODD', 'cashflow')
+    guard.call(key, lambda: 'cached')
+
+    def malformed():
+        raise KeyError('Free Cash Flow')
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            guard.call(key, malformed)
+    assert guard.breaker.state == 'closed'
+    assert guard.stale_keys() == []
+
+
+class FakeProvider:
+    # Provider that can be taken down, counting the requests it receives
+    def __init__(self, value):
+        self.value = value
+        self.down = False
+        self.requests = 0
+
+    def load(self):
+        self.requests += 1
+        if self.down:
+            raise ConnectionError("provider down")
+        return self.value
+
+
+def test_guard_serves_stale_value_and_revalidates():
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    provider = FakeProvider(4.37)
+    key = ('^TNX', 'bond_yield')
+    assert guard.call(key, provider.load) == (4.37, None)
+
+    provider.down = True
+    value, stale_since = guard.call(key, provider.load)
+    assert value == 4.37 and stale_since is not None
+    assert guard.breaker.state == 'open'
+    # While open, callers get the cached value without reaching the provider
+    requests = provider.requests
+    assert guard.call(key, provider.load)[0] == 4.37
+    assert provider.requests == requests
+
+    # Once the provider recovers, the background trial refreshes the cache and closes the circuit
+    provider.value, provider.down = 4.5, False
+    _wait_for(lambda: not guard.stale_keys())
+    assert guard.breaker.state == 'closed'
+    assert guard.cache.get(key)[0] == 4.5
+
+
+class RecordingScheduler(FetchScheduler):
+    # FetchScheduler remembering the priority of every submitted request
+    def __init__(self):
+        super().__init__(rate=1000, burst=1000, workers=1)
+        self.priorities = []
+
+    def submit(self, function, priority=None, key=None):
+        self.priorities.append(priority)
+        return super().submit(function, priority, key)
+
+
+def test_revalidation_goes_through_the_scheduler_at_refresh_priority():
+    scheduler = RecordingScheduler()
+    previous = install_scheduler(scheduler)
+    try:
+        guard = ProviderGuard(CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+        provider = FakeProvider({'symbol': 'AAPL'})
+        guard.call(('AAPL', 'info'), provider.load)
+        provider.down = True
+        guard.call(('AAPL', 'info'), provider.load)
+
+        provider.down = False
+        _wait_for(lambda: not guard.stale_keys())
+        assert set(scheduler.priorities) == {REFRESH}
+    finally:
+        install_scheduler(previous)
+        scheduler.shutdown()
+
+
+def test_stale_cache_persists_to_directory(tmp_path):
+    StaleCache(str(tmp_path)).put(('AAPL', 'cashflow'), {'a': 1})
+    value, _ = StaleCache(str(tmp_path)).get(('AAPL', 'cashflow'))
+    assert value == {'a': 1}
+    assert StaleCache(str(tmp_path)).get(('MSFT', 'cashflow')) is None
+
+
+def test_stale_cache_resolves_directory_lazily(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / 'env'))
+    cache = StaleCache(default_cache_dir)
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / 'later'))
+    cache.put(('AAPL', 'info'), {})
+    assert cache.directory == str(tmp_path / 'later' / 'provider_cache')
+    assert os.listdir(tmp_path) == ['later']
+
+    memory_only = StaleCache(None)
+    memory_only.put(('AAPL', 'info'), {'symbol': 'AAPL'})
+    assert memory_only.get(('AAPL', 'info'))[0] == {'symbol': 'AAPL'}
+
+
+def test_default_cache_dir_uses_user_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert default_cache_dir() == os.path.join(str(tmp_path), 'stock-analysis', 'provider_cache')
+    assert default_cache_dir('results_cache') == os.path.join(str(tmp_path), 'stock-analysis', 'results_cache')
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from return_matrices import ReturnMatrices, block_returns, pairwise_cov_corr
+
+
+def _prices(n_dates=400, n_symbols=7, seed=0):
+    # Random-walk closes with staggered listings and scattered gaps, so pairs overlap differently
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_dates, n_symbols)), axis=0))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    for column in range(n_symbols):
+        values[:column * 40, column] = np.nan
+    return pd.DataFrame(values, index=pd.bdate_range('2020-01-01', periods=n_dates),
+                        columns=[f"S{i}" for i in range(n_symbols)])
+
+
+def _pandas_returns(prices):
+    # Daily returns with NaN wherever either close is missing (no filling across gaps)
+    return (prices / prices.shift(1) - 1).iloc[1:]
+
+
+@pytest.mark.parametrize('min_periods', [2, 60, 300])
+def test_pairwise_cov_corr_matches_pandas(min_periods):
+    prices = _prices()
+    x, mask = block_returns(prices.to_numpy())
+    covariance, correlation = pairwise_cov_corr(x, mask, x, mask, min_periods)
+
+    returns = _pandas_returns(prices)
+    np.testing.assert_allclose(covariance, returns.cov(min_periods=min_periods).to_numpy(), rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(correlation, returns.corr(min_periods=min_periods).to_numpy(), rtol=1e-10, atol=1e-12)
+
+
+def test_pairwise_cov_corr_between_different_blocks():
+    prices = _prices()
+    left, right = prices.iloc[:, :3], prices.iloc[:, 3:]
+    x, mask_x = block_returns(left.to_numpy())
+    y, mask_y = block_returns(right.to_numpy())
+    covariance, correlation = pairwise_cov_corr(x, mask_x, y, mask_y, min_periods=30)
+
+    expected = _pandas_returns(prices)
+    np.testing.assert_allclose(covariance, expected.cov(min_periods=30).iloc[:3, 3:].to_numpy(), rtol=1e-10)
+    np.testing.assert_allclose(correlation, expected.corr(min_periods=30).iloc[:3, 3:].to_numpy(), rtol=1e-10)
+
+
+def test_build_matches_pandas_across_blocks(tmp_path):
+    prices = _prices()
+    # A block size that does not divide the symbol count exercises the ragged last block
+    matrices = ReturnMatrices.build(str(tmp_path / 'daily'), prices, block_size=3, workers=2,
+                                    min_periods=60, dtype=np.float64)
+
+    expected = _pandas_returns(prices).corr(min_periods=60)
+    pd.testing.assert_frame_equal(matrices.frame(), expected, rtol=1e-10, check_names=False)
+    np.testing.assert_array_equal(matrices.covariance, matrices.covariance.T)
+
+
+def test_build_monthly_uses_month_end_prices(tmp_path):
+    prices = _prices(n_dates=800)
+    matrices = ReturnMatrices.build(str(tmp_path / 'monthly'), prices, frequency='M', block_size=4,
+                                    min_periods=12, dtype=np.float64)
+
+    month_end = prices.ffill().groupby(prices.index.to_period('M')).tail(1)
+    expected = (month_end / month_end.shift(1) - 1).iloc[1:].cov(min_periods=12)
+    np.testing.assert_allclose(matrices.frame('covariance').to_numpy(), expected.to_numpy(), rtol=1e-10)
+
+
+def test_rebuild_replaces_matrices(tmp_path):
+    path = str(tmp_path / 'matrices')
+    ReturnMatrices.build(path, _prices(n_symbols=4), min_periods=30)
+    rebuilt = ReturnMatrices.build(path, _prices(n_symbols=6, seed=1), min_periods=30)
+
+    reopened = ReturnMatrices(path)
+    assert reopened.symbols == rebuilt.symbols == [f"S{i}" for i in range(6)]
+    assert reopened.correlation.shape == (6, 6)
+    assert 'S5' in reopened and reopened.most_correlated('S0', count=2).index.size == 2
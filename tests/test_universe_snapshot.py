@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import StockAnalysis as stock_analysis
+from fundamentals import STATEMENT_DATASETS
+from StockAnalysis import StockAnalysis
+from universe_snapshot import UniverseSnapshot, export_snapshot
+
+DATES = pd.to_datetime(['2023-12-31', '2022-12-31', '2021-12-31']).as_unit('ns')
+
+
+def _statement(fields, seed):
+    # yfinance layout: fields x dates, newest first, fields in reporting order (not sorted)
+    values = np.random.default_rng(seed).normal(1e9, 2e8, (len(fields), len(DATES)))
+    values[1, 2] = np.nan
+    return pd.DataFrame(values, index=fields, columns=DATES)
+
+
+def _analysis(symbol, seed):
+    # StockAnalysis with every dataset preloaded, so exporting makes no provider request
+    analysis = StockAnalysis(symbol)
+    analysis._datasets = {
+        'info': {'symbol': symbol, 'currentPrice': 100.0 + seed, 'trailingEps': 5.5, 'sector': 'Technology'},
+        **{dataset: _statement(['Operating Cash Flow', 'Capital Expenditure', 'Free Cash Flow'], seed + i)
+           for i, dataset in enumerate(STATEMENT_DATASETS)},
+    }
+    analysis._datasets['balance_sheet_pretty'] = pd.DataFrame()
+    return analysis
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    analyses = [_analysis('MSFT', 1), _analysis('AAPL', 10)]
+    prices = pd.DataFrame({'AAPL': [1.0, 2.0, np.nan, 4.0], 'MSFT': [5.0, 6.0, 7.0, 8.0]},
+                          index=pd.bdate_range('2024-01-01', periods=4))
+    path = export_snapshot(str(tmp_path / 'universe.snap'), analyses, prices=prices, bond_yield=4.25)
+    return analyses, prices, UniverseSnapshot(path)
+
+
+def test_statement_round_trip(snapshot):
+    analyses, _, universe = snapshot
+    for analysis in analyses:
+        for dataset in STATEMENT_DATASETS:
+            expected = analysis.fetch(dataset)
+            restored = universe.statement(analysis.ticker_symbol, dataset)
+            if expected.empty:
+                assert restored.empty
+            else:
+                pd.testing.assert_frame_equal(restored, expected, check_freq=False)
+
+
+def test_info_prices_and_bond_yield_round_trip(snapshot):
+    analyses, prices, universe = snapshot
+    assert universe.tickers == ['AAPL', 'MSFT']
+    assert universe.bond_yield == 4.25
+    assert universe.info('MSFT') == analyses[0].fetch('info')
+    assert universe.covers(['AAPL', 'MSFT']) and not universe.covers(['SPY'])
+    pd.testing.assert_frame_equal(universe.frame(), prices, check_freq=False)
+    pd.testing.assert_frame_equal(universe.frame(['MSFT'], start='2024-01-02', end='2024-01-03'),
+                                  prices.loc['2024-01-02':'2024-01-03', ['MSFT']], check_freq=False)
+
+
+def test_analysis_reads_from_snapshot(snapshot):
+    analyses, _, universe = snapshot
+    restored = StockAnalysis('AAPL', snapshot=universe)
+    pd.testing.assert_frame_equal(restored.fetch('cashflow'), analyses[1].fetch('cashflow'), check_freq=False)
+    assert restored.get_bond_yield() == 4.25
+    with pytest.raises(KeyError):
+        universe.ticker('TSLA')
+
+
+def test_snapshot_without_bond_yield_or_prices_stays_offline(tmp_path, monkeypatch, capsys):
+    def no_network(*args, **kwargs):
+        raise AssertionError("network access from a snapshot run")
+
+    monkeypatch.setattr(stock_analysis.yf, 'Ticker', no_network)
+    monkeypatch.setattr(stock_analysis, 'download_close_matrix', no_network)
+    universe = UniverseSnapshot(export_snapshot(str(tmp_path / 'bare.snap'), [_analysis('AAPL', 1)], bond_yield=4.25))
+    # A snapshot written without a Treasury yield
+    universe.bond_yield = None
+
+    analysis = StockAnalysis('AAPL', snapshot=universe)
+    assert analysis.get_bond_yield() == 4.0
+    analysis.compare_annual_performance()
+    assert "No price history in the snapshot for AAPL, SPY, VTI" in capsys.readouterr().out
+
+
+def test_snapshot_and_live_loads_do_not_share_a_flight(snapshot, monkeypatch):
+    _, _, universe = snapshot
+    keys = []
+
+    def live_request(key, loader, priority=None):
+        # Stands in for the guarded provider call: (value, stale_since)
+        keys.append(key)
+        return {'symbol': 'AAPL'}, None
+
+    def snapshot_request(key, loader, priority=None):
+        keys.append(key)
+        return loader()
+
+    monkeypatch.setattr(stock_analysis, 'shared_request', live_request)
+    monkeypatch.setattr('data_access.shared_request', snapshot_request)
+    StockAnalysis('AAPL').fetch('info')
+    StockAnalysis('AAPL', snapshot=universe).fetch('info')
+
+    live, offline = keys
+    assert live[:2] == offline[:2] == ('AAPL', 'info')
+    assert ('source', 'live') in live[2] and ('source', universe.path) in offline[2]
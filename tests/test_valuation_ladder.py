@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from valuation_ladder import buy_limits, ladder_inputs, valuation_ladder
+
+
+@pytest.fixture
+def inputs():
+    # A pays a dividend; B has no earnings; C loses more than it pays out
+    return ladder_inputs({
+        'A': {'currentPrice': 100.0, 'sharesOutstanding': 1e6, 'trailingEps': 4.0, 'dividendRate': 1.0},
+        'B': {'currentPrice': 50.0, 'sharesOutstanding': 1e6, 'trailingEps': 0.0},
+        'C': {'currentPrice': 20.0, 'sharesOutstanding': 1e6, 'trailingEps': -2.0, 'dividendRate': 0.5},
+    })
+
+
+def test_breakeven_and_margin_of_safety(inputs):
+    ladder = valuation_ladder(inputs, bond_yield=4.0, points=3, low=-0.5, high=0.5).loc['A']
+    assert ladder['Breakeven Price'].tolist() == pytest.approx([125.0] * 3)
+    assert ladder['Margin of Safety (%)'].tolist() == pytest.approx([60.0, 20.0, -20.0])
+
+
+def test_no_breakeven_without_positive_earnings_and_dividends(inputs):
+    ladder = valuation_ladder(inputs, bond_yield=4.0, points=5)
+    for ticker in ['B', 'C']:
+        assert ladder.loc[ticker, 'Breakeven Price'].isna().all()
+        assert ladder.loc[ticker, 'Margin of Safety (%)'].isna().all()
+    assert not np.isinf(ladder.to_numpy()).any()
+    assert buy_limits(ladder)[['B', 'C']].isna().all()